@@ -0,0 +1,193 @@
+"""
+Apple Search Ads Stand-in Benchmark
+===================================
+Apple Search Ads connector'ını ağ erişimi olmadan, kayıtlı yanıtları sunan
+yerel bir HTTP stand-in sunucusuna karşı çalıştırır ve ölçer
+
+Stand-in sunucu OAuth token ucunu ve /reports/campaigns ucunu taklit eder;
+kampanya satırlarını istekteki tarih aralığına göre süzer ve
+selector.pagination (offset/limit) ile sayfalar.
+
+Kayıt dosyası, API'nin reportingDataResponse.row listesiyle aynı biçimdedir:
+    {"row": [{"metadata": {...}, "granularity": [{"date": ..., ...}]}]}
+
+Çalıştırma:
+    python benchmarks/apple_ads_standin.py --campaigns 200 --days 90
+    python benchmarks/apple_ads_standin.py --recording kayit.json
+    python benchmarks/apple_ads_standin.py --save-recording kayit.json
+    python benchmarks/apple_ads_standin.py --throttle-every 3   # her 3. istekte 429
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def make_recording(campaigns: int, days: int, end_date: date) -> dict:
+    """Gerçek rapor yanıtı biçiminde sentetik kayıt üretir"""
+    start_date = end_date - timedelta(days=days - 1)
+    rows = []
+    for c in range(campaigns):
+        granularity = []
+        for d in range(days):
+            i = c * days + d
+            granularity.append({
+                "date": str(start_date + timedelta(days=d)),
+                "impressions": i % 5000,
+                "taps": i % 300,
+                "totalInstalls": i % 40,
+                "localSpend": {"amount": f"{(i % 997) / 10:.2f}", "currency": "USD"}
+            })
+        rows.append({
+            "metadata": {
+                "campaignId": 900000 + c,
+                "campaignName": f"apple_campaign_{c}",
+                "campaignStatus": "ENABLED"
+            },
+            "granularity": granularity
+        })
+    return {"row": rows}
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Token ve kampanya raporu uçlarını kayıttan yanıtlar"""
+
+    recording = {"row": []}
+    stats = {"token": 0, "report_pages": 0, "throttled": 0}
+    throttle_every = 0
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, payload: dict):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        raw = self.rfile.read(length)
+
+        if self.path.endswith("/auth/oauth2/token"):
+            self.stats["token"] += 1
+            self._send_json(200, {"access_token": "stand-in-token", "token_type": "Bearer", "expires_in": 3600})
+            return
+
+        if self.path.endswith("/reports/campaigns"):
+            if not self.headers.get("Authorization", "").startswith("Bearer "):
+                self._send_json(401, {"error": "unauthorized"})
+                return
+            self.stats["report_pages"] += 1
+            if self.throttle_every and self.stats["report_pages"] % self.throttle_every == 0:
+                self.stats["throttled"] += 1
+                self.send_response(429)
+                self.send_header("Retry-After", "1")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self._send_json(200, self._report_page(json.loads(raw)))
+            return
+
+        self._send_json(404, {"error": f"bilinmeyen uç: {self.path}"})
+
+    def _report_page(self, body: dict) -> dict:
+        start, end = body["startTime"], body["endTime"]
+        rows = []
+        for row in self.recording["row"]:
+            days = [day for day in row["granularity"] if start <= day["date"] <= end]
+            if days:
+                rows.append({"metadata": row["metadata"], "granularity": days})
+
+        pagination = body.get("selector", {}).get("pagination", {})
+        offset = pagination.get("offset", 0)
+        limit = pagination.get("limit", 1000)
+        page = rows[offset:offset + limit]
+
+        return {
+            "data": {"reportingDataResponse": {"row": page}},
+            "pagination": {"totalResults": len(rows), "startIndex": offset, "itemsPerPage": len(page)},
+            "error": None
+        }
+
+
+def start_standin(recording: dict, throttle_every: int = 0) -> ThreadingHTTPServer:
+    """Stand-in sunucuyu rastgele bir portta arka planda başlatır"""
+    StandInHandler.recording = recording
+    StandInHandler.throttle_every = throttle_every
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--campaigns", type=int, default=200)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--recording", help="Kayıtlı rapor satırları (JSON)")
+    parser.add_argument("--throttle-every", type=int, default=0, help="Her N. rapor isteğini 429 ile yanıtla")
+    parser.add_argument("--save-recording", help="Sentetik kaydı bu dosyaya yazıp çık")
+    args = parser.parse_args()
+
+    end_date = date.today() - timedelta(days=1)
+    if args.recording:
+        with open(args.recording) as f:
+            recording = json.load(f)
+    else:
+        recording = make_recording(args.campaigns, args.days, end_date)
+
+    if args.save_recording:
+        with open(args.save_recording, "w") as f:
+            json.dump(recording, f)
+        print(f"Kayıt yazıldı: {args.save_recording}")
+        return
+
+    dates = [day["date"] for row in recording["row"] for day in row["granularity"]]
+    if not dates:
+        print("Kayıtta satır yok")
+        return
+    start_date, end_date = date.fromisoformat(min(dates)), date.fromisoformat(max(dates))
+
+    server = start_standin(recording, args.throttle_every)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    # Config modül yüklenirken okunur; connector'dan önce ayarlanmalı
+    os.environ.update({
+        "APPLE_ADS_API_URL": f"{base_url}/api/v5",
+        "APPLE_ADS_TOKEN_URL": f"{base_url}/auth/oauth2/token",
+        "APPLE_ADS_REPORT_PAGE_SIZE": str(args.page_size),
+        "APPLE_ADS_CLIENT_ID": "SEARCHADS.stand-in",
+        "APPLE_ADS_TEAM_ID": "SEARCHADS.stand-in",
+        "APPLE_ADS_KEY_ID": "stand-in",
+        "APPLE_ADS_ORG_ID": "1",
+        "APPLE_ADS_CLIENT_SECRET": "stand-in-secret",
+    })
+    from connectors import apple_ads, rate_limit
+
+    for run in range(2):
+        started = time.perf_counter()
+        df = apple_ads.fetch_campaign_data(start_date, end_date)
+        elapsed = time.perf_counter() - started
+        print(
+            f"çalıştırma {run + 1}: {len(df):,} satır, {elapsed:.2f} sn, "
+            f"{len(df) / elapsed:,.0f} satır/sn"
+        )
+
+    print(f"rapor sayfası isteği: {StandInHandler.stats['report_pages']} (429: {StandInHandler.stats['throttled']})")
+    print(f"token isteği: {StandInHandler.stats['token']} (auth: {apple_ads.get_auth_stats()})")
+    print(f"hız sınırı: {rate_limit.get_limiter_stats()}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Attribution Compare
+===================
+Ciro sorgusunun eski (tüm MemberForm'u MemberId ile gruplayan mf_latest
+türetilmiş tablosu) ve yeni (aralıktaki siparişlerden başlayan CROSS APPLY
+TOP 1) atama yöntemlerini aynı aralıkta çalıştırır
+
+- Sonuçları karşılaştırır (satır kümesi aynı olmalı)
+- SET STATISTICS IO ile tablo başına logical reads değerlerini yazar
+  (bu mesajlar için pyodbc gerekir; pymssql ile yalnızca sonuçlar karşılaştırılır)
+
+Bilinen fark: bir üyenin en son CreateDate değerinde birden fazla formu
+varsa eski sorgu siparişi her form için tekrar sayar, yeni sorgu bir kez
+(en büyük Id'li formu seçerek; sonuç her çalıştırmada aynıdır).
+
+Çalıştırma:
+    python benchmarks/attribution_compare.py --days 30
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+from datetime import date, timedelta
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.database import SUPPORTED_PLATFORMS
+from database.connection import get_pool, prepare_statement, cursor_to_frame
+from database.queries import REVENUE_QUERY, bind_sources
+
+
+# user-022 öncesi REVENUE_QUERY (karşılaştırma için)
+LEGACY_REVENUE_QUERY = """
+SELECT
+    mf.MemberId,
+    mf.UtmSource,
+    mf.UtmMedium,
+    mf.UtmContent,
+    T.StudentName,
+    T.StudentNo,
+    T.BeginDate,
+    P.Title AS Product,
+    T.Status,
+    T.LessonDuration,
+    O.Price,
+    O.TotalPrice,
+    CONVERT(DECIMAL(10, 2), (O.TotalPrice / 1.1)) as NetPrice,
+    O.CreateDate AS OrderDate,
+    T.CreateDate AS TermDate
+FROM MemberPrime..MemberForm mf
+INNER JOIN (
+    SELECT MemberId, MAX(CreateDate) as MaxCreateDate
+    FROM MemberPrime..MemberForm
+    GROUP BY MemberId
+) mf_latest ON mf.MemberId = mf_latest.MemberId AND mf.CreateDate = mf_latest.MaxCreateDate
+INNER JOIN TERM T ON T.MemberId = mf.MemberId
+INNER JOIN MEMBER M ON M.ID = T.MemberId
+INNER JOIN EmployeeMember EM ON T.MemberId = EM.MemberId AND EM.Status = 1 AND EM.EmployeeTypeId = 4
+INNER JOIN [OrderTermDetail] OTD ON OTD.TermId = T.ID
+INNER JOIN [ORDER] O ON O.Id = OTD.OrderId
+INNER JOIN Product P ON P.ID = T.ProductId
+INNER JOIN Payment PM ON PM.OrderId = OTD.OrderId
+WHERE mf.UtmSource IN ({sources})
+  AND O.CreateDate BETWEEN ? AND ?
+  AND T.SalesType = 1
+  AND O.TotalPrice > 0
+  AND PM.Status = 1
+ORDER BY O.CreateDate DESC
+"""
+
+READS_PATTERN = re.compile(r"Table '([^']+)'\. Scan count (\d+), logical reads (\d+)")
+
+
+def run_with_io(pooled, template: str, sources: list, start_date: date, end_date: date) -> tuple:
+    """
+    Sorguyu STATISTICS IO açıkken çalıştırır
+
+    Returns:
+        tuple: (DataFrame, {tablo: logical reads}, süre sn)
+    """
+    query, params = bind_sources(template, sources, start_date, end_date)
+    statement = prepare_statement(query, pooled.driver, params)
+
+    cursor = pooled.connection.cursor()
+    try:
+        started = time.perf_counter()
+        cursor.execute("SET STATISTICS IO ON;\n" + statement, params)
+
+        df = None
+        messages = []
+        while True:
+            if cursor.description and df is None:
+                df = cursor_to_frame(cursor)
+            elif cursor.description:
+                cursor.fetchall()
+            messages.extend(text for _, text in getattr(cursor, "messages", []))
+            if not cursor.nextset():
+                break
+        elapsed = time.perf_counter() - started
+        cursor.execute("SET STATISTICS IO OFF")
+    finally:
+        cursor.close()
+
+    reads = {}
+    for table, _, logical in READS_PATTERN.findall("\n".join(messages)):
+        reads[table] = reads.get(table, 0) + int(logical)
+    return df, reads, elapsed
+
+
+def compare_frames(old: pd.DataFrame, new: pd.DataFrame) -> int:
+    """Satır çoklu kümelerini karşılaştırır; yalnızca bir tarafta bulunan satır sayısını döner"""
+    columns = list(new.columns)
+    counts = pd.merge(
+        old.value_counts(columns, dropna=False).rename("old").reset_index(),
+        new.value_counts(columns, dropna=False).rename("new").reset_index(),
+        on=columns,
+        how="outer"
+    ).fillna(0)
+    return int((counts["old"] - counts["new"]).abs().sum())
+
+
+def print_reads(name: str, reads: dict, elapsed: float):
+    total = sum(reads.values())
+    print(f"{name:<8} {elapsed:>6.2f} sn   logical reads toplam {total:>12,}")
+    for table, logical in sorted(reads.items(), key=lambda item: -item[1]):
+        print(f"           {table:<24} {logical:>12,}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--end-date", type=date.fromisoformat, default=date.today() - timedelta(days=1))
+    args = parser.parse_args()
+
+    end_date = args.end_date
+    start_date = end_date - timedelta(days=args.days - 1)
+
+    with get_pool().connection() as pooled:
+        old, old_reads, old_elapsed = run_with_io(pooled, LEGACY_REVENUE_QUERY, SUPPORTED_PLATFORMS, start_date, end_date)
+        new, new_reads, new_elapsed = run_with_io(pooled, REVENUE_QUERY, SUPPORTED_PLATFORMS, start_date, end_date)
+
+    print(f"{start_date} - {end_date}: eski {len(old):,} satır, yeni {len(new):,} satır")
+    if pooled.driver == "pyodbc":
+        print_reads("eski", old_reads, old_elapsed)
+        print_reads("yeni", new_reads, new_elapsed)
+    else:
+        print(f"eski {old_elapsed:.2f} sn, yeni {new_elapsed:.2f} sn (logical reads için pyodbc gerekir)")
+
+    mismatched = compare_frames(old, new)
+    if mismatched:
+        print(f"⚠️ {mismatched} satır yalnızca bir sonuçta var (aynı anda oluşturulmuş formlar için bkz. docstring)")
+    else:
+        print("✅ Sonuçlar aynı")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Connector Row Assembly Benchmark
+================================
+Satır başına dict + pd.DataFrame(list) ile tipli sütun tamponlarını
+(connectors.columnar.ColumnBuffer) sentetik Google Ads yanıtı üzerinde karşılaştırır
+
+Çalıştırma:
+    python benchmarks/connector_rows.py --rows 500000
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from connectors.columnar import ColumnBuffer
+from connectors.google_ads import GRAIN_SCHEMAS, _append_ad_row
+
+
+def make_response(rows: int, batch_size: int = 10_000) -> list:
+    """search_stream yanıtını taklit eden batch listesi (ad grain satırları)"""
+    batches = []
+    for start in range(0, rows, batch_size):
+        results = []
+        for i in range(start, min(start + batch_size, rows)):
+            results.append(SimpleNamespace(
+                segments=SimpleNamespace(date=f"2024-{(i % 12) + 1:02d}-{(i % 28) + 1:02d}"),
+                campaign=SimpleNamespace(id=1000 + i % 50),
+                ad_group=SimpleNamespace(id=20000 + i % 400),
+                ad_group_ad=SimpleNamespace(ad=SimpleNamespace(id=300000 + i % 3000)),
+                metrics=SimpleNamespace(
+                    cost_micros=(i % 997) * 10_000,
+                    impressions=i % 5000,
+                    clicks=i % 300,
+                    conversions=float(i % 7)
+                )
+            ))
+        batches.append(SimpleNamespace(results=results))
+    return batches
+
+
+def assemble_dicts(response) -> pd.DataFrame:
+    """Önceki yöntem: satır başına dict, sonra pd.DataFrame(list)"""
+    data = []
+    for batch in response:
+        for row in batch.results:
+            data.append({
+                "date": row.segments.date,
+                "campaign_id": row.campaign.id,
+                "ad_group_id": row.ad_group.id,
+                "ad_id": row.ad_group_ad.ad.id,
+                "spend": row.metrics.cost_micros / 1_000_000,
+                "impressions": row.metrics.impressions,
+                "clicks": row.metrics.clicks,
+                "conversions": row.metrics.conversions
+            })
+    return pd.DataFrame(data)
+
+
+def assemble_columns(response) -> pd.DataFrame:
+    """Yeni yöntem: connector'ın kullandığı sütun tamponları"""
+    buffer = ColumnBuffer(GRAIN_SCHEMAS["ad"])
+    append = buffer.append
+    for batch in response:
+        for row in batch.results:
+            _append_ad_row(append, row)
+    return buffer.to_frame()
+
+
+def measure(name: str, assemble, response, rows: int):
+    start = time.perf_counter()
+    assemble(response)
+    elapsed = time.perf_counter() - start
+    
+    tracemalloc.start()
+    assemble(response)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    print(f"{name:<12} {rows / elapsed:>12,.0f} satır/sn   {elapsed:>6.2f} sn   tepe bellek {peak / 1024 / 1024:>7.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=500_000)
+    args = parser.parse_args()
+    
+    response = make_response(args.rows)
+    
+    # Sonuçlar aynı olmalı
+    pd.testing.assert_frame_equal(
+        assemble_dicts(response), assemble_columns(response), check_dtype=False
+    )
+    
+    print(f"{args.rows:,} satır")
+    measure("dict", assemble_dicts, response, args.rows)
+    measure("columnar", assemble_columns, response, args.rows)
+
+
+if __name__ == "__main__":
+    main()
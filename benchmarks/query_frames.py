@@ -0,0 +1,119 @@
+"""
+Query Frame Benchmark
+=====================
+fetchall + satır başına dict + pd.DataFrame(list) ile fetchmany + tipli
+sütunlar (database.connection.cursor_to_frame) yöntemini REVENUE_QUERY
+biçimindeki sentetik bir sonuç üzerinde karşılaştırır
+
+Çalıştırma:
+    python benchmarks/query_frames.py --rows 300000
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.connection import cursor_to_frame
+
+
+COLUMNS = [
+    "MemberId", "UtmSource", "UtmMedium", "UtmContent", "StudentName", "StudentNo",
+    "BeginDate", "Product", "Status", "LessonDuration", "Price", "TotalPrice",
+    "NetPrice", "OrderDate", "TermDate"
+]
+
+
+def make_rows(rows: int) -> list:
+    """Bir çeyreğe yayılmış sentetik sipariş satırları (sürücü tipleriyle)"""
+    start = datetime(2024, 1, 1)
+    data = []
+    for i in range(rows):
+        order_date = start + timedelta(minutes=i % 131040)
+        price = Decimal(1000 + i % 9000) + Decimal("0.50")
+        data.append((
+            100000 + i, ("google", "facebook")[i % 2], "cpc", f"content_{i % 300}",
+            f"Öğrenci {i}", f"S{i:08d}", order_date.date(), f"Paket {i % 12}",
+            i % 3, 25, price, price, (price / Decimal("1.1")).quantize(Decimal("0.01")),
+            order_date, order_date
+        ))
+    return data
+
+
+class FakeCursor:
+    """REVENUE_QUERY satırlarını sürücü gibi (tuple, Decimal, datetime) üreten cursor"""
+
+    def __init__(self, rows: list):
+        self.description = [(name, None) for name in COLUMNS]
+        self._rows = iter(rows)
+
+    def fetchall(self):
+        # Sürücü gibi yeni bir satır listesi döner
+        return list(self._rows)
+
+    def fetchmany(self, size: int):
+        batch = []
+        for row in self._rows:
+            batch.append(row)
+            if len(batch) == size:
+                break
+        return batch
+
+
+def assemble_dicts(cursor) -> pd.DataFrame:
+    """Önceki yöntem: execute_query (dict listesi) + pd.DataFrame(results)"""
+    columns = [column[0] for column in cursor.description]
+    results = []
+    for row in cursor.fetchall():
+        results.append(dict(zip(columns, row)))
+    return pd.DataFrame(results)
+
+
+def measure(name: str, assemble, data: list):
+    rows = len(data)
+    start = time.perf_counter()
+    df = assemble(FakeCursor(data))
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    assemble(FakeCursor(data))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{name:<12} {rows / elapsed:>12,.0f} satır/sn   {elapsed:>6.2f} sn   tepe bellek {peak / 1024 / 1024:>7.1f} MB")
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=300_000)
+    args = parser.parse_args()
+
+    # Satırlar önceden üretilir; ölçüm yalnızca sonuç -> DataFrame dönüşümünü kapsar
+    data = make_rows(args.rows)
+
+    print(f"{args.rows:,} satır")
+    old = measure("dict", assemble_dicts, data)
+    new = measure("columnar", cursor_to_frame, data)
+
+    # Sonuçlar aynı olmalı (Decimal -> float64, date -> datetime64 dönüşümü dışında)
+    pd.testing.assert_frame_equal(
+        old.assign(
+            BeginDate=pd.to_datetime(old["BeginDate"]),
+            **{column: old[column].astype(float) for column in ("Price", "TotalPrice", "NetPrice")}
+        ),
+        new,
+        check_dtype=False
+    )
+    print(new.dtypes.value_counts().to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Statement Compile Benchmark
+===========================
+Source listesinin metne gömülmesi (eski format_sources) ile sabit sayıda
+parametreyle bağlanmasını (database.queries.bind_sources) SQL Server'ın
+derleme ve çalışma süreleri üzerinden karşılaştırır
+
+Her tur farklı bir platform seçimiyle çalışır. Metne gömme yönteminde her
+farklı seçim ayrı bir sorgu metni, dolayısıyla ayrı bir derleme demektir;
+parametreli yöntemde metin sabittir ve plan yeniden kullanılır.
+
+Süreler SET STATISTICS TIME mesajlarından okunur ("parse and compile time"
+ve "Execution Times"); bu mesajlar için pyodbc (cursor.messages) gerekir.
+
+Çalıştırma:
+    python benchmarks/statement_compile.py --query LEAD_ROLLUP --rounds 24
+"""
+
+import argparse
+import itertools
+import os
+import re
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import queries
+from database.connection import get_pool, prepare_statement, get_statement_cache_stats
+
+
+# Seçimleri çeşitlendirmek için kullanılan source adları (tabloda olmaları gerekmez)
+SOURCES = ["google", "facebook", "apple", "tiktok"]
+
+COMPILE_PATTERN = re.compile(r"parse and compile time:\s*CPU time = (\d+) ms,\s*elapsed time = (\d+) ms", re.S)
+EXECUTE_PATTERN = re.compile(r"Execution Times:\s*CPU time = (\d+) ms,\s*elapsed time = (\d+) ms", re.S)
+
+
+def literal_sources(sources: list) -> str:
+    """Önceki yöntem: source'ları tırnaklı literal olarak metne gömer"""
+    return ", ".join([f"'{s}'" for s in sources])
+
+
+def selections(rounds: int) -> list:
+    """Farklı platform seçimleri (alt küme + sıra), rounds kadar"""
+    variants = [
+        list(permutation)
+        for size in range(1, len(SOURCES) + 1)
+        for permutation in itertools.permutations(SOURCES, size)
+    ]
+    return [variants[i % len(variants)] for i in range(rounds)]
+
+
+def run_timed(cursor, statement: str, params: tuple) -> tuple:
+    """
+    Sorguyu STATISTICS TIME açıkken çalıştırır
+
+    Returns:
+        tuple: (derleme ms, çalışma ms, istemci süresi sn)
+    """
+    started = time.perf_counter()
+    cursor.execute("SET STATISTICS TIME ON;\n" + statement, params)
+
+    messages = []
+    while True:
+        if cursor.description:
+            cursor.fetchall()
+        messages.extend(text for _, text in cursor.messages)
+        if not cursor.nextset():
+            break
+    wall = time.perf_counter() - started
+    cursor.execute("SET STATISTICS TIME OFF")
+
+    text = "\n".join(messages)
+    compile_ms = sum(int(elapsed) for _, elapsed in COMPILE_PATTERN.findall(text))
+    execute_ms = sum(int(elapsed) for _, elapsed in EXECUTE_PATTERN.findall(text))
+    return compile_ms, execute_ms, wall
+
+
+def measure(name: str, cursor, driver: str, template: str, rounds: int, start_date: date, end_date: date):
+    totals = [0, 0, 0.0]
+    for sources in selections(rounds):
+        if name == "literal":
+            statement = template.format(sources=literal_sources(sources))
+            params = (start_date, end_date)
+        else:
+            query, params = queries.bind_sources(template, sources, start_date, end_date)
+            statement = prepare_statement(query, driver, params)
+
+        for i, value in enumerate(run_timed(cursor, statement, params)):
+            totals[i] += value
+
+    compile_ms, execute_ms, wall = totals
+    print(
+        f"{name:<10} derleme {compile_ms:>7,} ms   çalışma {execute_ms:>7,} ms   "
+        f"istemci {wall:>6.2f} sn   ({rounds} tur, tur başına derleme {compile_ms / rounds:,.1f} ms)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--query", default="LEAD_ROLLUP", help="database.queries içindeki şablon adı")
+    parser.add_argument("--rounds", type=int, default=24)
+    parser.add_argument("--days", type=int, default=30)
+    args = parser.parse_args()
+
+    template = getattr(queries, args.query)
+    end_date = date.today() - timedelta(days=1)
+    start_date = end_date - timedelta(days=args.days - 1)
+
+    with get_pool().connection() as pooled:
+        if pooled.driver != "pyodbc":
+            print("STATISTICS TIME mesajları yalnızca pyodbc ile okunabiliyor")
+            return
+
+        cursor = pooled.connection.cursor()
+        try:
+            print(f"{args.query}: {start_date} - {end_date}")
+            measure("literal", cursor, pooled.driver, template, args.rounds, start_date, end_date)
+            measure("param", cursor, pooled.driver, template, args.rounds, start_date, end_date)
+        finally:
+            cursor.close()
+
+    print(f"sorgu metni önbelleği: {get_statement_cache_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Apple Search Ads API Configuration
+==================================
+Apple Search Ads API credentials
+Streamlit Cloud'da secrets kullanır
+"""
+
+import os
+import streamlit as st
+
+def _has_secrets(section: str) -> bool:
+    """Streamlit secrets bölümü tanımlı mı (secrets.toml yoksa, örn. CLI/benchmark, False)"""
+    try:
+        return hasattr(st, 'secrets') and section in st.secrets
+    except Exception:
+        return False
+
+def get_apple_ads_config():
+    """Apple Search Ads konfigürasyonunu döner"""
+    # Streamlit Cloud'da secrets kullan
+    if _has_secrets('apple_ads'):
+        secrets = st.secrets["apple_ads"]
+        return {
+            "client_id": secrets["client_id"],
+            "team_id": secrets["team_id"],
+            "key_id": secrets["key_id"],
+            "org_id": secrets["org_id"],
+            "private_key": secrets.get("private_key", ""),
+            "client_secret": secrets.get("client_secret", "")
+        }
+
+    # Lokal geliştirme için environment variable
+    private_key = ""
+    private_key_path = os.getenv("APPLE_ADS_PRIVATE_KEY_PATH", "")
+    if private_key_path and os.path.exists(private_key_path):
+        with open(private_key_path) as f:
+            private_key = f.read()
+
+    return {
+        "client_id": os.getenv("APPLE_ADS_CLIENT_ID", ""),
+        "team_id": os.getenv("APPLE_ADS_TEAM_ID", ""),
+        "key_id": os.getenv("APPLE_ADS_KEY_ID", ""),
+        "org_id": os.getenv("APPLE_ADS_ORG_ID", ""),
+        "private_key": private_key,
+        # Önceden üretilmiş client secret (JWT) verilirse private key gerekmez
+        "client_secret": os.getenv("APPLE_ADS_CLIENT_SECRET", "")
+    }
+
+# API adresleri (benchmark / test için yerel bir stand-in sunucuya yönlendirilebilir)
+API_BASE_URL = os.getenv("APPLE_ADS_API_URL", "https://api.searchads.apple.com/api/v5")
+TOKEN_URL = os.getenv("APPLE_ADS_TOKEN_URL", "https://appleid.apple.com/auth/oauth2/token")
+
+# Client secret (ES256 imzalı JWT) geçerlilik süresi; Apple en fazla 180 gün kabul eder (saniye)
+CLIENT_SECRET_TTL_SECONDS = int(os.getenv("APPLE_ADS_CLIENT_SECRET_TTL_SECONDS", str(86400 * 180)))
+
+# Rapor sayfa boyutu (kampanya satırı; Apple üst sınırı 1000)
+REPORT_PAGE_SIZE = int(os.getenv("APPLE_ADS_REPORT_PAGE_SIZE", "1000"))
+
+# Tek HTTP isteği için zaman aşımı (saniye)
+REQUEST_TIMEOUT_SECONDS = int(os.getenv("APPLE_ADS_REQUEST_TIMEOUT_SECONDS", "30"))
+
+# Lazy loading
+_apple_config = None
+
+def get_config():
+    global _apple_config
+    if _apple_config is None:
+        _apple_config = get_apple_ads_config()
+    return _apple_config
@@ -0,0 +1,59 @@
+"""
+Cache Configuration
+===================
+Disk önbelleği ayarları
+Environment variable ile özelleştirilebilir
+"""
+
+import os
+
+
+# Önbellek kök dizini (varsayılan: proje kökünde .cache/)
+CACHE_DIR = os.getenv(
+    "DASHBOARD_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache")
+)
+
+# Reklam platformlarının harcamayı kesinleştirmesi birkaç gün sürer;
+# bugün ve son N gün her seferinde yeniden çekilir, daha eskiler diskten okunur
+SPEND_SETTLING_DAYS = int(os.getenv("SPEND_SETTLING_DAYS", "3"))
+
+# Dashboard snapshot'ı bu süreden yeniyse kaynaklara gidilmeden doğrudan sunulur (saniye)
+SNAPSHOT_MAX_AGE_SECONDS = int(os.getenv("SNAPSHOT_MAX_AGE_SECONDS", "1800"))
+
+# Bu günden eski snapshot dosyaları prefetch worker tarafından silinir
+SNAPSHOT_RETENTION_DAYS = int(os.getenv("SNAPSHOT_RETENTION_DAYS", "2"))
+
+# Prefetch worker hızlı seçim aralıklarını bu aralıkla yeniler (saniye)
+PREFETCH_INTERVAL_SECONDS = int(os.getenv("PREFETCH_INTERVAL_SECONDS", "600"))
+
+# Prefetch'te platform çekimlerinin süre sınırı (saniye); render'lardaki PLATFORM_FETCH_TIMEOUTS
+# uzun aralıkların asenkron raporlarına yetmez, bu raporlar prefetch'te çekilip önbelleğe yazılır
+PREFETCH_FETCH_TIMEOUT_SECONDS = int(os.getenv("PREFETCH_FETCH_TIMEOUT_SECONDS", "900"))
+
+# Sunum modu: "swr" (stale-while-revalidate) eski snapshot'ı hemen gösterip arka planda
+# yeniler; "blocking" snapshot eskiyse yeni veri gelene kadar bekler
+SERVING_MODE = os.getenv("DASHBOARD_SERVING_MODE", "swr")
+
+# SWR modunda bu süreden eski snapshot gösterilmez, yeni veri beklenir (saniye)
+SNAPSHOT_STALE_MAX_AGE_SECONDS = int(os.getenv("SNAPSHOT_STALE_MAX_AGE_SECONDS", "86400"))
+
+# Arka plan yenilemeleri için thread sayısı (aynı anahtar için tek yenileme çalışır)
+SNAPSHOT_REFRESH_WORKERS = int(os.getenv("SNAPSHOT_REFRESH_WORKERS", "2"))
+
+# Yerel analitik depo (DuckDB): prefetch worker lead/ciro/harcama gün satırlarını
+# bu dosyaya senkronlar, dashboard özetleri üretim veritabanı yerine buradan okur
+LOCAL_STORE_PATH = os.getenv("LOCAL_STORE_PATH", os.path.join(CACHE_DIR, "analytics.duckdb"))
+USE_LOCAL_STORE = os.getenv("USE_LOCAL_STORE", "1") == "1"
+
+# Senkronlanan geçmiş (gün) ve bu süreden eski depo kullanılmaz (saniye)
+LOCAL_STORE_SYNC_DAYS = int(os.getenv("LOCAL_STORE_SYNC_DAYS", "400"))
+LOCAL_STORE_MAX_AGE_SECONDS = int(os.getenv("LOCAL_STORE_MAX_AGE_SECONDS", "1800"))
+
+# Sorgu sonucu önbelleği (database/query_cache.py): tüm oturumlarca paylaşılır, LRU ile bu boyutta tutulur (MB)
+USE_QUERY_CACHE = os.getenv("USE_QUERY_CACHE", "1") == "1"
+QUERY_CACHE_MAX_MB = int(os.getenv("QUERY_CACHE_MAX_MB", "256"))
+
+# Bugünden önce biten aralıkların sonuçları uzun, bugüne dokunanlar kısa süre saklanır (saniye)
+QUERY_CACHE_HISTORIC_TTL_SECONDS = int(os.getenv("QUERY_CACHE_HISTORIC_TTL_SECONDS", "21600"))
+QUERY_CACHE_RECENT_TTL_SECONDS = int(os.getenv("QUERY_CACHE_RECENT_TTL_SECONDS", "120"))
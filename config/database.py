@@ -53,11 +53,74 @@ def get_connection_string():
 UTM_SOURCE_MAPPING = {
     "google": "Google Ads",
     "facebook": "Facebook Ads",
-    "apple": "Apple Ads"  # Gelecekte eklenecek
+    "apple": "Apple Ads"
 }
 
 # Desteklenen platformlar
+# Apple Search Ads connector'ı hazır; credentials tanımlandığında "apple" eklenebilir
 SUPPORTED_PLATFORMS = ["google", "facebook"]
 
+# Platform API'leri paralel çekilir; her platformun kendi süre sınırı (saniye) var.
+# Süresi dolan platform o render'da atlanır; süren istek tamamlanırsa önbelleğe yazılır, ancak
+# yeniden deneme, kota beklemesi veya rapor sorgulaması yapılmaz. Uzun aralıkların asenkron
+# raporları prefetch'te PREFETCH_FETCH_TIMEOUT_SECONDS ile çekilir
+PLATFORM_FETCH_TIMEOUTS = {
+    "google": 45,
+    "facebook": 45,
+    "apple": 30
+}
+
+# Başarısız platform çekimi süre sınırı içinde kalmak kaydıyla bu kadar kez yeniden denenir
+PLATFORM_FETCH_RETRIES = 1
+
+# Platform çekimleri için ortak thread havuzu boyutu (tüm oturumlar paylaşır)
+PLATFORM_FETCH_MAX_WORKERS = 8
+
+# Platform/hesap başına API istek hızı (token bucket): saniyede istek ve anlık kapasite.
+# Tüm oturumların çağrıları aynı kovadan geçer
+PLATFORM_RATE_LIMITS = {
+    "google": {"rate": 5.0, "burst": 10},
+    "facebook": {"rate": 3.0, "burst": 6},
+    "apple": {"rate": 2.0, "burst": 4}
+}
+
+# Kısıtlama (throttle) hatasında yeniden deneme sayısı ve jitter'lı bekleme sınırları (saniye)
+RATE_LIMIT_MAX_RETRIES = 5
+RATE_LIMIT_BACKOFF_BASE_SECONDS = 1.0
+RATE_LIMIT_BACKOFF_MAX_SECONDS = 30.0
+
+# Platformun bildirdiği kota kullanımı (%) bu eşiği aşınca istek hızı düşürülür,
+# durdurma eşiğinde kota yenilenene kadar beklenir
+RATE_LIMIT_SLOWDOWN_PCT = 75
+RATE_LIMIT_PAUSE_PCT = 95
+
 # Varsayılan tarih aralığı (gün)
 DEFAULT_DATE_RANGE_DAYS = 7
+
+# Bağlantı havuzu: eşzamanlı render'lar en fazla DB_POOL_SIZE bağlantıyı paylaşır
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "8"))
+
+# Bu süreden uzun boşta kalan bağlantı, verilmeden önce SELECT 1 ile doğrulanır (saniye)
+DB_POOL_MAX_IDLE_SECONDS = int(os.getenv("DB_POOL_MAX_IDLE_SECONDS", "60"))
+
+# Bu süreden eski bağlantılar kapatılıp yenisi açılır (saniye)
+DB_POOL_MAX_LIFETIME_SECONDS = int(os.getenv("DB_POOL_MAX_LIFETIME_SECONDS", "1800"))
+
+# Havuz doluyken bağlantı için en fazla bu kadar beklenir (saniye)
+DB_POOL_CHECKOUT_TIMEOUT_SECONDS = int(os.getenv("DB_POOL_CHECKOUT_TIMEOUT_SECONDS", "30"))
+
+# DataFrame sorgularında fetchmany batch boyutu (satır)
+QUERY_FETCH_BATCH_SIZE = int(os.getenv("QUERY_FETCH_BATCH_SIZE", "5000"))
+
+# Akış (iter_query) sorgularında parça başına en fazla satır
+QUERY_CHUNK_ROWS = int(os.getenv("QUERY_CHUNK_ROWS", "50000"))
+
+# Sorgulardaki UtmSource IN (...) listesi sabit sayıda parametreyle bağlanır;
+# platform seçimi ne olursa olsun sorgu metni aynı kalır ve plan yeniden kullanılır
+SOURCE_PARAM_SLOTS = 8
+
+# Günlük fact tabloları (etl.py): son N gün her ETL turunda yeniden hesaplanır
+# (geç gelen ödeme/durum değişiklikleri için); USE_DAILY_FACTS=0 ile servisler canlı sorguya döner
+ETL_REPROCESS_DAYS = int(os.getenv("ETL_REPROCESS_DAYS", "3"))
+ETL_INTERVAL_SECONDS = int(os.getenv("ETL_INTERVAL_SECONDS", "900"))
+USE_DAILY_FACTS = os.getenv("USE_DAILY_FACTS", "1") == "1"
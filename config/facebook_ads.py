@@ -27,6 +27,30 @@ def get_facebook_config():
         "ad_account_id": os.getenv("FB_AD_ACCOUNT_ID", "act_76604119")
     }
 
+# Hesap bilgisi (name, currency, account_status) bu süreden sonra yeniden doğrulanır (saniye)
+ACCOUNT_REVALIDATE_SECONDS = int(os.getenv("FB_ACCOUNT_REVALIDATE_SECONDS", "3600"))
+
+# Bu günden uzun aralıklar asenkron rapor işi (AdReportRun) ile çekilir
+ASYNC_REPORT_THRESHOLD_DAYS = int(os.getenv("FB_ASYNC_REPORT_THRESHOLD_DAYS", "31"))
+
+# Asenkron rapor işinin tamamlanması için azami bekleme (saniye); çekim işinin süre sınırı
+# daha erkense (ör. render'da PLATFORM_FETCH_TIMEOUTS) sorgulama o sınırda bırakılır
+ASYNC_REPORT_TIMEOUT_SECONDS = int(os.getenv("FB_ASYNC_REPORT_TIMEOUT_SECONDS", "900"))
+
+# Asenkron rapor sonuçlarının sayfa boyutu
+ASYNC_REPORT_PAGE_SIZE = 500
+
+# Dönüşüm sayılan action_type listesi (FB_CONVERSION_ACTION_TYPES ile virgülle ayrılmış
+# olarak değiştirilebilir); diğer tipler action kırılımında yine de tutulur
+CONVERSION_ACTION_TYPES = [
+    action_type.strip()
+    for action_type in os.getenv(
+        "FB_CONVERSION_ACTION_TYPES",
+        "purchase,lead,complete_registration,omni_purchase"
+    ).split(",")
+    if action_type.strip()
+]
+
 # Lazy loading
 _fb_config = None
 
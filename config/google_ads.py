@@ -7,8 +7,6 @@ Streamlit Cloud'da secrets kullanır
 
 import os
 import streamlit as st
-import tempfile
-import yaml
 
 def get_google_ads_config():
     """Google Ads konfigürasyonunu döner"""
@@ -27,32 +25,32 @@ def get_google_ads_config():
     return None
 
 def get_google_ads_yaml_path():
-    """Google Ads YAML config path döner veya secrets'tan geçici dosya oluşturur"""
-    config = get_google_ads_config()
-    
-    if config:
-        # Secrets'tan geçici YAML dosyası oluştur
-        yaml_content = {
-            "developer_token": config["developer_token"],
-            "client_id": config["client_id"],
-            "client_secret": config["client_secret"],
-            "refresh_token": config["refresh_token"],
-            "login_customer_id": config["login_customer_id"],
-            "use_proto_plus": True
-        }
-        
-        # Geçici dosya oluştur
-        temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False)
-        yaml.dump(yaml_content, temp_file)
-        temp_file.close()
-        return temp_file.name
-    
-    # Lokal dosya
+    """
+    Lokal Google Ads YAML config path döner
+
+    Secrets tanımlıysa client doğrudan get_google_ads_config() sözlüğünden
+    oluşturulur; geçici YAML dosyası yazılmaz.
+    """
     local_path = os.path.join(os.path.dirname(__file__), "google-ads.yaml")
     if os.path.exists(local_path):
         return local_path
     
     return None
 
+# Uzun aralıklar bu gün sayısında parçalara bölünüp paralel stream edilir
+FETCH_CHUNK_DAYS = int(os.getenv("GOOGLE_ADS_CHUNK_DAYS", "7"))
+
+# Tek bir çekimde paralel çalışan parça sayısı
+FETCH_MAX_WORKERS = int(os.getenv("GOOGLE_ADS_MAX_WORKERS", "4"))
+
+# Process genelinde (tüm oturumlar) eşzamanlı search_stream üst sınırı
+MAX_CONCURRENT_STREAMS = int(os.getenv("GOOGLE_ADS_MAX_CONCURRENT_STREAMS", "6"))
+
+# Reklam kataloğu (final_url -> utm_content) en fazla bu aralıkla artımlı yenilenir (saniye)
+CATALOG_REFRESH_SECONDS = int(os.getenv("GOOGLE_ADS_CATALOG_REFRESH_SECONDS", "900"))
+
+# Katalog bu süreden eski ise tamamen yeniden çekilir (saat)
+CATALOG_MAX_AGE_HOURS = int(os.getenv("GOOGLE_ADS_CATALOG_MAX_AGE_HOURS", "24"))
+
 # Customer ID
 CUSTOMER_ID = "7731368325"
@@ -1,67 +1,342 @@
 """
-Apple Ads API Connector (Placeholder)
-=====================================
-Apple Search Ads API entegrasyonu - Gelecekte eklenecek
+Apple Search Ads API Connector
+==============================
+Apple Search Ads Campaign Management API'den kampanya verilerini çeker
+
+Kimlik doğrulama OAuth client credentials akışıdır: ES256 imzalı client
+secret (JWT) ile access token alınır. Her ikisi de process genelinde
+önbelleğe alınır ve yalnızca süresi dolduğunda yenilenir.
 """
 
+import threading
+import time
+import jwt
+import requests
 import pandas as pd
 from datetime import date
+from connectors import registry, rate_limit
+from connectors.columnar import ColumnBuffer
+from config.apple_ads import (
+    get_config,
+    API_BASE_URL,
+    TOKEN_URL,
+    CLIENT_SECRET_TTL_SECONDS,
+    REPORT_PAGE_SIZE,
+    REQUEST_TIMEOUT_SECONDS
+)
+
+
+# Connector sözleşmesi (bkz. connectors/registry.py)
+# Kampanya raporu DAILY granülaritede çekilir; diğer grain'ler bundan türetilir
+PLATFORM = "apple"
+CAPABILITIES = {
+    "server_side_grains": ("ad",),
+    "async_reports": False,
+    # Apple Search Ads DAILY raporları en fazla 90 günlük aralık kabul eder
+    "max_range_days": 90,
+}
+
+TOKEN_AUDIENCE = "https://appleid.apple.com"
+TOKEN_SCOPE = "searchadsorg"
+
+# Token süresi dolmadan bu kadar önce yenilenir (saniye)
+TOKEN_REFRESH_MARGIN_SECONDS = 60
+
+# Process genelinde paylaşılan HTTP oturumu ve kimlik bilgileri
+_session = None
+_client_secret = None
+_client_secret_expires_at = 0.0
+_access_token = None
+_access_token_expires_at = 0.0
+_auth_lock = threading.Lock()
+_auth_stats = {"client_secret_builds": 0, "token_requests": 0}
+
+
+def is_configured() -> bool:
+    """Apple Search Ads credentials tanımlı mı"""
+    config = get_config()
+    has_secret = config["client_secret"] or (config["private_key"] and config["key_id"])
+    return bool(config["client_id"] and config["team_id"] and config["org_id"] and has_secret)
+
+
+def _get_session() -> requests.Session:
+    """Bağlantıları yeniden kullanan paylaşılan HTTP oturumu"""
+    global _session
+    if _session is None:
+        _session = requests.Session()
+    return _session
+
+
+def _build_client_secret(config: dict) -> tuple:
+    """
+    Client secret'ı döner
+
+    Config'de hazır client secret varsa o kullanılır; yoksa private key ile
+    ES256 imzalı JWT üretilir.
+
+    Returns:
+        tuple: (client_secret, geçerlilik sonu - time.time())
+    """
+    if config["client_secret"]:
+        return config["client_secret"], float("inf")
+
+    issued_at = int(time.time())
+    expires_at = issued_at + CLIENT_SECRET_TTL_SECONDS
+    payload = {
+        "sub": config["client_id"],
+        "aud": TOKEN_AUDIENCE,
+        "iat": issued_at,
+        "exp": expires_at,
+        "iss": config["team_id"],
+    }
+    client_secret = jwt.encode(
+        payload,
+        config["private_key"],
+        algorithm="ES256",
+        headers={"kid": config["key_id"]}
+    )
+    return client_secret, float(expires_at)
+
+
+def get_access_token(force_refresh: bool = False) -> str:
+    """
+    Geçerli access token'ı döner
+
+    Client secret ve access token process başına önbelleğe alınır; token
+    yalnızca süresi dolmak üzereyken veya force_refresh=True ile yenilenir.
+    """
+    global _client_secret, _client_secret_expires_at, _access_token, _access_token_expires_at
+
+    with _auth_lock:
+        now = time.time()
+        if not force_refresh and _access_token and now < _access_token_expires_at - TOKEN_REFRESH_MARGIN_SECONDS:
+            return _access_token
+
+        config = get_config()
+        if _client_secret is None or now >= _client_secret_expires_at - TOKEN_REFRESH_MARGIN_SECONDS:
+            _client_secret, _client_secret_expires_at = _build_client_secret(config)
+            _auth_stats["client_secret_builds"] += 1
+
+        response = _get_session().post(
+            TOKEN_URL,
+            data={
+                "grant_type": "client_credentials",
+                "client_id": config["client_id"],
+                "client_secret": _client_secret,
+                "scope": TOKEN_SCOPE,
+            },
+            timeout=REQUEST_TIMEOUT_SECONDS
+        )
+        response.raise_for_status()
+        token = response.json()
+        _auth_stats["token_requests"] += 1
+
+        _access_token = token["access_token"]
+        _access_token_expires_at = now + int(token.get("expires_in", 3600))
+        print("✅ Apple Ads access token alındı")
+        return _access_token
+
+
+def reset_token():
+    """Önbellekteki access token'ı bırakır; client secret korunur"""
+    global _access_token, _access_token_expires_at
+    with _auth_lock:
+        _access_token = None
+        _access_token_expires_at = 0.0
+
+
+def get_auth_stats() -> dict:
+    """Kimlik doğrulama sayaçları (client secret üretimi, token isteği)"""
+    return dict(_auth_stats)
+
+
+def is_throttle_error(error: Exception) -> bool:
+    """Hata hız sınırı aşımından (HTTP 429) mı kaynaklanıyor"""
+    response = getattr(error, "response", None)
+    return isinstance(error, requests.HTTPError) and response is not None and response.status_code == 429
+
+
+def _retry_after(error: Exception):
+    """429 yanıtındaki Retry-After süresi (saniye) veya None"""
+    try:
+        return float(error.response.headers["Retry-After"])
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return None
+
+
+def _post(path: str, body: dict) -> dict:
+    """
+    API'ye yetkili POST isteği gönderir
+
+    İstekler organizasyon kovasından geçer; 429 yanıtı jitter'lı beklemeyle
+    yeniden denenir. 401 yanıtında token yenilenip istek bir kez tekrarlanır.
+    """
+    url = f"{API_BASE_URL}{path}"
+    org_id = get_config()["org_id"]
+
+    def request():
+        for attempt in range(2):
+            headers = {
+                "Authorization": f"Bearer {get_access_token(force_refresh=attempt > 0)}",
+                "X-AP-Context": f"orgId={org_id}",
+            }
+            response = _get_session().post(url, json=body, headers=headers, timeout=REQUEST_TIMEOUT_SECONDS)
+            if response.status_code == 401 and attempt == 0:
+                print("⚠️ Apple Ads token geçersiz, yenileniyor")
+                continue
+            response.raise_for_status()
+            return response.json()
+
+    return rate_limit.call_with_backoff(
+        rate_limit.get_limiter(PLATFORM, org_id),
+        request,
+        is_throttled=is_throttle_error,
+        retry_after=_retry_after
+    )
+
+
+def _iter_report_rows(start_date: date, end_date: date):
+    """
+    Kampanya raporunu sayfa sayfa okur
+
+    Her sayfa ayrı bir istektir; satırlar sayfa geldikçe döndürülür,
+    tüm yanıt bellekte biriktirilmez.
+
+    Yields:
+        dict: Kampanya satırı (metadata + günlük granularity listesi)
+    """
+    offset = 0
+    while True:
+        body = {
+            "startTime": str(start_date),
+            "endTime": str(end_date),
+            "granularity": "DAILY",
+            "timeZone": "ORTZ",
+            "selector": {
+                "orderBy": [{"field": "campaignId", "sortOrder": "ASCENDING"}],
+                "pagination": {"offset": offset, "limit": REPORT_PAGE_SIZE},
+            },
+            "returnRecordsWithNoMetrics": False,
+            "returnRowTotals": False,
+            "returnGrandTotals": False,
+        }
+        page = _post("/reports/campaigns", body)
+
+        rows = (page.get("data") or {}).get("reportingDataResponse", {}).get("row", [])
+        yield from rows
+
+        offset += len(rows)
+        total = (page.get("pagination") or {}).get("totalResults", 0)
+        if not rows or offset >= total:
+            break
+
+
+# Rapor satırlarının biriktirildiği sütun tampon şeması
+REPORT_SCHEMA = {
+    "date": "str",
+    "campaign_id": "str",
+    "campaign_name": "str",
+    "spend": "float",
+    "impressions": "int",
+    "clicks": "int",
+    "conversions": "int"
+}
+
+
+def _report_to_frame(rows) -> pd.DataFrame:
+    """Kampanya rapor satırlarını tipli sütun tamponları üzerinden connector şemasına çevirir"""
+    buffer = ColumnBuffer(REPORT_SCHEMA)
+    append = buffer.append
+
+    for row in rows:
+        metadata = row.get("metadata", {})
+        campaign_id = str(metadata.get("campaignId", ""))
+        campaign_name = metadata.get("campaignName", "")
+
+        for day in row.get("granularity", []):
+            append["date"](day["date"])
+            append["campaign_id"](campaign_id)
+            append["campaign_name"](campaign_name)
+            append["spend"](float((day.get("localSpend") or {}).get("amount", 0)))
+            append["impressions"](int(day.get("impressions", 0)))
+            append["clicks"](int(day.get("taps", 0)))
+            append["conversions"](int(day.get("totalInstalls", day.get("installs", 0))))
+
+    df = buffer.to_frame()
+    df["source"] = "apple"
+
+    # Kampanya adından UTM content çıkar
+    df["utm_content"] = df["campaign_name"].map(extract_utm_content)
+
+    return df[[
+        "date", "source", "campaign_id", "campaign_name",
+        "utm_content", "spend", "impressions", "clicks", "conversions"
+    ]]
 
 
 def fetch_campaign_data(start_date: date, end_date: date) -> pd.DataFrame:
     """
-    Apple Ads'den kampanya verilerini çeker
-    
-    NOT: Bu fonksiyon henüz implement edilmedi.
-    Credentials hazır olduğunda aktifleştirilecek.
-    
+    Apple Search Ads'den kampanya verilerini çeker
+
+    Aralık en fazla 90 gün olmalıdır (CAPABILITIES["max_range_days"]);
+    servis katmanı uzun aralıkları bu sınıra göre böler.
+
     Args:
         start_date: Başlangıç tarihi
         end_date: Bitiş tarihi
-    
+
     Returns:
-        DataFrame: Boş DataFrame (placeholder)
+        DataFrame: Kampanya verileri (source, content, spend, clicks, conversions, impressions)
     """
-    print("⏳ Apple Ads entegrasyonu henüz aktif değil")
-    
-    return pd.DataFrame(columns=[
-        "date", "source", "campaign_id", "campaign_name",
-        "utm_content", "spend", "impressions", "clicks", "conversions"
-    ])
+    if not is_configured():
+        # Başarısız sonuç: günler boş olarak önbelleğe yazılmaz, credentials eklenince çekilir
+        print("⏳ Apple Ads credentials tanımlı değil")
+        return pd.DataFrame()
+
+    try:
+        df = _report_to_frame(_iter_report_rows(start_date, end_date))
+
+        if df.empty:
+            print("⚠️ Apple Ads'den veri alınamadı")
+            return df
+
+        print(f"✅ Apple Ads: {len(df)} satır veri alındı")
+        return df
+
+    except Exception as e:
+        print(f"❌ Apple Ads veri çekme hatası: {e}")
+        return pd.DataFrame()
+
+
+def fetch(start_date: date, end_date: date, grain: str = "ad") -> pd.DataFrame:
+    """Connector sözleşmesi: kampanya+gün seviyesindeki rapor verisi"""
+    if grain != "ad":
+        return registry.aggregate_to_grain(fetch_campaign_data(start_date, end_date), grain)
+    return fetch_campaign_data(start_date, end_date)
+
+
+def extract_utm_content(campaign_name: str) -> str:
+    """
+    Kampanya adından UTM content değerini çıkarır
+
+    Kampanya isimlendirme kurallarınıza göre bu fonksiyonu özelleştirin.
+    """
+    if not campaign_name:
+        return ""
+
+    return campaign_name
 
 
 def get_spend_summary(start_date: date, end_date: date) -> dict:
-    """Placeholder - boş özet döner"""
-    return {
-        "total_spend": 0,
-        "total_clicks": 0,
-        "total_impressions": 0,
-        "total_conversions": 0
-    }
+    """Belirli tarih aralığı için harcama özeti döner (bkz. registry.get_spend_summary)"""
+    return registry.get_spend_summary(PLATFORM, start_date, end_date)
 
 
 def get_daily_spend(start_date: date, end_date: date) -> pd.DataFrame:
-    """Placeholder - boş DataFrame döner"""
-    return pd.DataFrame(columns=["date", "spend", "clicks", "impressions", "conversions"])
+    """Günlük harcama verisi döner (bkz. registry.get_daily_spend)"""
+    return registry.get_daily_spend(PLATFORM, start_date, end_date)
 
 
 def get_campaign_spend(start_date: date, end_date: date) -> pd.DataFrame:
-    """Placeholder - boş DataFrame döner"""
-    return pd.DataFrame(columns=[
-        "campaign_name", "utm_content", "spend", "clicks", "impressions", "conversions"
-    ])
-
-
-# ============================================================
-# Apple Ads API Entegrasyonu İçin Gerekli Bilgiler:
-# ============================================================
-# 1. Client ID
-# 2. Client Secret (.pem dosyası)
-# 3. Team ID
-# 4. Key ID
-# 5. Organization ID
-#
-# Bu bilgiler hazır olduğunda:
-# - config/apple_ads.py dosyası oluşturulacak
-# - Bu modül aktifleştirilecek
-# ============================================================
+    """Kampanya bazlı harcama verisi döner (bkz. registry.get_campaign_spend)"""
+    return registry.get_campaign_spend(PLATFORM, start_date, end_date)
@@ -4,97 +4,465 @@ Facebook Ads API Connector
 Facebook Ads API'den kampanya verilerini çeker
 """
 
+import json
+import threading
+import time
 import pandas as pd
+from collections import OrderedDict
 from datetime import date
 from facebook_business.api import FacebookAdsApi
+from facebook_business.session import FacebookSession
 from facebook_business.adobjects.adaccount import AdAccount
 from facebook_business.adobjects.adsinsights import AdsInsights
-from config.facebook_ads import get_config
+from facebook_business.adobjects.adreportrun import AdReportRun
+from facebook_business.exceptions import FacebookRequestError
+from connectors import registry, rate_limit
+from connectors.columnar import ColumnBuffer
+from config.facebook_ads import (
+    get_config,
+    ACCOUNT_REVALIDATE_SECONDS,
+    ASYNC_REPORT_THRESHOLD_DAYS,
+    ASYNC_REPORT_TIMEOUT_SECONDS,
+    ASYNC_REPORT_PAGE_SIZE,
+    CONVERSION_ACTION_TYPES
+)
 
 
-def get_account():
-    """Facebook Ads hesabına bağlanır"""
-    try:
-        config = get_config()
-        FacebookAdsApi.init(
-            config["app_id"],
-            config["app_secret"],
-            config["access_token"]
+# Connector sözleşmesi (bkz. connectors/registry.py)
+# Insights kampanya+gün seviyesinde çekilir; diğer grain'ler bundan türetilir
+PLATFORM = "facebook"
+CAPABILITIES = {
+    "server_side_grains": ("ad",),
+    "async_reports": True,
+    "max_range_days": None,
+}
+
+# Process genelinde paylaşılan API oturumu ve hesap
+_api = None
+_account = None
+_account_info = None
+_account_checked_at = 0.0
+_account_lock = threading.Lock()
+
+# Son çekimlerin action kırılımları: (start_date, end_date) -> uzun formatlı tablo
+# get_action_breakdown aynı aralık için Insights'ı yeniden çekmez
+ACTION_CACHE_SIZE = 32
+_action_cache = OrderedDict()
+_action_cache_lock = threading.Lock()
+
+# Geçersiz / süresi dolmuş token hata kodları
+AUTH_ERROR_CODES = (102, 190)
+
+# Hız sınırı / kota hata kodları (uygulama, kullanıcı, hesap ve business use case limitleri)
+THROTTLE_ERROR_CODES = (4, 17, 32, 613, 80000, 80003, 80004, 80014)
+THROTTLE_ERROR_SUBCODES = (1487742, 2446079)
+
+# Kota kullanımı bildiren yanıt header'ları
+USAGE_HEADERS = ("x-business-use-case-usage", "x-ad-account-usage", "x-app-usage")
+
+
+def parse_usage_headers(headers) -> tuple:
+    """
+    Graph API kota header'larından en yüksek kullanım yüzdesini okur
+
+    Returns:
+        tuple: (kullanım %, kota yenilenene kadar saniye) - header yoksa (None, 0)
+    """
+    headers = {key.lower(): value for key, value in (headers or {}).items()}
+    usage = None
+    regain_seconds = 0.0
+    
+    for name in USAGE_HEADERS:
+        if name not in headers:
+            continue
+        try:
+            payload = json.loads(headers[name])
+        except (TypeError, ValueError):
+            continue
+        
+        if name == "x-business-use-case-usage":
+            # {business_id: [{type, call_count, total_cputime, total_time, estimated_time_to_regain_access}]}
+            entries = [entry for values in payload.values() for entry in values]
+        else:
+            entries = [payload]
+        
+        for entry in entries:
+            for key in ("call_count", "total_cputime", "total_time", "acc_id_util_pct"):
+                if key in entry:
+                    usage = max(usage or 0.0, float(entry[key]))
+            # estimated_time_to_regain_access dakika, reset_time_duration saniye cinsindendir
+            regain_seconds = max(
+                regain_seconds,
+                float(entry.get("estimated_time_to_regain_access", 0)) * 60,
+                float(entry.get("reset_time_duration", 0))
+            )
+    
+    return usage, regain_seconds
+
+
+def is_throttle_error(error: Exception) -> bool:
+    """Hata hız sınırı / kota aşımından mı kaynaklanıyor"""
+    if not isinstance(error, FacebookRequestError):
+        return False
+    return (
+        error.api_error_code() in THROTTLE_ERROR_CODES
+        or error.api_error_subcode() in THROTTLE_ERROR_SUBCODES
+        or error.http_status() == 429
+    )
+
+
+def _observe_usage(limiter, headers):
+    usage, regain_seconds = parse_usage_headers(headers)
+    if usage is not None:
+        limiter.observe_usage(usage, regain_seconds)
+
+
+class ThrottledFacebookAdsApi(FacebookAdsApi):
+    """
+    Tüm Graph API çağrılarını hesap kovasından geçiren API
+
+    Cursor sayfaları ve asenkron rapor sorguları dahil her istek hız
+    sınırına tabidir; yanıt header'larındaki kota kullanımı kovayı
+    yavaşlatır, kısıtlama hatası jitter'lı beklemeyle yeniden denenir.
+    """
+
+    def __init__(self, session, limiter):
+        super().__init__(session)
+        self._limiter = limiter
+
+    def _observe_error(self, error: Exception):
+        if isinstance(error, FacebookRequestError):
+            _observe_usage(self._limiter, error.http_headers())
+
+    def call(self, *args, **kwargs):
+        def request():
+            response = super(ThrottledFacebookAdsApi, self).call(*args, **kwargs)
+            _observe_usage(self._limiter, response.headers())
+            return response
+        
+        return rate_limit.call_with_backoff(
+            self._limiter,
+            request,
+            is_throttled=is_throttle_error,
+            on_error=self._observe_error
         )
-        account = AdAccount(config["ad_account_id"])
+
+
+def get_account(revalidate: bool = False):
+    """
+    Facebook Ads hesabına bağlanır
+
+    API oturumu ve AdAccount process başına bir kez oluşturulur. Hesap bilgisi
+    ilk bağlantıda, ACCOUNT_REVALIDATE_SECONDS dolduğunda veya revalidate=True
+    ile doğrulanır; her veri çekiminde ek Graph API çağrısı yapılmaz.
+    """
+    global _api, _account, _account_info, _account_checked_at
+    
+    with _account_lock:
+        try:
+            if _account is None:
+                config = get_config()
+                session = FacebookSession(
+                    config["app_id"],
+                    config["app_secret"],
+                    config["access_token"]
+                )
+                _api = ThrottledFacebookAdsApi(
+                    session, rate_limit.get_limiter(PLATFORM, config["ad_account_id"])
+                )
+                FacebookAdsApi.set_default_api(_api)
+                _account = AdAccount(config["ad_account_id"], api=_api)
+                _account_info = None
+            
+            expired = time.monotonic() - _account_checked_at > ACCOUNT_REVALIDATE_SECONDS
+            if revalidate or _account_info is None or expired:
+                # Hesap testi
+                _account_info = _account.api_get(fields=['name', 'currency', 'account_status'])
+                _account_checked_at = time.monotonic()
+                print(f"✅ Facebook Ads bağlantısı başarılı: {_account_info.get('name', 'N/A')}")
+            
+            return _account
+        except Exception as e:
+            print(f"❌ Facebook Ads bağlantı hatası: {e}")
+            _api = None
+            _account = None
+            _account_info = None
+            raise
+
+
+def get_account_info() -> dict:
+    """Önbellekteki hesap bilgisini döner (name, currency, account_status)"""
+    get_account()
+    return dict(_account_info) if _account_info is not None else {}
+
+
+def reset_account():
+    """Paylaşılan API oturumunu bırakır; sonraki çağrı yeniden bağlanıp doğrular"""
+    global _api, _account, _account_info
+    with _account_lock:
+        _api = None
+        _account = None
+        _account_info = None
+
+
+def is_auth_error(error: Exception) -> bool:
+    """Hata geçersiz / süresi dolmuş erişim token'ından mı kaynaklanıyor"""
+    if not isinstance(error, FacebookRequestError):
+        return False
+    return error.api_error_code() in AUTH_ERROR_CODES or error.http_status() == 401
+
+
+# Senkron sorguda "veri çok büyük / geçici hata" kodları; asenkron moda geçilir
+ASYNC_FALLBACK_ERROR_CODES = (1, 2)
+
+# Asenkron iş durum değerleri
+ASYNC_JOB_COMPLETED = "Job Completed"
+ASYNC_JOB_FAILED = ("Job Failed", "Job Skipped")
+
+
+def _use_async_report(start_date: date, end_date: date) -> bool:
+    """Aralık eşikten uzunsa asenkron rapor modu seçilir"""
+    return (end_date - start_date).days + 1 > ASYNC_REPORT_THRESHOLD_DAYS
+
+
+def _run_async_report(account, fields: list, params: dict):
+    """
+    Insights sorgusunu asenkron rapor işi olarak çalıştırır
+
+    AdReportRun işi gönderilir, artan aralıklarla (1 sn'den 30 sn'ye) durumu
+    sorgulanır ve tamamlandığında sonuçlar sayfa sayfa döndürülür. Bekleme
+    ASYNC_REPORT_TIMEOUT_SECONDS'ı ve çekim işinin süre sınırını
+    (rate_limit.deadline) aşmaz; sınır dolunca sorgulama bırakılır.
+
+    Yields:
+        AdsInsights: Rapor satırları
+    """
+    job = account.get_insights(fields=fields, params=params, is_async=True)
+    deadline = time.monotonic() + ASYNC_REPORT_TIMEOUT_SECONDS
+    fetch_deadline = rate_limit.current_deadline()
+    if fetch_deadline is not None:
+        deadline = min(deadline, fetch_deadline)
+    delay = 1.0
+    
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise rate_limit.DeadlineExceeded(
+                f"Facebook rapor işi süre sınırı içinde tamamlanmadı, sorgulama bırakıldı "
+                f"(%{job.get(AdReportRun.Field.async_percent_completion, 0)}, id: {job['id']})"
+            )
+        time.sleep(min(delay, remaining))
+        job = job.api_get()
+        status = job[AdReportRun.Field.async_status]
         
-        # Hesap testi
-        account_info = account.api_get(fields=['name', 'currency', 'account_status'])
-        print(f"✅ Facebook Ads bağlantısı başarılı: {account_info.get('name', 'N/A')}")
+        if status == ASYNC_JOB_COMPLETED:
+            break
+        if status in ASYNC_JOB_FAILED:
+            raise RuntimeError(f"Facebook rapor işi başarısız: {status} (id: {job['id']})")
         
-        return account
-    except Exception as e:
-        print(f"❌ Facebook Ads bağlantı hatası: {e}")
-        raise
+        delay = min(delay * 2, 30.0)
+    
+    yield from job.get_result(params={'limit': ASYNC_REPORT_PAGE_SIZE})
+
+
+def _load_insights(account, fields: list, params: dict, use_async: bool):
+    """
+    Insights satırlarını döndürür
+
+    Senkron sorgu Graph API'nin "veri çok büyük" hatasıyla düşerse aynı
+    sorgu asenkron rapor işi olarak tekrarlanır.
+    """
+    if use_async:
+        yield from _run_async_report(account, fields, params)
+        return
+    
+    try:
+        # İlk sayfa burada yüklenir; sonraki sayfalar akış halinde okunur
+        cursor = account.get_insights(fields=fields, params=params)
+    except FacebookRequestError as e:
+        if e.api_error_code() not in ASYNC_FALLBACK_ERROR_CODES:
+            raise
+        print(f"⚠️ Facebook senkron sorgusu başarısız, asenkron rapora geçiliyor: {e.api_error_message()}")
+        yield from _run_async_report(account, fields, params)
+        return
+    
+    yield from cursor
+
+
+ACTION_COLUMNS = ["row", "date", "campaign_id", "action_type", "value"]
+
+
+def explode_actions(df: pd.DataFrame, actions: list) -> pd.DataFrame:
+    """
+    Satır başına actions listelerini uzun formatlı tabloya açar
+
+    Args:
+        df: Insights satırları (date, campaign_id)
+        actions: df ile aynı sırada her satırın actions listesi (veya None)
+
+    Returns:
+        DataFrame: row, date, campaign_id, action_type, value
+    """
+    exploded = pd.Series(actions, dtype=object).explode().dropna()
+    if exploded.empty:
+        return pd.DataFrame(columns=ACTION_COLUMNS)
+    
+    long = pd.DataFrame(exploded.tolist(), columns=["action_type", "value"])
+    rows = exploded.index.to_numpy()
+    long.insert(0, "row", rows)
+    long.insert(1, "date", df["date"].to_numpy()[rows])
+    long.insert(2, "campaign_id", df["campaign_id"].to_numpy()[rows])
+    long["value"] = pd.to_numeric(long["value"], errors="coerce").fillna(0)
+    
+    return long
+
 
+def compute_conversions(actions: pd.DataFrame, action_types: list, row_count: int) -> pd.Series:
+    """
+    Verilen action tipleri için satır bazlı dönüşüm sayısını hesaplar
+
+    Aynı çekimden farklı dönüşüm tanımları raporlamak için farklı
+    action_types ile tekrar çağrılabilir.
 
-def fetch_campaign_data(start_date: date, end_date: date) -> pd.DataFrame:
+    Returns:
+        Series: 0..row_count-1 satırları için dönüşüm sayısı
+    """
+    counted = actions[actions["action_type"].isin(action_types)]
+    conversions = counted.groupby("row")["value"].sum()
+    return conversions.reindex(range(row_count), fill_value=0).astype("int64")
+
+
+# Insights satırlarının biriktirildiği sütun tampon şeması
+INSIGHT_SCHEMA = {
+    "date": "str",
+    "campaign_id": "str",
+    "campaign_name": "str",
+    "spend": "float",
+    "impressions": "int",
+    "clicks": "int"
+}
+
+
+def _insights_to_frame(insights, action_types: list) -> tuple:
+    """
+    Insights satırlarını tipli sütun tamponları üzerinden connector şemasına çevirir
+
+    actions listeleri uzun formata açılıp dönüşümler vektörel group-by ile
+    hesaplanır.
+
+    Returns:
+        tuple: (connector şemasında DataFrame, tüm action tiplerinin uzun formatlı kırılımı)
+    """
+    buffer = ColumnBuffer(INSIGHT_SCHEMA)
+    append = buffer.append
+    actions = []
+    
+    for insight in insights:
+        append["date"](insight.get('date_start'))
+        append["campaign_id"](insight.get('campaign_id'))
+        append["campaign_name"](insight.get('campaign_name', ''))
+        append["spend"](float(insight.get('spend', 0)))
+        append["impressions"](int(insight.get('impressions', 0)))
+        append["clicks"](int(insight.get('clicks', 0)))
+        actions.append(insight.get('actions'))
+    
+    df = buffer.to_frame()
+    action_df = explode_actions(df, actions)
+    
+    df["source"] = "facebook"
+    
+    # Kampanya adından UTM content çıkar
+    df["utm_content"] = df["campaign_name"].map(extract_utm_content)
+    
+    # Dönüşümleri hesapla
+    df["conversions"] = compute_conversions(action_df, action_types, len(df)).to_numpy()
+    
+    df = df[[
+        "date", "source", "campaign_id", "campaign_name",
+        "utm_content", "spend", "impressions", "clicks", "conversions"
+    ]]
+    return df, action_df
+
+
+def _fetch_insights(start_date: date, end_date: date, action_types: list) -> tuple:
+    """
+    Insights verisini çeker; oturum geçersizse bir kez yeniden bağlanıp tekrar dener
+
+    ASYNC_REPORT_THRESHOLD_DAYS'ten uzun aralıklar asenkron rapor işiyle çekilir.
+
+    Returns:
+        tuple: (DataFrame, action kırılımı) - bkz. _insights_to_frame
+    """
+    params = {
+        'time_range': {
+            'since': str(start_date),
+            'until': str(end_date)
+        },
+        'time_increment': 1,  # Günlük
+        'level': 'campaign',  # Kampanya bazlı
+    }
+    
+    fields = [
+        AdsInsights.Field.date_start,
+        AdsInsights.Field.campaign_id,
+        AdsInsights.Field.campaign_name,
+        AdsInsights.Field.spend,
+        AdsInsights.Field.impressions,
+        AdsInsights.Field.clicks,
+        AdsInsights.Field.actions,
+    ]
+    
+    use_async = _use_async_report(start_date, end_date)
+    
+    try:
+        return _insights_to_frame(
+            _load_insights(get_account(), fields, params, use_async), action_types
+        )
+    except FacebookRequestError as e:
+        if not is_auth_error(e):
+            raise
+        # Oturum geçersiz: hesabı yeniden bağla, doğrula ve bir kez tekrar dene
+        print(f"⚠️ Facebook Ads oturumu geçersiz, yeniden bağlanılıyor: {e.api_error_message()}")
+        reset_account()
+        return _insights_to_frame(
+            _load_insights(get_account(revalidate=True), fields, params, use_async), action_types
+        )
+
+
+def _remember_actions(start_date: date, end_date: date, actions: pd.DataFrame):
+    with _action_cache_lock:
+        _action_cache[(start_date, end_date)] = actions
+        _action_cache.move_to_end((start_date, end_date))
+        while len(_action_cache) > ACTION_CACHE_SIZE:
+            _action_cache.popitem(last=False)
+
+
+def _cached_actions(start_date: date, end_date: date):
+    with _action_cache_lock:
+        return _action_cache.get((start_date, end_date))
+
+
+def fetch_campaign_data(start_date: date, end_date: date, action_types: list = None) -> pd.DataFrame:
     """
     Facebook Ads'den kampanya verilerini çeker
+
+    Aynı çekimin tüm action tiplerindeki kırılımı aralık anahtarıyla saklanır;
+    get_action_breakdown onu okur (bkz. _remember_actions).
     
     Args:
         start_date: Başlangıç tarihi
         end_date: Bitiş tarihi
+        action_types: Dönüşüm sayılan action tipleri (varsayılan: CONVERSION_ACTION_TYPES)
     
     Returns:
         DataFrame: Kampanya verileri (source, content, spend, clicks, conversions, impressions)
     """
     try:
-        account = get_account()
-        
-        params = {
-            'time_range': {
-                'since': str(start_date),
-                'until': str(end_date)
-            },
-            'time_increment': 1,  # Günlük
-            'level': 'campaign',  # Kampanya bazlı
-        }
-        
-        fields = [
-            AdsInsights.Field.date_start,
-            AdsInsights.Field.campaign_id,
-            AdsInsights.Field.campaign_name,
-            AdsInsights.Field.spend,
-            AdsInsights.Field.impressions,
-            AdsInsights.Field.clicks,
-            AdsInsights.Field.actions,
-        ]
-        
-        insights = account.get_insights(fields=fields, params=params)
+        if action_types is None:
+            action_types = CONVERSION_ACTION_TYPES
         
-        data = []
-        for insight in insights:
-            campaign_name = insight.get('campaign_name', '')
-            
-            # Dönüşümleri hesapla
-            conversions = 0
-            if insight.get('actions'):
-                for action in insight.get('actions'):
-                    if action.get('action_type') in ['purchase', 'lead', 'complete_registration', 'omni_purchase']:
-                        conversions += int(action.get('value', 0))
-            
-            # Kampanya adından UTM content çıkar
-            utm_content = extract_utm_content(campaign_name)
-            
-            data.append({
-                "date": insight.get('date_start'),
-                "source": "facebook",
-                "campaign_id": insight.get('campaign_id'),
-                "campaign_name": campaign_name,
-                "utm_content": utm_content,
-                "spend": float(insight.get('spend', 0)),
-                "impressions": int(insight.get('impressions', 0)),
-                "clicks": int(insight.get('clicks', 0)),
-                "conversions": conversions
-            })
-        
-        df = pd.DataFrame(data)
+        df, actions = _fetch_insights(start_date, end_date, action_types)
+        _remember_actions(start_date, end_date, actions)
         
         if df.empty:
             print("⚠️ Facebook Ads'den veri alınamadı")
@@ -111,6 +479,13 @@ def fetch_campaign_data(start_date: date, end_date: date) -> pd.DataFrame:
         return pd.DataFrame()
 
 
+def fetch(start_date: date, end_date: date, grain: str = "ad") -> pd.DataFrame:
+    """Connector sözleşmesi: kampanya+gün seviyesindeki insights verisi"""
+    if grain != "ad":
+        return registry.aggregate_to_grain(fetch_campaign_data(start_date, end_date), grain)
+    return fetch_campaign_data(start_date, end_date)
+
+
 def extract_utm_content(campaign_name: str) -> str:
     """
     Kampanya adından UTM content değerini çıkarır
@@ -123,59 +498,38 @@ def extract_utm_content(campaign_name: str) -> str:
     return campaign_name
 
 
-def get_spend_summary(start_date: date, end_date: date) -> dict:
+def get_action_breakdown(start_date: date, end_date: date) -> pd.DataFrame:
     """
-    Belirli tarih aralığı için harcama özeti döner
+    Action tipi bazlı günlük kırılımı döner
+
+    Aynı aralığın fetch_campaign_data çekiminden saklanan kırılım kullanılır;
+    yoksa aralık bir kez çekilir. Farklı dönüşüm tanımları bu tablodan
+    yeniden API'ye gitmeden hesaplanabilir.
+
+    Returns:
+        DataFrame: date, campaign_id, action_type, value
     """
-    df = fetch_campaign_data(start_date, end_date)
+    actions = _cached_actions(start_date, end_date)
+    if actions is None:
+        fetch_campaign_data(start_date, end_date)
+        actions = _cached_actions(start_date, end_date)
     
-    if df.empty:
-        return {
-            "total_spend": 0,
-            "total_clicks": 0,
-            "total_impressions": 0,
-            "total_conversions": 0
-        }
+    if actions is None or actions.empty:
+        return pd.DataFrame(columns=["date", "campaign_id", "action_type", "value"])
     
-    return {
-        "total_spend": df["spend"].sum(),
-        "total_clicks": df["clicks"].sum(),
-        "total_impressions": df["impressions"].sum(),
-        "total_conversions": df["conversions"].sum()
-    }
+    return actions.groupby(["date", "campaign_id", "action_type"], as_index=False)["value"].sum()
+
+
+def get_spend_summary(start_date: date, end_date: date) -> dict:
+    """Belirli tarih aralığı için harcama özeti döner (bkz. registry.get_spend_summary)"""
+    return registry.get_spend_summary(PLATFORM, start_date, end_date)
 
 
 def get_daily_spend(start_date: date, end_date: date) -> pd.DataFrame:
-    """Günlük harcama verisi döner"""
-    df = fetch_campaign_data(start_date, end_date)
-    
-    if df.empty:
-        return pd.DataFrame(columns=["date", "spend", "clicks", "impressions", "conversions"])
-    
-    daily = df.groupby("date").agg({
-        "spend": "sum",
-        "clicks": "sum",
-        "impressions": "sum",
-        "conversions": "sum"
-    }).reset_index()
-    
-    return daily
+    """Günlük harcama verisi döner (bkz. registry.get_daily_spend)"""
+    return registry.get_daily_spend(PLATFORM, start_date, end_date)
 
 
 def get_campaign_spend(start_date: date, end_date: date) -> pd.DataFrame:
-    """Kampanya bazlı harcama verisi döner"""
-    df = fetch_campaign_data(start_date, end_date)
-    
-    if df.empty:
-        return pd.DataFrame(columns=[
-            "campaign_name", "utm_content", "spend", "clicks", "impressions", "conversions"
-        ])
-    
-    campaign = df.groupby(["campaign_name", "utm_content"]).agg({
-        "spend": "sum",
-        "clicks": "sum",
-        "impressions": "sum",
-        "conversions": "sum"
-    }).reset_index()
-    
-    return campaign.sort_values("spend", ascending=False)
+    """Kampanya bazlı harcama verisi döner (bkz. registry.get_campaign_spend)"""
+    return registry.get_campaign_spend(PLATFORM, start_date, end_date)
@@ -5,104 +5,610 @@ Google Ads API'den kampanya verilerini çeker
 """
 
 import os
+import threading
+import time
 import pandas as pd
-from datetime import date, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
 from google.ads.googleads.client import GoogleAdsClient
 from google.ads.googleads.errors import GoogleAdsException
+from connectors import registry, rate_limit
+from connectors.columnar import ColumnBuffer
+from config.google_ads import (
+    get_google_ads_config,
+    FETCH_CHUNK_DAYS,
+    FETCH_MAX_WORKERS,
+    MAX_CONCURRENT_STREAMS,
+    CATALOG_REFRESH_SECONDS,
+    CATALOG_MAX_AGE_HOURS
+)
 
 
+# Connector sözleşmesi (bkz. connectors/registry.py)
+PLATFORM = "google"
+CAPABILITIES = {
+    "server_side_grains": ("total", "daily", "campaign", "ad"),
+    "async_reports": False,
+    "max_range_days": None,
+}
+
 # Google Ads Customer ID
 CUSTOMER_ID = "7731368325"
 
-# Config dosyası yolu
+# Config dosyası yolu (secrets yoksa kullanılır)
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), "..", "config", "google-ads.yaml")
 
+# Process genelinde paylaşılan client ve servisler (tüm Streamlit oturumları kullanır)
+_client = None
+_services = {}
+_client_lock = threading.Lock()
+_client_build_count = 0
+
+# Tüm oturumlardaki eşzamanlı search_stream sayısı (API kotası için)
+_stream_slots = threading.BoundedSemaphore(MAX_CONCURRENT_STREAMS)
+
+
+def _build_client():
+    """Secrets'tan (bellekte) veya lokal YAML'dan yeni client oluşturur"""
+    config = get_google_ads_config()
+    if config:
+        config = dict(config)
+        # Boş login_customer_id client doğrulamasından geçmez
+        if not config.get("login_customer_id"):
+            config.pop("login_customer_id", None)
+        return GoogleAdsClient.load_from_dict(config)
+    return GoogleAdsClient.load_from_storage(CONFIG_PATH)
+
 
 def get_client():
-    """Google Ads API client döner"""
-    try:
-        client = GoogleAdsClient.load_from_storage(CONFIG_PATH)
-        return client
-    except Exception as e:
-        print(f"❌ Google Ads bağlantı hatası: {e}")
-        raise
+    """
+    Google Ads API client döner
+
+    Client process başına bir kez oluşturulur ve paylaşılır. OAuth access
+    token'ı client içindeki credentials tarafından yalnızca süresi dolduğunda
+    refresh token ile yenilenir.
+    """
+    global _client, _client_build_count
+    
+    if _client is not None:
+        return _client
+    
+    with _client_lock:
+        if _client is None:
+            try:
+                _client = _build_client()
+                _client_build_count += 1
+            except Exception as e:
+                print(f"❌ Google Ads bağlantı hatası: {e}")
+                raise
+    return _client
+
+
+def get_service(name: str = "GoogleAdsService"):
+    """
+    Paylaşılan client üzerinden servis döner
+
+    Servisler (ve altlarındaki gRPC kanalları) thread-safe'tir ve önbellekte tutulur.
+    """
+    service = _services.get(name)
+    if service is not None:
+        return service
+    
+    client = get_client()
+    with _client_lock:
+        if name not in _services:
+            _services[name] = client.get_service(name)
+        return _services[name]
+
 
+def reset_client():
+    """Paylaşılan client'ı ve servisleri bırakır; sonraki çağrı yeniden oluşturur"""
+    global _client
+    with _client_lock:
+        _client = None
+        _services.clear()
 
-def fetch_campaign_data(start_date: date, end_date: date) -> pd.DataFrame:
+
+def get_client_stats() -> dict:
+    """
+    Client önbelleği istatistiklerini döner
+
+    Returns:
+        dict: {client_builds, cached_services}
+    """
+    return {
+        "client_builds": _client_build_count,
+        "cached_services": sorted(_services.keys())
+    }
+
+
+def is_quota_error(error: Exception) -> bool:
+    """Hata API kotası / hız sınırı aşımından mı kaynaklanıyor"""
+    if isinstance(error, GoogleAdsException):
+        if any(getattr(err.error_code, "quota_error", 0) for err in error.failure.errors):
+            return True
+        call = error.error
+    else:
+        call = error
+    code = call.code() if callable(getattr(call, "code", None)) else None
+    return getattr(code, "name", "") == "RESOURCE_EXHAUSTED"
+
+
+def quota_retry_delay(error: Exception):
+    """API'nin kota hatasında önerdiği bekleme süresi (saniye) veya None"""
+    if not isinstance(error, GoogleAdsException):
+        return None
+    for err in error.failure.errors:
+        try:
+            delay = err.details.quota_error_details.retry_delay
+            seconds = delay.total_seconds() if hasattr(delay, "total_seconds") else delay.seconds
+        except AttributeError:
+            continue
+        if seconds:
+            return float(seconds)
+    return None
+
+
+def _search_stream(query: str, read_response):
+    """
+    GAQL sorgusunu hız sınırı altında stream eder
+
+    Her çağrı hesap kovasından geçer ve eşzamanlı stream sayısı
+    MAX_CONCURRENT_STREAMS ile sınırlıdır. Kota hatasında stream jitter'lı
+    beklemeden sonra baştan okunur.
+
+    Args:
+        query: GAQL sorgusu
+        read_response: read_response(response) -> sonuç; her denemede yanıtı baştan tüketir
+    """
+    ga_service = get_service("GoogleAdsService")
+    
+    def run():
+        with _stream_slots:
+            return read_response(ga_service.search_stream(customer_id=CUSTOMER_ID, query=query))
+    
+    return rate_limit.call_with_backoff(
+        rate_limit.get_limiter(PLATFORM, CUSTOMER_ID),
+        run,
+        is_throttled=is_quota_error,
+        retry_after=quota_retry_delay
+    )
+
+
+def _date_chunks(start_date: date, end_date: date, chunk_days: int) -> list:
+    """Tarih aralığını en fazla chunk_days günlük (başlangıç, bitiş) parçalarına böler"""
+    chunks = []
+    chunk_start = start_date
+    while chunk_start <= end_date:
+        chunk_end = min(chunk_start + timedelta(days=chunk_days - 1), end_date)
+        chunks.append((chunk_start, chunk_end))
+        chunk_start = chunk_end + timedelta(days=1)
+    return chunks
+
+
+# Desteklenen veri tanelikleri (grain) ve her biri için en dar GAQL sorgusu.
+# Tüm grain'ler kaldırılmış (REMOVED) kampanyaları dışarıda bırakır; toplamlar
+# grain'den bağımsızdır. total/daily kampanya satırı (gün segmenti olmadan /
+# gün başına) çeker ve sonuç burada toplanır.
+GRAIN_QUERIES = {
+    "total": """
+        SELECT
+            campaign.id,
+            metrics.cost_micros,
+            metrics.impressions,
+            metrics.clicks,
+            metrics.conversions
+        FROM campaign
+        WHERE segments.date BETWEEN '{start_date}' AND '{end_date}'
+          AND campaign.status != 'REMOVED'
+    """,
+    "daily": """
+        SELECT
+            segments.date,
+            campaign.id,
+            metrics.cost_micros,
+            metrics.impressions,
+            metrics.clicks,
+            metrics.conversions
+        FROM campaign
+        WHERE segments.date BETWEEN '{start_date}' AND '{end_date}'
+          AND campaign.status != 'REMOVED'
+        ORDER BY segments.date ASC
+    """,
+    "campaign": """
+        SELECT
+            segments.date,
+            campaign.id,
+            campaign.name,
+            metrics.cost_micros,
+            metrics.impressions,
+            metrics.clicks,
+            metrics.conversions
+        FROM campaign
+        WHERE segments.date BETWEEN '{start_date}' AND '{end_date}'
+          AND campaign.status != 'REMOVED'
+        ORDER BY segments.date ASC
+    """,
+    # Reklam bazlı metrikler; reklam grubu adı ve final URL katalogdan eklenir.
+    # Kampanya adı katalogda olmayan reklamlarda utm_content yedeğidir
+    "ad": """
+        SELECT
+            segments.date,
+            campaign.id,
+            campaign.name,
+            ad_group.id,
+            ad_group_ad.ad.id,
+            metrics.cost_micros,
+            metrics.impressions,
+            metrics.clicks,
+            metrics.conversions
+        FROM ad_group_ad
+        WHERE segments.date BETWEEN '{start_date}' AND '{end_date}'
+          AND campaign.status != 'REMOVED'
+          AND ad_group.status != 'REMOVED'
+          AND ad_group_ad.status != 'REMOVED'
+        ORDER BY segments.date ASC
+    """,
+}
+
+# Grain bazında boş sonuç şeması
+GRAIN_COLUMNS = {
+    "total": ["spend", "impressions", "clicks", "conversions"],
+    "daily": ["date", "spend", "impressions", "clicks", "conversions"],
+    "campaign": [
+        "date", "source", "campaign_id", "campaign_name",
+        "utm_content", "spend", "impressions", "clicks", "conversions"
+    ],
+    "ad": [
+        "date", "source", "campaign_id", "campaign_name",
+        "utm_content", "spend", "impressions", "clicks", "conversions"
+    ],
+}
+
+# Satır sayısı gün sayısıyla büyüyen grain'ler parçalı çekilir
+CHUNKED_GRAINS = ("campaign", "ad")
+
+
+# Grain bazında sütun tampon şemaları (satırlar dict yerine tipli sütunlarda birikir)
+METRIC_SCHEMA = {
+    "spend": "float",
+    "impressions": "int",
+    "clicks": "int",
+    "conversions": "float"
+}
+
+GRAIN_SCHEMAS = {
+    "total": METRIC_SCHEMA,
+    "daily": {"date": "str", **METRIC_SCHEMA},
+    "campaign": {"date": "str", "campaign_id": "int", "campaign_name": "str", **METRIC_SCHEMA},
+    "ad": {"date": "str", "campaign_id": "int", "campaign_name": "str", "ad_group_id": "int", "ad_id": "int", **METRIC_SCHEMA},
+}
+
+
+def _append_metrics(append: dict, row):
+    metrics = row.metrics
+    append["spend"](metrics.cost_micros / 1_000_000)
+    append["impressions"](metrics.impressions)
+    append["clicks"](metrics.clicks)
+    append["conversions"](metrics.conversions)
+
+
+def _append_total_row(append: dict, row):
+    _append_metrics(append, row)
+
+
+def _append_daily_row(append: dict, row):
+    append["date"](row.segments.date)
+    _append_metrics(append, row)
+
+
+def _append_campaign_row(append: dict, row):
+    append["date"](row.segments.date)
+    append["campaign_id"](row.campaign.id)
+    append["campaign_name"](row.campaign.name)
+    _append_metrics(append, row)
+
+
+def _append_ad_row(append: dict, row):
+    append["date"](row.segments.date)
+    append["campaign_id"](row.campaign.id)
+    append["campaign_name"](row.campaign.name)
+    append["ad_group_id"](row.ad_group.id)
+    append["ad_id"](row.ad_group_ad.ad.id)
+    _append_metrics(append, row)
+
+
+GRAIN_APPENDERS = {
+    "total": _append_total_row,
+    "daily": _append_daily_row,
+    "campaign": _append_campaign_row,
+    "ad": _append_ad_row,
+}
+
+
+def _fetch_chunk(start_date: date, end_date: date, grain: str) -> ColumnBuffer:
+    """
+    Tek bir tarih parçası için grain'e uygun GAQL stream'ini okur
+
+    Satırlar batch batch tipli sütun tamponlarına yazılır (bkz. _search_stream).
+    """
+    query = GRAIN_QUERIES[grain].format(start_date=start_date, end_date=end_date)
+    append_row = GRAIN_APPENDERS[grain]
+    
+    def read_response(response):
+        buffer = ColumnBuffer(GRAIN_SCHEMAS[grain])
+        append = buffer.append
+        for batch in response:
+            for row in batch.results:
+                append_row(append, row)
+        return buffer
+    
+    return _search_stream(query, read_response)
+
+
+# ============================================================
+# Reklam metadata kataloğu
+# ============================================================
+# (ad_group_id, ad_id) -> kampanya, reklam grubu, final_url, utm_content.
+# Reklam URL'leri nadiren değişir; katalog bir kez çekilir, change_status
+# ile değişen kampanyalar için artımlı yenilenir ve günlük metriklere
+# hash join ile eklenir.
+
+CATALOG_QUERY = """
+    SELECT
+        campaign.id,
+        campaign.name,
+        ad_group.id,
+        ad_group.name,
+        ad_group_ad.ad.id,
+        ad_group_ad.ad.final_urls
+    FROM ad_group_ad
+    WHERE campaign.status != 'REMOVED'
+      AND ad_group.status != 'REMOVED'
+      AND ad_group_ad.status != 'REMOVED'
+      {filter}
+"""
+
+CHANGE_STATUS_QUERY = """
+    SELECT
+        change_status.campaign,
+        change_status.last_change_date_time
+    FROM change_status
+    WHERE change_status.last_change_date_time BETWEEN '{since}' AND '{until}'
+      AND change_status.resource_type IN ('CAMPAIGN', 'AD_GROUP', 'AD_GROUP_AD')
+    LIMIT {limit}
+"""
+
+# change_status sorgusu en fazla bu kadar satır döner; sınıra ulaşılırsa tam yenileme yapılır
+CHANGE_STATUS_LIMIT = 10000
+
+CATALOG_COLUMNS = [
+    "campaign_id", "campaign_name", "ad_group_id", "ad_group_name",
+    "ad_id", "final_url", "utm_content"
+]
+
+_catalog = None
+_catalog_synced_at = None
+_catalog_checked_at = 0.0
+_catalog_lock = threading.Lock()
+
+
+def _parse_catalog_row(row) -> dict:
+    campaign_name = row.campaign.name
+    
+    # Final URL'lerden utm_content çıkar (reklam başına bir kez)
+    final_urls = list(row.ad_group_ad.ad.final_urls) if row.ad_group_ad.ad.final_urls else []
+    final_url = final_urls[0] if final_urls else ""
+    utm_content = extract_utm_content_from_url(final_url)
+    
+    # URL'den bulunamadıysa kampanya adını kullan
+    if not utm_content:
+        utm_content = campaign_name
+    
+    return {
+        "campaign_id": row.campaign.id,
+        "campaign_name": campaign_name,
+        "ad_group_id": row.ad_group.id,
+        "ad_group_name": row.ad_group.name,
+        "ad_id": row.ad_group_ad.ad.id,
+        "final_url": final_url,
+        "utm_content": utm_content
+    }
+
+
+def _query_catalog(gaql_filter: str = "") -> pd.DataFrame:
+    """Katalog satırlarını çeker (gaql_filter ör. "AND campaign.id IN (1, 2)")"""
+    query = CATALOG_QUERY.format(filter=gaql_filter)
+    
+    def read_response(response):
+        data = []
+        for batch in response:
+            for row in batch.results:
+                data.append(_parse_catalog_row(row))
+        return pd.DataFrame(data, columns=CATALOG_COLUMNS)
+    
+    return _search_stream(query, read_response)
+
+
+def _changed_campaign_ids(since: datetime, until: datetime):
+    """
+    since'ten beri değişen kampanya id'lerini döner
+
+    Returns:
+        set veya None (değişiklik sayısı sorgu sınırını aştıysa)
+    """
+    query = CHANGE_STATUS_QUERY.format(
+        since=since.strftime("%Y-%m-%d %H:%M:%S"),
+        until=until.strftime("%Y-%m-%d %H:%M:%S"),
+        limit=CHANGE_STATUS_LIMIT
+    )
+    
+    def read_response(response):
+        campaign_ids = set()
+        row_count = 0
+        for batch in response:
+            for row in batch.results:
+                row_count += 1
+                # customers/{customer_id}/campaigns/{campaign_id}
+                if row.change_status.campaign:
+                    campaign_ids.add(int(row.change_status.campaign.rsplit("/", 1)[-1]))
+        return None if row_count >= CHANGE_STATUS_LIMIT else campaign_ids
+    
+    return _search_stream(query, read_response)
+
+
+def _replace_catalog_rows(catalog: pd.DataFrame, fresh: pd.DataFrame, column: str, ids) -> pd.DataFrame:
+    """column değeri ids içinde olan katalog satırlarını fresh ile değiştirir"""
+    kept = catalog[~catalog[column].isin(ids)]
+    if fresh.empty:
+        return kept.reset_index(drop=True)
+    if kept.empty:
+        return fresh.reset_index(drop=True)
+    return pd.concat([kept, fresh], ignore_index=True)
+
+
+def get_ad_catalog(required_ads: set = None) -> pd.DataFrame:
+    """
+    Reklam metadata kataloğunu döner
+
+    İlk çağrıda ve CATALOG_MAX_AGE_HOURS dolduğunda tamamen çekilir. Aradaki
+    çağrılarda en fazla CATALOG_REFRESH_SECONDS'ta bir change_status ile
+    değişen kampanyalar yenilenir. Katalogda olmayan (yeni) reklamlar
+    required_ads ile istenirse yalnızca onlar çekilir.
+
+    Args:
+        required_ads: Katalogda bulunması gereken (ad_group_id, ad_id) çiftleri
+
+    Returns:
+        DataFrame: CATALOG_COLUMNS
+    """
+    global _catalog, _catalog_synced_at, _catalog_checked_at
+    
+    with _catalog_lock:
+        now = datetime.now()
+        
+        if _catalog is None or now - _catalog_synced_at > timedelta(hours=CATALOG_MAX_AGE_HOURS):
+            _catalog = _query_catalog()
+            _catalog_synced_at = now
+            _catalog_checked_at = time.monotonic()
+            print(f"✅ Google Ads reklam kataloğu yüklendi: {len(_catalog)} reklam")
+        
+        elif time.monotonic() - _catalog_checked_at > CATALOG_REFRESH_SECONDS:
+            # Saat dilimi farkları için bir günlük pay bırak
+            changed = _changed_campaign_ids(_catalog_synced_at - timedelta(days=1), now + timedelta(days=1))
+            if changed is None:
+                _catalog = _query_catalog()
+            elif changed:
+                id_list = ", ".join(str(campaign_id) for campaign_id in sorted(changed))
+                fresh = _query_catalog(f"AND campaign.id IN ({id_list})")
+                _catalog = _replace_catalog_rows(_catalog, fresh, "campaign_id", changed)
+                print(f"🔄 Google Ads kataloğu güncellendi: {len(changed)} kampanya")
+            _catalog_synced_at = now
+            _catalog_checked_at = time.monotonic()
+        
+        if required_ads:
+            known = set(zip(_catalog["ad_group_id"], _catalog["ad_id"]))
+            missing = {key for key in required_ads if key not in known}
+            if missing:
+                id_list = ", ".join(str(ad_id) for ad_id in sorted({ad_id for _, ad_id in missing}))
+                fresh = _query_catalog(f"AND ad_group_ad.ad.id IN ({id_list})")
+                _catalog = _replace_catalog_rows(_catalog, fresh, "ad_id", {ad_id for _, ad_id in missing})
+        
+        return _catalog
+
+
+def _join_catalog(metrics: pd.DataFrame) -> pd.DataFrame:
+    """
+    Reklam metriklerine katalog alanlarını (ad_group_id, ad_id) üzerinden ekler
+
+    Katalogda bulunmayan reklamlarda utm_content kampanya adına düşer
+    (URL'den utm_content çıkarılamayan reklamlarla aynı).
+    """
+    required = set(zip(metrics["ad_group_id"], metrics["ad_id"]))
+    catalog = get_ad_catalog(required)
+    
+    df = metrics.merge(
+        catalog.drop(columns=["campaign_id", "campaign_name"]),
+        on=["ad_group_id", "ad_id"],
+        how="left"
+    )
+    df["source"] = "google"
+    df["campaign_name"] = df["campaign_name"].fillna("")
+    df["utm_content"] = df["utm_content"].where(
+        df["utm_content"].fillna("") != "", df["campaign_name"]
+    )
+    for column in ("ad_group_name", "final_url"):
+        df[column] = df[column].fillna("")
+    
+    return df[[
+        "date", "source", "campaign_id", "campaign_name", "ad_group_id", "ad_group_name",
+        "ad_id", "final_url", "utm_content", "spend", "impressions", "clicks", "conversions"
+    ]]
+
+
+def fetch_campaign_data(start_date: date, end_date: date, grain: str = "ad") -> pd.DataFrame:
     """
     Google Ads'den kampanya verilerini çeker
+
+    İstenen grain için en dar sorgu kullanılır: "total" ve "daily" kampanya
+    satırlarından toplanır, "campaign" reklam satırı indirmez, "ad" yalnızca
+    id ve metrik çeker; final URL ve utm_content reklam kataloğundan eklenir. campaign/ad aralıkları
+    FETCH_CHUNK_DAYS günlük parçalara bölünüp paralel stream edilir.
     
     Args:
         start_date: Başlangıç tarihi
         end_date: Bitiş tarihi
+        grain: "total", "daily", "campaign" veya "ad"
     
     Returns:
         DataFrame: Kampanya verileri (source, content, spend, clicks, conversions, impressions)
     """
+    if grain not in GRAIN_QUERIES:
+        raise ValueError(f"Geçersiz grain: {grain} (desteklenen: {', '.join(GRAIN_QUERIES)})")
+    
     try:
-        client = get_client()
-        ga_service = client.get_service("GoogleAdsService")
+        if grain in CHUNKED_GRAINS:
+            chunks = _date_chunks(start_date, end_date, FETCH_CHUNK_DAYS)
+        else:
+            chunks = [(start_date, end_date)]
         
-        # GAQL sorgusu - Reklam bazlı veriler (final_urls dahil)
-        query = f"""
-            SELECT
-                segments.date,
-                campaign.name,
-                campaign.id,
-                ad_group.name,
-                ad_group_ad.ad.final_urls,
-                metrics.cost_micros,
-                metrics.impressions,
-                metrics.clicks,
-                metrics.conversions
-            FROM ad_group_ad
-            WHERE segments.date BETWEEN '{start_date}' AND '{end_date}'
-              AND campaign.status != 'REMOVED'
-              AND ad_group.status != 'REMOVED'
-              AND ad_group_ad.status != 'REMOVED'
-            ORDER BY segments.date ASC
-        """
+        if len(chunks) == 1:
+            buffers = [_fetch_chunk(*chunks[0], grain)]
+        else:
+            workers = min(FETCH_MAX_WORKERS, len(chunks))
+            # Çağıran işin süre sınırı parça worker'larında da geçerli olmalı
+            fetch_deadline = rate_limit.current_deadline()
+            
+            def fetch_chunk(chunk):
+                with rate_limit.deadline(fetch_deadline):
+                    return _fetch_chunk(*chunk, grain)
+            
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="gads-chunk") as pool:
+                # map parça sırasını korur; herhangi bir parçanın hatası burada yükselir
+                buffers = list(pool.map(fetch_chunk, chunks))
         
-        response = ga_service.search_stream(customer_id=CUSTOMER_ID, query=query)
+        buffer = buffers[0]
+        for chunk_buffer in buffers[1:]:
+            buffer.extend(chunk_buffer)
         
-        data = []
-        for batch in response:
-            for row in batch.results:
-                campaign_name = row.campaign.name
-                ad_group_name = row.ad_group.name if row.ad_group else ""
-                
-                # Final URL'lerden utm_content çıkar
-                final_urls = list(row.ad_group_ad.ad.final_urls) if row.ad_group_ad.ad.final_urls else []
-                utm_content = extract_utm_content_from_url(final_urls[0] if final_urls else "")
-                
-                # URL'den bulunamadıysa kampanya adını kullan
-                if not utm_content:
-                    utm_content = campaign_name
-                
-                data.append({
-                    "date": row.segments.date,
-                    "source": "google",
-                    "campaign_id": row.campaign.id,
-                    "campaign_name": campaign_name,
-                    "ad_group_name": ad_group_name,
-                    "final_url": final_urls[0] if final_urls else "",
-                    "utm_content": utm_content,
-                    "spend": row.metrics.cost_micros / 1_000_000,
-                    "impressions": row.metrics.impressions,
-                    "clicks": row.metrics.clicks,
-                    "conversions": row.metrics.conversions
-                })
+        if not len(buffer):
+            print("⚠️ Google Ads'den veri alınamadı")
+            return pd.DataFrame(columns=GRAIN_COLUMNS[grain])
         
-        df = pd.DataFrame(data)
+        df = buffer.to_frame()
         
-        if df.empty:
-            print("⚠️ Google Ads'den veri alınamadı")
-            return pd.DataFrame(columns=[
-                "date", "source", "campaign_id", "campaign_name", 
-                "utm_content", "spend", "impressions", "clicks", "conversions"
-            ])
+        if grain == "total":
+            df = df.sum().to_frame().T.astype(df.dtypes.to_dict())
+        elif grain == "daily":
+            df = df.groupby("date", as_index=False, sort=True).sum()
+        elif grain == "campaign":
+            df["source"] = "google"
+            df["utm_content"] = df["campaign_name"].map(extract_utm_content)
+            df = df[GRAIN_COLUMNS["campaign"]]
+        elif grain == "ad":
+            df = _join_catalog(df)
         
-        print(f"✅ Google Ads: {len(df)} satır veri alındı")
+        print(f"✅ Google Ads: {len(df)} satır veri alındı ({grain}, {len(chunks)} parça)")
         return df
         
     except GoogleAdsException as ex:
@@ -117,6 +623,11 @@ def fetch_campaign_data(start_date: date, end_date: date) -> pd.DataFrame:
         return pd.DataFrame()
 
 
+def fetch(start_date: date, end_date: date, grain: str = "ad") -> pd.DataFrame:
+    """Connector sözleşmesi: fetch_campaign_data ile aynı"""
+    return fetch_campaign_data(start_date, end_date, grain=grain)
+
+
 def extract_utm_content_from_url(url: str) -> str:
     """
     URL'den utm_content parametresini çıkarır
@@ -161,61 +672,15 @@ def extract_utm_content(campaign_name: str) -> str:
 
 
 def get_spend_summary(start_date: date, end_date: date) -> dict:
-    """
-    Belirli tarih aralığı için harcama özeti döner
-    
-    Returns:
-        dict: {total_spend, total_clicks, total_impressions, total_conversions}
-    """
-    df = fetch_campaign_data(start_date, end_date)
-    
-    if df.empty:
-        return {
-            "total_spend": 0,
-            "total_clicks": 0,
-            "total_impressions": 0,
-            "total_conversions": 0
-        }
-    
-    return {
-        "total_spend": df["spend"].sum(),
-        "total_clicks": df["clicks"].sum(),
-        "total_impressions": df["impressions"].sum(),
-        "total_conversions": df["conversions"].sum()
-    }
+    """Belirli tarih aralığı için harcama özeti döner (bkz. registry.get_spend_summary)"""
+    return registry.get_spend_summary(PLATFORM, start_date, end_date)
 
 
 def get_daily_spend(start_date: date, end_date: date) -> pd.DataFrame:
-    """Günlük harcama verisi döner"""
-    df = fetch_campaign_data(start_date, end_date)
-    
-    if df.empty:
-        return pd.DataFrame(columns=["date", "spend", "clicks", "impressions", "conversions"])
-    
-    daily = df.groupby("date").agg({
-        "spend": "sum",
-        "clicks": "sum",
-        "impressions": "sum",
-        "conversions": "sum"
-    }).reset_index()
-    
-    return daily
+    """Günlük harcama verisi döner (bkz. registry.get_daily_spend)"""
+    return registry.get_daily_spend(PLATFORM, start_date, end_date)
 
 
 def get_campaign_spend(start_date: date, end_date: date) -> pd.DataFrame:
-    """Kampanya bazlı harcama verisi döner"""
-    df = fetch_campaign_data(start_date, end_date)
-    
-    if df.empty:
-        return pd.DataFrame(columns=[
-            "campaign_name", "utm_content", "spend", "clicks", "impressions", "conversions"
-        ])
-    
-    campaign = df.groupby(["campaign_name", "utm_content"]).agg({
-        "spend": "sum",
-        "clicks": "sum",
-        "impressions": "sum",
-        "conversions": "sum"
-    }).reset_index()
-    
-    return campaign.sort_values("spend", ascending=False)
+    """Kampanya bazlı harcama verisi döner (bkz. registry.get_campaign_spend)"""
+    return registry.get_campaign_spend(PLATFORM, start_date, end_date)
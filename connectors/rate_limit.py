@@ -0,0 +1,245 @@
+"""
+Rate Limit
+==========
+Reklam platformu API çağrıları için kota farkındalıklı hız sınırlayıcı
+
+Her (platform, hesap) için process genelinde tek bir token bucket vardır;
+tüm Streamlit oturumlarının çağrıları aynı kovadan geçer. Platformun
+bildirdiği kota kullanımı (ör. Facebook x-business-use-case-usage)
+arttıkça kova yavaşlatılır, kısıtlama hatasında kova jitter'lı bekleme
+süresince durdurulur ve çağrı yeniden denenir.
+
+Bekleme hiçbir zaman çekim işinin süre sınırını aşmaz: deadline() ile
+thread'e verilen (veya acquire/call_with_backoff'a geçilen) sınırdan sonra
+bitecek bir beklemeye girilmez, DeadlineExceeded fırlatılır.
+"""
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+from config.database import (
+    PLATFORM_RATE_LIMITS,
+    RATE_LIMIT_MAX_RETRIES,
+    RATE_LIMIT_BACKOFF_BASE_SECONDS,
+    RATE_LIMIT_BACKOFF_MAX_SECONDS,
+    RATE_LIMIT_SLOWDOWN_PCT,
+    RATE_LIMIT_PAUSE_PCT
+)
+
+
+# PLATFORM_RATE_LIMITS'te olmayan platformlar için
+DEFAULT_RATE_LIMIT = {"rate": 2.0, "burst": 4}
+
+# Kota kullanımı yüksekken hızın düşebileceği en alt oran
+MIN_RATE_FACTOR = 0.1
+
+
+class DeadlineExceeded(TimeoutError):
+    """Bekleme, çekim işinin süre sınırını aşacağı için yapılmadı"""
+
+
+_context = threading.local()
+
+
+@contextmanager
+def deadline(at: float = None):
+    """
+    Bu thread'deki API çağrıları için süre sınırı koyar
+
+    İç içe kullanımda daha erken olan sınır geçerlidir; at=None sınırı
+    değiştirmez. Worker thread'lere sınır otomatik geçmez, orada yeniden
+    deadline(current_deadline()) ile girilmelidir.
+
+    Args:
+        at: time.monotonic() cinsinden son an
+    """
+    previous = getattr(_context, "deadline", None)
+    if at is not None and (previous is None or at < previous):
+        _context.deadline = at
+    try:
+        yield
+    finally:
+        _context.deadline = previous
+
+
+def current_deadline() -> float:
+    """Bu thread'in süre sınırı (time.monotonic) veya None"""
+    return getattr(_context, "deadline", None)
+
+
+def _check_deadline(wait: float, until: float = None):
+    """wait saniyelik bekleme süre sınırını aşacaksa DeadlineExceeded fırlatır"""
+    if until is None:
+        until = current_deadline()
+    if until is not None and time.monotonic() + wait > until:
+        raise DeadlineExceeded(f"API çağrısı süre sınırı içinde yapılamıyor ({wait:.1f} sn bekleme gerekli)")
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket
+
+    rate * factor hızında dolar; factor kota kullanımına göre ayarlanır.
+    pause() ile kova belirli bir süre tamamen durdurulabilir.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.factor = 1.0
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.usage_pct = 0.0
+        self.stats = {"acquired": 0, "waited_seconds": 0.0, "throttled": 0, "retries": 0}
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate * self.factor)
+        self.updated = now
+
+    def acquire(self, deadline: float = None) -> float:
+        """
+        Bir istek hakkı alır, gerekirse bekler; beklenen süreyi döner
+
+        Bekleme deadline'ı (None ise thread'in süre sınırını) aşacaksa
+        uyumadan DeadlineExceeded fırlatır.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self.blocked_until:
+                    wait = self.blocked_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    self.stats["acquired"] += 1
+                    self.stats["waited_seconds"] += waited
+                    return waited
+                else:
+                    wait = (1 - self.tokens) / (self.rate * self.factor)
+            _check_deadline(wait, deadline)
+            time.sleep(wait)
+            waited += wait
+
+    def pause(self, seconds: float):
+        """Kovayı en az seconds süresince durdurur (tüm bekleyen çağrılar etkilenir)"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens = 0.0
+            self.blocked_until = max(self.blocked_until, now + seconds)
+
+    def observe_usage(self, usage_pct: float, regain_seconds: float = 0.0):
+        """
+        Platformun bildirdiği kota kullanımına göre hızı ayarlar
+
+        RATE_LIMIT_SLOWDOWN_PCT altında tam hız, üstünde doğrusal olarak
+        yavaşlar; RATE_LIMIT_PAUSE_PCT'de kota yenilenene kadar (en fazla
+        RATE_LIMIT_BACKOFF_MAX_SECONDS) durur.
+        """
+        if usage_pct >= RATE_LIMIT_PAUSE_PCT:
+            self.pause(min(regain_seconds or RATE_LIMIT_BACKOFF_MAX_SECONDS, RATE_LIMIT_BACKOFF_MAX_SECONDS))
+
+        if usage_pct <= RATE_LIMIT_SLOWDOWN_PCT:
+            factor = 1.0
+        else:
+            factor = max(MIN_RATE_FACTOR, (100 - usage_pct) / (100 - RATE_LIMIT_SLOWDOWN_PCT))
+
+        with self._lock:
+            self._refill(time.monotonic())
+            self.factor = factor
+            self.usage_pct = usage_pct
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(platform: str, account: str = "") -> TokenBucket:
+    """(platform, hesap) için paylaşılan token bucket döner"""
+    key = (platform, str(account))
+    limiter = _limiters.get(key)
+    if limiter is not None:
+        return limiter
+
+    with _limiters_lock:
+        if key not in _limiters:
+            limits = PLATFORM_RATE_LIMITS.get(platform, DEFAULT_RATE_LIMIT)
+            _limiters[key] = TokenBucket(limits["rate"], limits["burst"])
+        return _limiters[key]
+
+
+def backoff_delay(attempt: int, retry_after: float = None) -> float:
+    """
+    attempt. yeniden deneme için bekleme süresi
+
+    Platform bir bekleme süresi bildirdiyse ona küçük bir jitter eklenir,
+    bildirmediyse üstel "full jitter" uygulanır.
+    """
+    if retry_after:
+        return min(retry_after, RATE_LIMIT_BACKOFF_MAX_SECONDS) + random.uniform(0, RATE_LIMIT_BACKOFF_BASE_SECONDS)
+    cap = min(RATE_LIMIT_BACKOFF_MAX_SECONDS, RATE_LIMIT_BACKOFF_BASE_SECONDS * 2 ** attempt)
+    return random.uniform(RATE_LIMIT_BACKOFF_BASE_SECONDS / 2, cap)
+
+
+def call_with_backoff(limiter: TokenBucket, func, is_throttled, retry_after=None, on_error=None, deadline: float = None):
+    """
+    func'ı hız sınırı altında çalıştırır, kısıtlama hatasında yeniden dener
+
+    Args:
+        limiter: get_limiter() ile alınan kova
+        func: Argümansız API çağrısı
+        is_throttled: is_throttled(exception) -> bool
+        retry_after: retry_after(exception) -> saniye veya None (platformun bildirdiği bekleme)
+        on_error: on_error(exception) - hatadaki kota bilgisini okumak için (ör. yanıt header'ları)
+        deadline: time.monotonic() cinsinden son an; None ise thread'in süre sınırı
+
+    Returns:
+        func() sonucu
+
+    Raises:
+        DeadlineExceeded: Kova beklemesi veya yeniden deneme süre sınırını aşacaksa
+    """
+    if deadline is None:
+        deadline = current_deadline()
+    attempt = 0
+    while True:
+        limiter.acquire(deadline)
+        try:
+            return func()
+        except Exception as e:
+            if on_error is not None:
+                on_error(e)
+            if not is_throttled(e) or attempt >= RATE_LIMIT_MAX_RETRIES:
+                raise
+
+            delay = backoff_delay(attempt, retry_after(e) if retry_after else None)
+            limiter.stats["throttled"] += 1
+            # Kova durdurulur; aynı hesaba giden diğer çağrılar da bekler
+            limiter.pause(delay)
+            if deadline is not None and time.monotonic() + delay > deadline:
+                raise DeadlineExceeded("API kotası süre sınırı içinde yenilenmiyor") from e
+            limiter.stats["retries"] += 1
+            print(f"⏳ API kotası doldu, {delay:.1f} sn sonra yeniden denenecek ({attempt + 1}/{RATE_LIMIT_MAX_RETRIES})")
+            attempt += 1
+
+
+def get_limiter_stats() -> dict:
+    """
+    Tüm kovaların durumunu döner
+
+    Returns:
+        dict: {"facebook:act_123": {rate, factor, usage_pct, acquired, waited_seconds, throttled, retries}, ...}
+    """
+    stats = {}
+    for (platform, account), limiter in list(_limiters.items()):
+        stats[f"{platform}:{account}"] = {
+            "rate": limiter.rate,
+            "factor": round(limiter.factor, 2),
+            "usage_pct": limiter.usage_pct,
+            **{key: round(value, 2) for key, value in limiter.stats.items()}
+        }
+    return stats
@@ -0,0 +1,195 @@
+"""
+Connector Registry
+==================
+Reklam platformu connector'larının ortak sözleşmesi ve kaydı
+
+Her connector modülü şunları sunar:
+    PLATFORM      - utm_source ile aynı platform adı ("google", "facebook", ...)
+    CAPABILITIES  - connector yetenekleri (aşağıya bakın)
+    fetch(start_date, end_date, grain="ad") -> DataFrame
+
+Servisler platformlar üzerinde bu kayıt ile dolaşır; önbellek, eşzamanlılık,
+yeniden deneme ve ölçüm her platform için tek yerde uygulanır.
+"""
+
+from datetime import date
+from typing import Protocol
+import pandas as pd
+
+
+# Desteklenen veri tanelikleri, en geniş olandan en ayrıntılıya
+GRAINS = ("total", "daily", "campaign", "ad")
+
+# Varsayılan yetenekler
+DEFAULT_CAPABILITIES = {
+    # Sunucu tarafında toplanabilen grain'ler; diğerleri "ad" verisinden türetilir
+    "server_side_grains": ("ad",),
+    # Uzun aralıklar için asenkron rapor desteği
+    "async_reports": False,
+    # Tek istekte çekilebilecek en uzun aralık (gün); None = sınırsız
+    "max_range_days": None,
+}
+
+METRIC_COLUMNS = ["spend", "impressions", "clicks", "conversions"]
+
+# Grain -> gruplama sütunları
+GRAIN_KEYS = {
+    "total": [],
+    "daily": ["date"],
+    "campaign": ["date", "source", "campaign_id", "campaign_name", "utm_content"],
+}
+
+
+class AdConnector(Protocol):
+    """Reklam platformu connector sözleşmesi (connector modülleri bu şekle uyar)"""
+
+    PLATFORM: str
+    CAPABILITIES: dict
+
+    def fetch(self, start_date: date, end_date: date, grain: str = "ad") -> pd.DataFrame:
+        ...
+
+
+_registry = {}
+_builtins_loaded = False
+
+
+def register_connector(connector):
+    """Connector'ı PLATFORM adıyla kaydeder"""
+    _registry[connector.PLATFORM] = connector
+    return connector
+
+
+def _load_builtin_connectors():
+    """Yerleşik connector'ları ilk kullanımda kaydeder"""
+    global _builtins_loaded
+    if _builtins_loaded:
+        return
+
+    from connectors import google_ads, facebook_ads, apple_ads
+    for connector in (google_ads, facebook_ads, apple_ads):
+        _registry.setdefault(connector.PLATFORM, connector)
+    _builtins_loaded = True
+
+
+def get_connector(platform: str):
+    """Platform adına göre connector döner"""
+    _load_builtin_connectors()
+    if platform not in _registry:
+        raise KeyError(f"Kayıtlı connector yok: {platform}")
+    return _registry[platform]
+
+
+def get_connectors(platforms: list = None) -> list:
+    """
+    Kayıtlı connector'ları döner
+
+    Args:
+        platforms: Platform listesi (varsayılan: tüm kayıtlı connector'lar)
+    """
+    _load_builtin_connectors()
+    if platforms is None:
+        return list(_registry.values())
+    return [_registry[platform] for platform in platforms if platform in _registry]
+
+
+def get_capabilities(connector) -> dict:
+    """Connector yeteneklerini varsayılanlarla birleştirerek döner"""
+    return {**DEFAULT_CAPABILITIES, **getattr(connector, "CAPABILITIES", {})}
+
+
+def is_failed_result(df: pd.DataFrame) -> bool:
+    """Connector'lar hata durumunda sütunsuz DataFrame döner"""
+    return len(df.columns) == 0
+
+
+def aggregate_to_grain(df: pd.DataFrame, grain: str) -> pd.DataFrame:
+    """Reklam (ad) seviyesindeki veriyi istenen grain'e toplar; başarısız sonuç olduğu gibi döner"""
+    if grain == "ad" or is_failed_result(df):
+        return df
+
+    keys = GRAIN_KEYS[grain]
+    if df.empty:
+        return pd.DataFrame(columns=keys + METRIC_COLUMNS)
+    if not keys:
+        return df[METRIC_COLUMNS].sum().to_frame().T
+
+    return df.groupby(keys, as_index=False)[METRIC_COLUMNS].sum()
+
+
+def fetch_grain(platform: str, start_date: date, end_date: date, grain: str) -> pd.DataFrame:
+    """
+    Platformdan grain verisini en dar yoldan çeker
+
+    Connector grain'i sunucu tarafında toplayabiliyorsa doğrudan ister,
+    aksi halde reklam verisini çekip pandas ile toplar.
+    """
+    connector = get_connector(platform)
+    if grain in get_capabilities(connector)["server_side_grains"]:
+        return connector.fetch(start_date, end_date, grain=grain)
+    return aggregate_to_grain(connector.fetch(start_date, end_date, grain="ad"), grain)
+
+
+# ============================================================
+# Tüm connector'lar için ortak özet fonksiyonları
+# ============================================================
+
+def get_spend_summary(platform: str, start_date: date, end_date: date) -> dict:
+    """
+    Belirli tarih aralığı için harcama özeti döner
+
+    Returns:
+        dict: {total_spend, total_clicks, total_impressions, total_conversions}
+    """
+    df = fetch_grain(platform, start_date, end_date, "total")
+
+    if df.empty:
+        return {
+            "total_spend": 0,
+            "total_clicks": 0,
+            "total_impressions": 0,
+            "total_conversions": 0
+        }
+
+    return {
+        "total_spend": df["spend"].sum(),
+        "total_clicks": df["clicks"].sum(),
+        "total_impressions": df["impressions"].sum(),
+        "total_conversions": df["conversions"].sum()
+    }
+
+
+def get_daily_spend(platform: str, start_date: date, end_date: date) -> pd.DataFrame:
+    """Günlük harcama verisi döner"""
+    df = fetch_grain(platform, start_date, end_date, "daily")
+
+    if df.empty:
+        return pd.DataFrame(columns=["date", "spend", "clicks", "impressions", "conversions"])
+
+    daily = df.groupby("date").agg({
+        "spend": "sum",
+        "clicks": "sum",
+        "impressions": "sum",
+        "conversions": "sum"
+    }).reset_index()
+
+    return daily
+
+
+def get_campaign_spend(platform: str, start_date: date, end_date: date) -> pd.DataFrame:
+    """Kampanya bazlı harcama verisi döner (utm_content reklam seviyesinden gelir)"""
+    df = get_connector(platform).fetch(start_date, end_date, grain="ad")
+
+    if df.empty:
+        return pd.DataFrame(columns=[
+            "campaign_name", "utm_content", "spend", "clicks", "impressions", "conversions"
+        ])
+
+    campaign = df.groupby(["campaign_name", "utm_content"]).agg({
+        "spend": "sum",
+        "clicks": "sum",
+        "impressions": "sum",
+        "conversions": "sum"
+    }).reset_index()
+
+    return campaign.sort_values("spend", ascending=False)
@@ -7,13 +7,18 @@ Reklam harcamaları vs Lead/Ciro dashboard'u
 import streamlit as st
 import sys
 import os
+import time
 
 # Proje kök dizinini path'e ekle
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from datetime import date, timedelta
 from dashboard.components.filters import render_all_filters
-from dashboard.components.kpi_cards import render_kpi_cards, render_source_kpi_cards
+from dashboard.components.kpi_cards import (
+    render_kpi_cards,
+    render_source_kpi_cards,
+    render_platform_status
+)
 from dashboard.components.charts import (
     render_spend_vs_revenue_chart,
     render_platform_pie_chart,
@@ -21,14 +26,15 @@ from dashboard.components.charts import (
     render_content_performance_table,
     render_roas_comparison_chart
 )
-from services.metrics_service import (
-    calculate_overall_metrics,
-    calculate_metrics_by_source,
-    calculate_metrics_by_content
+from config.cache import SERVING_MODE
+from services.dashboard_data import (
+    get_dashboard_data,
+    get_dashboard_data_swr,
+    refresh_dashboard_data,
+    snapshot_age_seconds,
+    is_complete
 )
-from services.ad_spend_service import get_daily_spend
-from services.lead_service import get_lead_daily_trend
-from services.revenue_service import get_revenue_daily_trend
+from services.fetch_context import fetch_context
 
 
 # Sayfa konfigürasyonu
@@ -71,6 +77,52 @@ st.markdown("""
 def main():
     """Ana dashboard fonksiyonu"""
     
+    # Tüm render aynı fetch context'i paylaşır: her platform bir kez çekilir
+    with fetch_context():
+        render_dashboard()
+
+
+def format_age(seconds: float) -> str:
+    """Snapshot yaşını okunur metne çevirir"""
+    minutes = int(seconds // 60)
+    if minutes < 1:
+        return "az önce"
+    if minutes < 60:
+        return f"{minutes} dk önce"
+    return f"{minutes // 60} sa {minutes % 60} dk önce"
+
+
+def wait_for_refresh(refresh, data: dict, status_placeholder):
+    """
+    Arka plan yenilemesini bekler, yeni veri geldiyse sayfayı yeniden çalıştırır
+
+    Sayfa eski snapshot ile zaten çizilmiştir. Bekleme kısa aralıklarla
+    yapılır; kullanıcı bu sırada filtre değiştirirse Streamlit script'i
+    bir sonraki st çağrısında keser.
+    """
+    while not refresh.done():
+        status_placeholder.caption(
+            f"🕒 Veriler {format_age(snapshot_age_seconds(data))} güncellendi · 🔄 arka planda yenileniyor..."
+        )
+        time.sleep(0.5)
+    
+    try:
+        fresh = refresh.result()
+    except Exception as e:
+        print(f"❌ Arka plan yenileme hatası: {e}")
+        fresh = None
+    
+    if fresh is not None and is_complete(fresh) and fresh["fetched_at"] > data["fetched_at"]:
+        st.rerun()
+    
+    status_placeholder.caption(
+        f"🕒 Veriler {format_age(snapshot_age_seconds(data))} güncellendi · ⚠️ yenileme tamamlanamadı"
+    )
+
+
+def render_dashboard():
+    """Dashboard sayfasını render eder"""
+    
     # Header
     st.markdown('<p class="main-header">📊 Marketing Performance Dashboard</p>', unsafe_allow_html=True)
     st.markdown('<p class="sub-header">Reklam Harcamaları vs Lead ve Ciro Analizi</p>', unsafe_allow_html=True)
@@ -83,20 +135,35 @@ def main():
     
     # Tarih bilgisi
     st.caption(f"📅 Veri aralığı: {start_date} - {end_date}")
+    status_placeholder = st.empty()
     
     st.divider()
     
     # Veri yükleme durumu
+    refresh = None
     with st.spinner("📊 Veriler yükleniyor..."):
         try:
-            # Metrikleri hesapla
-            overall_metrics = calculate_overall_metrics(start_date, end_date)
-            metrics_by_source = calculate_metrics_by_source(start_date, end_date)
-            content_metrics = calculate_metrics_by_content(start_date, end_date)
+            # Standart aralıklar prefetch worker'ın snapshot'ından okunur;
+            # "Verileri Yenile" snapshot'ı atlayıp kaynaklardan yeniden hesaplar.
+            # SWR modunda eski snapshot hemen çizilir, yenileme arka planda çalışır
+            if filters["refresh"]:
+                data = refresh_dashboard_data(start_date, end_date, platforms)
+            elif SERVING_MODE == "swr":
+                data, refresh = get_dashboard_data_swr(start_date, end_date, platforms)
+            else:
+                data = get_dashboard_data(start_date, end_date, platforms)
+            
+            overall_metrics = data["overall_metrics"]
+            content_metrics = data["content_metrics"]
             
             # Sadece seçili platformları filtrele
             filtered_by_source = {
-                k: v for k, v in metrics_by_source.items() 
+                k: v for k, v in data["metrics_by_source"].items() 
+                if k in platforms
+            }
+            
+            platform_status = {
+                k: v for k, v in data["platform_status"].items()
                 if k in platforms
             }
             
@@ -105,6 +172,9 @@ def main():
             st.info("⚠️ Lütfen veritabanı ve API bağlantılarını kontrol edin")
             st.stop()
     
+    # Eksik platform verisi uyarıları
+    render_platform_status(platform_status)
+    
     # =====================
     # ANA KPI KARTLARI
     # =====================
@@ -158,16 +228,13 @@ def main():
     tab1, tab2, tab3 = st.tabs(["💰 Harcama Trendi", "👥 Lead Trendi", "💵 Ciro Trendi"])
     
     with tab1:
-        daily_spend = get_daily_spend(start_date, end_date)
-        render_daily_trend_chart(daily_spend, "spend")
+        render_daily_trend_chart(data["daily_spend"], "spend")
     
     with tab2:
-        daily_leads = get_lead_daily_trend(start_date, end_date, platforms)
-        render_daily_trend_chart(daily_leads, "LeadCount")
+        render_daily_trend_chart(data["daily_leads"], "LeadCount")
     
     with tab3:
-        daily_revenue = get_revenue_daily_trend(start_date, end_date, platforms)
-        render_daily_trend_chart(daily_revenue, "TotalRevenue")
+        render_daily_trend_chart(data["daily_revenue"], "TotalRevenue")
     
     st.divider()
     
@@ -179,6 +246,12 @@ def main():
     # Footer
     st.divider()
     st.caption("📊 Marketing Dashboard v1.0 | Veriler: Google Ads, Facebook Ads")
+    
+    # Verinin yaşı; eski snapshot gösterildiyse yenilemesi beklenir
+    if refresh is not None:
+        wait_for_refresh(refresh, data, status_placeholder)
+    else:
+        status_placeholder.caption(f"🕒 Veriler {format_age(snapshot_age_seconds(data))} güncellendi")
 
 
 if __name__ == "__main__":
@@ -7,6 +7,8 @@ Tarih ve platform filtre bileşenleri
 import streamlit as st
 from datetime import date, timedelta
 from config.database import DEFAULT_DATE_RANGE_DAYS, SUPPORTED_PLATFORMS, UTM_SOURCE_MAPPING
+from services.date_ranges import QUICK_RANGES, quick_range
+from services.cache_control import invalidate_all
 
 
 def render_date_filter():
@@ -18,28 +20,18 @@ def render_date_filter():
     """
     st.sidebar.subheader("📅 Tarih Aralığı")
     
-    # Hızlı seçim butonları
+    # Hızlı seçim butonları (aralıklar services.date_ranges ile prefetch worker'la ortak)
     quick_select = st.sidebar.radio(
         "Hızlı Seçim",
-        ["Son 7 gün", "Son 30 gün", "Son 90 gün", "Bu Ay", "Özel"],
+        list(QUICK_RANGES) + ["Özel"],
         index=0,  # Varsayılan: Son 7 gün
         horizontal=True
     )
     
     today = date.today()
     
-    if quick_select == "Son 7 gün":
-        start_date = today - timedelta(days=7)
-        end_date = today
-    elif quick_select == "Son 30 gün":
-        start_date = today - timedelta(days=30)
-        end_date = today
-    elif quick_select == "Son 90 gün":
-        start_date = today - timedelta(days=90)
-        end_date = today
-    elif quick_select == "Bu Ay":
-        start_date = today.replace(day=1)
-        end_date = today
+    if quick_select in QUICK_RANGES:
+        start_date, end_date = quick_range(quick_select, today)
     else:  # Özel
         col1, col2 = st.sidebar.columns(2)
         with col1:
@@ -96,7 +88,7 @@ def render_all_filters():
     Tüm filtreleri render eder
     
     Returns:
-        dict: {start_date, end_date, platforms}
+        dict: {start_date, end_date, platforms, refresh}
     """
     st.sidebar.header("🔍 Filtreler")
     
@@ -106,13 +98,15 @@ def render_all_filters():
     
     st.sidebar.divider()
     
-    # Yenile butonu
+    # Yenile butonu: process içi önbellekler temizlenir, bir sonraki render snapshot'ı atlar
     if st.sidebar.button("🔄 Verileri Yenile", use_container_width=True):
-        st.cache_data.clear()
+        invalidate_all()
+        st.session_state["refresh_requested"] = True
         st.rerun()
     
     return {
         "start_date": start_date,
         "end_date": end_date,
-        "platforms": platforms
+        "platforms": platforms,
+        "refresh": st.session_state.pop("refresh_requested", False)
     }
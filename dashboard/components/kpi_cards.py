@@ -118,3 +118,25 @@ def render_comparison_cards(current: dict, previous: dict = None):
         col1.metric("Harcama Değişimi", f"{spend_delta:+.1f}%")
         col2.metric("Lead Değişimi", f"{leads_delta:+.1f}%")
         col3.metric("Ciro Değişimi", f"{revenue_delta:+.1f}%")
+
+
+def render_platform_status(platform_status: dict):
+    """
+    Zamanında yanıt vermeyen veya hata veren platformlar için uyarı gösterir
+    
+    Args:
+        platform_status: {"google": {"status", "seconds", "error"}, ...}
+    """
+    platform_names = {
+        "google": "Google Ads",
+        "facebook": "Facebook Ads",
+        "apple": "Apple Ads"
+    }
+    
+    for source, info in platform_status.items():
+        name = platform_names.get(source, source)
+        
+        if info["status"] == "timeout":
+            st.warning(f"⏱️ {name} zamanında yanıt vermedi, harcama verileri eksik gösteriliyor")
+        elif info["status"] == "error":
+            st.warning(f"⚠️ {name} verisi alınamadı: {info['error']}")
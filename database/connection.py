@@ -3,17 +3,46 @@ Database Connection Manager
 ===========================
 MSSQL Server bağlantı yönetimi
 Streamlit Cloud için pymssql, lokal için pyodbc destekler
+
+Bağlantılar process genelinde paylaşılan sınırlı bir havuzdan
+(ConnectionPool) ödünç alınır; her oturum kendi bağlantısını kullanır.
+
+Sorgular ? yer tutuculu yazılır. pyodbc bunları doğrudan sunucuya
+parametre olarak gönderir; pymssql ise parametreleri metne gömdüğü için
+sorgu sp_executesql ile sarılır. Her iki durumda sunucu aynı sorgu metnini
+görür ve derlenmiş planı yeniden kullanır.
 """
 
+import re
+import threading
+import time
+import numpy as np
+import pandas as pd
 import streamlit as st
+from collections import deque
 from contextlib import contextmanager
+from datetime import date, datetime
+from decimal import Decimal
+from config.database import (
+    DB_POOL_SIZE,
+    DB_POOL_MAX_IDLE_SECONDS,
+    DB_POOL_MAX_LIFETIME_SECONDS,
+    DB_POOL_CHECKOUT_TIMEOUT_SECONDS,
+    QUERY_FETCH_BATCH_SIZE,
+    QUERY_CHUNK_ROWS
+)
+from config.cache import USE_QUERY_CACHE
+from database.query_cache import cached_query
+
+try:
+    import pyarrow as pa
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
 
 
 class DatabaseConnection:
-    """MSSQL veritabanı bağlantı yöneticisi"""
-    
-    _connection = None
-    _driver = None  # 'pymssql' veya 'pyodbc'
+    """MSSQL veritabanı bağlantı fabrikası (bağlantılar ConnectionPool üzerinden dağıtılır)"""
     
     @classmethod
     def _get_config(cls):
@@ -36,37 +65,27 @@ class DatabaseConnection:
         }
     
     @classmethod
-    def get_connection(cls):
-        """Veritabanı bağlantısı döner (singleton pattern)"""
-        if cls._connection is not None:
-            try:
-                # Bağlantının hala açık olup olmadığını kontrol et
-                if cls._driver == 'pymssql':
-                    cursor = cls._connection.cursor()
-                    cursor.execute("SELECT 1")
-                    cursor.close()
-                else:
-                    if not cls._connection.closed:
-                        return cls._connection
-                return cls._connection
-            except:
-                cls._connection = None
+    def connect(cls):
+        """
+        Yeni veritabanı bağlantısı açar
         
+        Returns:
+            tuple: (connection, driver) - driver 'pymssql' veya 'pyodbc'
+        """
         config = cls._get_config()
         
         # Önce pymssql dene (Streamlit Cloud için ideal)
         try:
             import pymssql
-            cls._connection = pymssql.connect(
+            connection = pymssql.connect(
                 server=config['server'],
                 user=config['username'],
                 password=config['password'],
                 database=config['database'],
                 charset='utf8'
             )
-            cls._driver = 'pymssql'
             print("✅ Veritabanı bağlantısı başarılı (pymssql)")
-            return cls._connection
+            return connection, 'pymssql'
         except Exception as e1:
             print(f"⚠️ pymssql bağlantısı başarısız: {e1}")
         
@@ -81,63 +100,544 @@ class DatabaseConnection:
                 f"PWD={config['password']};"
                 f"TrustServerCertificate=yes;"
             )
-            cls._connection = pyodbc.connect(connection_string)
-            cls._driver = 'pyodbc'
+            connection = pyodbc.connect(connection_string)
             print("✅ Veritabanı bağlantısı başarılı (pyodbc)")
-            return cls._connection
+            return connection, 'pyodbc'
         except Exception as e2:
             print(f"❌ pyodbc bağlantısı da başarısız: {e2}")
             raise Exception(f"Veritabanı bağlantısı kurulamadı. pymssql hatası: {e1}, pyodbc hatası: {e2}")
     
     @classmethod
     def close(cls):
-        """Bağlantıyı kapatır"""
-        if cls._connection is not None:
-            cls._connection.close()
-            cls._connection = None
-            cls._driver = None
-            print("Veritabanı bağlantısı kapatıldı")
+        """Havuzdaki tüm bağlantıları kapatır"""
+        close_pool()
+
+
+class PooledConnection:
+    """Havuzdaki tek bir bağlantı ve yaşam döngüsü bilgisi"""
+    
+    def __init__(self, connection, driver: str):
+        self.connection = connection
+        self.driver = driver
+        self.created_at = time.monotonic()
+        self.last_used_at = self.created_at
+        # True ise iade sırasında kapatılır (ör. sonucu yarıda bırakılmış akış)
+        self.discard = False
+    
+    def close(self):
+        try:
+            self.connection.close()
+        except Exception:
+            pass
+
+
+class ConnectionPool:
+    """
+    Sınırlı boyutlu, thread-safe bağlantı havuzu
+    
+    Her checkout bağlantıyı iade edilene kadar tek başına kullanır. Bağlantı
+    yalnızca max_idle_seconds'tan uzun boşta kaldıysa SELECT 1 ile doğrulanır,
+    max_lifetime_seconds'tan eskiyse kapatılıp yenisi açılır. Havuz doluyken
+    çağıran checkout_timeout süresince boşalan bağlantıyı bekler.
+    """
+    
+    def __init__(self, connect, max_size: int, max_idle_seconds: float,
+                 max_lifetime_seconds: float, checkout_timeout: float):
+        """
+        Args:
+            connect: Argümansız fonksiyon, (connection, driver) döner
+        """
+        self._connect = connect
+        self.max_size = max_size
+        self.max_idle_seconds = max_idle_seconds
+        self.max_lifetime_seconds = max_lifetime_seconds
+        self.checkout_timeout = checkout_timeout
+        
+        self._idle = deque()
+        self._size = 0
+        self._cond = threading.Condition()
+        self._stats = {
+            "checkouts": 0,
+            "waits": 0,
+            "wait_seconds": 0.0,
+            "created": 0,
+            "recycled": 0,
+            "health_checks": 0,
+            "discarded": 0
+        }
+    
+    def _open(self) -> PooledConnection:
+        """Yeni bağlantı açar; başarısızsa havuzdaki yeri bırakır"""
+        try:
+            connection, driver = self._connect()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._stats["created"] += 1
+        return PooledConnection(connection, driver)
+    
+    def _is_healthy(self, pooled: PooledConnection) -> bool:
+        with self._cond:
+            self._stats["health_checks"] += 1
+        try:
+            cursor = pooled.connection.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchall()
+            cursor.close()
+            return True
+        except Exception:
+            return False
+    
+    def acquire(self) -> PooledConnection:
+        """
+        Havuzdan bağlantı alır (boşta yoksa ve havuz dolu değilse yenisini açar)
+        
+        Raises:
+            TimeoutError: checkout_timeout içinde bağlantı boşalmazsa
+        """
+        with self._cond:
+            self._stats["checkouts"] += 1
+            waited_from = None
+            while not self._idle and self._size >= self.max_size:
+                if waited_from is None:
+                    waited_from = time.monotonic()
+                    self._stats["waits"] += 1
+                remaining = self.checkout_timeout - (time.monotonic() - waited_from)
+                if remaining <= 0:
+                    raise TimeoutError(
+                        f"Veritabanı bağlantı havuzu dolu ({self.max_size} bağlantı kullanımda)"
+                    )
+                self._cond.wait(remaining)
+            
+            if waited_from is not None:
+                self._stats["wait_seconds"] += time.monotonic() - waited_from
+            
+            if self._idle:
+                # Son iade edilen (en sıcak) bağlantı önce kullanılır
+                pooled = self._idle.pop()
+            else:
+                self._size += 1
+                pooled = None
+        
+        if pooled is None:
+            return self._open()
+        
+        now = time.monotonic()
+        if now - pooled.created_at > self.max_lifetime_seconds:
+            pooled.close()
+            with self._cond:
+                self._stats["recycled"] += 1
+            return self._open()
+        
+        if now - pooled.last_used_at > self.max_idle_seconds and not self._is_healthy(pooled):
+            pooled.close()
+            with self._cond:
+                self._stats["discarded"] += 1
+            return self._open()
+        
+        return pooled
+    
+    def release(self, pooled: PooledConnection, discard: bool = False):
+        """Bağlantıyı havuza iade eder; discard=True ise kapatır"""
+        with self._cond:
+            if discard:
+                self._size -= 1
+                self._stats["discarded"] += 1
+            else:
+                pooled.last_used_at = time.monotonic()
+                self._idle.append(pooled)
+            self._cond.notify()
+        
+        if discard:
+            pooled.close()
+    
+    @contextmanager
+    def connection(self):
+        """
+        Bağlantıyı context süresince ödünç verir
+        
+        Hata sonrası rollback da başarısız olursa veya pooled.discard
+        işaretlendiyse bağlantı havuza iade edilmez.
+        
+        Yields:
+            PooledConnection
+        """
+        pooled = self.acquire()
+        discard = False
+        try:
+            yield pooled
+        except Exception:
+            try:
+                pooled.connection.rollback()
+            except Exception:
+                discard = True
+            raise
+        finally:
+            self.release(pooled, discard=discard or pooled.discard)
+    
+    def close_all(self):
+        """Boştaki tüm bağlantıları kapatır (kullanımdakiler iade edilince havuza döner)"""
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for pooled in idle:
+            pooled.close()
+    
+    def stats(self) -> dict:
+        """
+        Havuz metrikleri
+        
+        Returns:
+            dict: {size, in_use, idle, max_size, checkouts, waits, wait_seconds,
+                   created, recycled, health_checks, discarded}
+        """
+        with self._cond:
+            return {
+                "size": self._size,
+                "in_use": self._size - len(self._idle),
+                "idle": len(self._idle),
+                "max_size": self.max_size,
+                **{key: round(value, 3) for key, value in self._stats.items()}
+            }
+
+
+# Process genelinde paylaşılan havuz
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """Paylaşılan bağlantı havuzunu döner (ilk çağrıda oluşturulur)"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    DatabaseConnection.connect,
+                    max_size=DB_POOL_SIZE,
+                    max_idle_seconds=DB_POOL_MAX_IDLE_SECONDS,
+                    max_lifetime_seconds=DB_POOL_MAX_LIFETIME_SECONDS,
+                    checkout_timeout=DB_POOL_CHECKOUT_TIMEOUT_SECONDS
+                )
+    return _pool
+
+
+def get_pool_stats() -> dict:
+    """Bağlantı havuzu metrikleri (bkz. ConnectionPool.stats)"""
+    return get_pool().stats()
+
+
+def close_pool():
+    """Havuzdaki boştaki bağlantıları kapatır"""
+    if _pool is not None:
+        _pool.close_all()
+        print("Veritabanı bağlantıları kapatıldı")
+
+
+# Python değer tipi -> sp_executesql parametre tipi
+_SQL_PARAM_TYPES = (
+    (bool, "bit"),
+    (int, "bigint"),
+    (float, "float"),
+    (Decimal, "decimal(38, 10)"),
+    (datetime, "datetime2"),
+    (date, "date"),
+)
+
+# (sorgu, sürücü, parametre tipleri) -> sürücüye gönderilecek sorgu metni
+_statement_cache = {}
+_statement_cache_lock = threading.Lock()
+_statement_stats = {"hits": 0, "misses": 0}
+
+
+def _sql_param_type(value) -> str:
+    for python_type, sql_type in _SQL_PARAM_TYPES:
+        if isinstance(value, python_type):
+            return sql_type
+    return "nvarchar(4000)"
+
+
+# ? yer tutucusu veya atlanacak bölüm: '...' metin ('' kaçışlı), "..." / [...] tanımlayıcı,
+# -- satır yorumu, /* */ blok yorumu
+_SQL_TOKEN = re.compile(r"""'(?:[^']|'')*'|"(?:[^"]|"")*"|\[(?:[^\]]|\]\])*\]|--[^\n]*|/\*.*?\*/|\?""", re.S)
+
+
+def _split_placeholders(query: str) -> list:
+    """Sorguyu metin, tanımlayıcı ve yorumların dışındaki ? yer tutucularından böler"""
+    parts = []
+    start = 0
+    for match in _SQL_TOKEN.finditer(query):
+        if match.group() == "?":
+            parts.append(query[start:match.start()])
+            start = match.end()
+    parts.append(query[start:])
+    return parts
+
+
+def _build_statement(query: str, driver: str, param_types: tuple) -> str:
+    """
+    Sorguyu sürücüye uygun hale getirir
+
+    pyodbc: sorgu olduğu gibi (? yer tutucuları sürücü tarafından bağlanır).
+    pymssql: sorgu sp_executesql içine alınır; ? -> @pN, değerler %s ile
+    bağlanır. Metin, tanımlayıcı ve yorumlardaki ? yer tutucu sayılmaz.
+    """
+    if driver != "pymssql":
+        return query
+    
+    names = [f"@p{i}" for i in range(len(param_types))]
+    parts = _split_placeholders(query)
+    if len(parts) - 1 != len(names):
+        raise ValueError(f"Sorgudaki yer tutucu sayısı ({len(parts) - 1}) parametre sayısıyla ({len(names)}) uyuşmuyor")
+    
+    body = parts[0] + "".join(name + part for name, part in zip(names, parts[1:]))
+    # pymssql %s bağlamasında literal % kaçırılmalı
+    body = body.replace("'", "''").replace("%", "%%")
+    declarations = ", ".join(f"{name} {sql_type}" for name, sql_type in zip(names, param_types))
+    assignments = ", ".join(f"{name} = %s" for name in names)
+    return f"EXEC sp_executesql N'{body}', N'{declarations}', {assignments}"
+
+
+def prepare_statement(query: str, driver: str, params=None) -> str:
+    """
+    Sürücüye gönderilecek sorgu metnini önbellekten döner
+
+    Sonuç sorgu şablonu, sürücü ve parametre tipleriyle önbelleğe alınır;
+    aynı şablon her çağrıda aynı metni üretir.
+    """
+    param_types = tuple(_sql_param_type(value) for value in params or ())
+    key = (query, driver, param_types)
+    
+    with _statement_cache_lock:
+        statement = _statement_cache.get(key)
+        if statement is not None:
+            _statement_stats["hits"] += 1
+            return statement
+        _statement_stats["misses"] += 1
+    
+    statement = _build_statement(query, driver, param_types)
+    with _statement_cache_lock:
+        _statement_cache[key] = statement
+    return statement
+
+
+def get_statement_cache_stats() -> dict:
+    """Sorgu metni önbelleği metrikleri: {size, hits, misses}"""
+    with _statement_cache_lock:
+        return {"size": len(_statement_cache), **_statement_stats}
+
+
+def _execute(cursor, driver: str, query, params=None):
+    """Sorguyu sürücüye uygun metin ve parametrelerle çalıştırır"""
+    if params:
+        cursor.execute(prepare_statement(query, driver, params), tuple(params))
+    else:
+        cursor.execute(query)
+
+
+@contextmanager
+def _pooled_cursor():
+    """Havuzdan ödünç alınan bağlantıda cursor açar; (cursor, driver) verir"""
+    with get_pool().connection() as pooled:
+        connection = pooled.connection
+        cursor = connection.cursor()
+        try:
+            yield cursor, pooled.driver
+            connection.commit()
+        finally:
+            cursor.close()
 
 
 @contextmanager
 def get_db_cursor():
-    """Context manager ile cursor kullanımı"""
-    connection = DatabaseConnection.get_connection()
-    cursor = connection.cursor()
-    try:
+    """Context manager ile cursor kullanımı (bağlantı havuzdan ödünç alınır)"""
+    with _pooled_cursor() as (cursor, _):
         yield cursor
-        connection.commit()
-    except Exception as e:
-        connection.rollback()
-        raise e
-    finally:
-        cursor.close()
-
-
-def execute_query(query, params=None):
-    """SQL sorgusu çalıştırır ve sonuçları döner"""
-    with get_db_cursor() as cursor:
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-        
-        columns = [column[0] for column in cursor.description]
-        results = []
-        for row in cursor.fetchall():
-            results.append(dict(zip(columns, row)))
+
+
+def execute_query(query, params=None, cache: bool = True):
+    """
+    SQL sorgusu çalıştırır ve sonuçları döner
+
+    cache=True ise sonuç paylaşılan sorgu önbelleğinden gelebilir
+    (bkz. database/query_cache.py); veri yazan sorgularda cache=False verilmelidir.
+    """
+    def load():
+        with _pooled_cursor() as (cursor, driver):
+            _execute(cursor, driver, query, params)
+            
+            columns = [column[0] for column in cursor.description]
+            results = []
+            for row in cursor.fetchall():
+                results.append(dict(zip(columns, row)))
+            
+            return results
+    
+    if cache and USE_QUERY_CACHE:
+        return cached_query(query, params, load)
+    return load()
+
+
+def _convert_column(values: np.ndarray):
+    """
+    Sürücünün döndürdüğü object sütunu tek seferde tipli diziye çevirir
+
+    Decimal/float -> float64, int -> int64 (NULL varsa float64),
+    date/datetime -> datetime64; metin ve diğerleri object kalır.
+    """
+    sample = next((value for value in values if value is not None), None)
+    if sample is None or isinstance(sample, str):
+        return values
+    if isinstance(sample, date):
+        return pd.to_datetime(values).to_numpy()
+    if not isinstance(sample, (Decimal, float, int)):
+        return values
+    
+    missing = pd.isna(values)
+    if isinstance(sample, bool):
+        return values if missing.any() else values.astype(bool)
+    if isinstance(sample, int) and not missing.any():
+        return values.astype(np.int64)
+    converted = np.full(len(values), np.nan)
+    converted[~missing] = values[~missing].astype(np.float64)
+    return converted
+
+
+def _split_batch(chunks: list, rows):
+    """fetchmany batch'ini sütun başına object dizilerine ayırıp chunks'a ekler"""
+    for chunk, values in zip(chunks, zip(*rows)):
+        chunk.append(np.fromiter(values, dtype=object, count=len(values)))
+
+
+def _chunks_to_frame(columns: list, chunks: list) -> pd.DataFrame:
+    """Sütun parçalarını birleştirip tip dönüşümüyle DataFrame oluşturur"""
+    data = {}
+    for name, chunk in zip(columns, chunks):
+        values = np.concatenate(chunk) if chunk else np.empty(0, dtype=object)
+        data[name] = _convert_column(values)
+    
+    return pd.DataFrame(data, columns=columns, copy=False)
+
+
+def cursor_to_frame(cursor, batch_size: int = QUERY_FETCH_BATCH_SIZE) -> pd.DataFrame:
+    """
+    Çalıştırılmış cursor'ın sonucunu DataFrame'e çevirir
+
+    Satırlar fetchmany ile batch batch okunur ve her batch hemen sütunlara
+    ayrılır; satır başına dict oluşturulmaz. Tip dönüşümü sütun başına
+    bir kez, vektörel yapılır.
+    """
+    columns = [column[0] for column in cursor.description]
+    chunks = [[] for _ in columns]
+    
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        _split_batch(chunks, rows)
+    
+    return _chunks_to_frame(columns, chunks)
+
+
+def iter_cursor_frames(cursor, chunk_size: int = QUERY_CHUNK_ROWS, batch_size: int = QUERY_FETCH_BATCH_SIZE):
+    """
+    Çalıştırılmış cursor'ın sonucunu en fazla chunk_size satırlık DataFrame'ler halinde döndürür
+
+    Yields:
+        DataFrame: Sonucun sıradaki parçası (tipler cursor_to_frame ile aynı)
+    """
+    columns = [column[0] for column in cursor.description]
+    chunks = [[] for _ in columns]
+    buffered = 0
+    
+    while True:
+        rows = cursor.fetchmany(min(batch_size, chunk_size))
+        if not rows:
+            break
+        _split_batch(chunks, rows)
+        buffered += len(rows)
         
-        return results
+        if buffered >= chunk_size:
+            yield _chunks_to_frame(columns, chunks)
+            chunks = [[] for _ in columns]
+            buffered = 0
+    
+    if buffered:
+        yield _chunks_to_frame(columns, chunks)
+
+
+def iter_query(query, params=None, chunk_size: int = QUERY_CHUNK_ROWS, batch_size: int = QUERY_FETCH_BATCH_SIZE):
+    """
+    SQL sorgusunu çalıştırır ve sonucu sınırlı boyutlu DataFrame parçaları halinde akıtır
+
+    Bellekte aynı anda en fazla bir parça tutulur; büyük detay sorguları
+    (üye bazlı dışa aktarım gibi) sabit bellekle işlenebilir. Bağlantı
+    akış bitene kadar havuzdan ödünç alınır; akış yarıda bırakılırsa
+    okunmamış sonuç taşıyan bağlantı havuza iade edilmez.
+
+    Args:
+        query: SQL sorgusu
+        params: Sorgu parametreleri
+        chunk_size: Parça başına en fazla satır
+        batch_size: fetchmany batch boyutu
+
+    Yields:
+        DataFrame: Sonucun sıradaki parçası
+    """
+    with get_pool().connection() as pooled:
+        cursor = pooled.connection.cursor()
+        completed = False
+        try:
+            _execute(cursor, pooled.driver, query, params)
+            yield from iter_cursor_frames(cursor, chunk_size, batch_size)
+            completed = True
+        finally:
+            if not completed:
+                pooled.discard = True
+            cursor.close()
+
+
+def execute_query_df(query, params=None, arrow: bool = False, batch_size: int = QUERY_FETCH_BATCH_SIZE,
+                     cache: bool = True):
+    """
+    SQL sorgusu çalıştırır ve sonucu tipli sütunlarla döner
+
+    Args:
+        query: SQL sorgusu
+        params: Sorgu parametreleri
+        arrow: True ise pyarrow.Table döner
+        batch_size: fetchmany batch boyutu
+        cache: Sonuç paylaşılan sorgu önbelleğinden gelebilir mi
+
+    Returns:
+        DataFrame (veya arrow=True ise pyarrow.Table)
+    """
+    if arrow and not ARROW_AVAILABLE:
+        raise ImportError("Arrow çıktısı için pyarrow kurulu olmalı")
+    
+    def load():
+        with _pooled_cursor() as (cursor, driver):
+            _execute(cursor, driver, query, params)
+            return cursor_to_frame(cursor, batch_size)
+    
+    df = cached_query(query, params, load) if cache and USE_QUERY_CACHE else load()
+    
+    if arrow:
+        return pa.Table.from_pandas(df, preserve_index=False)
+    return df
 
 
 def test_connection():
     """Bağlantı testi yapar"""
     try:
-        connection = DatabaseConnection.get_connection()
-        cursor = connection.cursor()
-        cursor.execute("SELECT 1 as test")
-        result = cursor.fetchone()
-        cursor.close()
+        with get_db_cursor() as cursor:
+            cursor.execute("SELECT 1 as test")
+            result = cursor.fetchone()
         return result[0] == 1
     except Exception as e:
         print(f"Bağlantı testi başarısız: {e}")
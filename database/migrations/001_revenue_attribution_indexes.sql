@@ -0,0 +1,62 @@
+-- =====================================================================
+-- 001 - Ciro atama (attribution) indeksleri
+-- =====================================================================
+-- REVENUE_QUERY / REVENUE_ROLLUP aralıktaki siparişlerden başlar ve her
+-- üyenin en son MemberForm kaydını CROSS APPLY TOP 1 ile bulur (aynı
+-- CreateDate'te birden fazla form varsa en büyük Id seçilir).
+--
+--   IX_MemberForm_MemberId_CreateDate: üye başına en son form tek seek;
+--       anahtar sorgunun sıralamasıyla (CreateDate DESC, Id DESC) aynı,
+--       UTM sütunları INCLUDE edildiği için anahtar araması (lookup) yok
+--   IX_Order_CreateDate: tarih aralığındaki siparişler için range seek
+--
+-- Betik tekrar çalıştırılabilir; mevcut indeksler atlanır. Id sütunu
+-- olmadan oluşturulmuş IX_MemberForm_MemberId_CreateDate yeniden oluşturulur.
+-- Büyük tablolarda bakım penceresinde çalıştırın (Enterprise sürümde
+-- WITH (ONLINE = ON) eklenebilir).
+--
+-- Çalıştırma:
+--     sqlcmd -S <sunucu> -d MemberPrime -i database/migrations/001_revenue_attribution_indexes.sql
+-- =====================================================================
+
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE name = 'IX_MemberForm_MemberId_CreateDate'
+      AND object_id = OBJECT_ID('dbo.MemberForm')
+)
+BEGIN
+    CREATE NONCLUSTERED INDEX IX_MemberForm_MemberId_CreateDate
+        ON dbo.MemberForm (MemberId, CreateDate DESC, Id DESC)
+        INCLUDE (UtmSource, UtmMedium, UtmContent);
+    PRINT 'IX_MemberForm_MemberId_CreateDate oluşturuldu';
+END
+ELSE IF NOT EXISTS (
+    SELECT 1 FROM sys.index_columns ic
+    INNER JOIN sys.indexes i ON i.object_id = ic.object_id AND i.index_id = ic.index_id
+    INNER JOIN sys.columns c ON c.object_id = ic.object_id AND c.column_id = ic.column_id
+    WHERE i.name = 'IX_MemberForm_MemberId_CreateDate'
+      AND i.object_id = OBJECT_ID('dbo.MemberForm')
+      AND c.name = 'Id'
+      AND ic.is_included_column = 0
+)
+BEGIN
+    CREATE NONCLUSTERED INDEX IX_MemberForm_MemberId_CreateDate
+        ON dbo.MemberForm (MemberId, CreateDate DESC, Id DESC)
+        INCLUDE (UtmSource, UtmMedium, UtmContent)
+        WITH (DROP_EXISTING = ON);
+    PRINT 'IX_MemberForm_MemberId_CreateDate Id ile yeniden oluşturuldu';
+END
+GO
+
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE name = 'IX_Order_CreateDate'
+      AND object_id = OBJECT_ID('dbo.[ORDER]')
+)
+BEGIN
+    CREATE NONCLUSTERED INDEX IX_Order_CreateDate
+        ON dbo.[ORDER] (CreateDate)
+        INCLUDE (Price, TotalPrice);
+    PRINT 'IX_Order_CreateDate oluşturuldu';
+END
+GO
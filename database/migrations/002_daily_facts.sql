@@ -0,0 +1,66 @@
+-- =====================================================================
+-- 002 - Günlük lead / ciro fact tabloları
+-- =====================================================================
+-- etl.py bu tabloları etl_watermark'taki son işlenme anına göre artımlı
+-- günceller; servisler kesinleşmiş günleri buradan okur
+-- (bkz. services/daily_facts.py).
+--
+--   lead_daily:    (day, source, content, member_id) - gün ve content başına lead olan üyeler
+--   revenue_daily: (day, source, content, order_id) - atanan sipariş başına ciro,
+--                  net ciro ve join satır sayısı (lines)
+--   etl_watermark: fact tablosu başına son işlenme anı
+--
+-- Üye / sipariş anahtarı tekil sayımların her seviyede yeniden
+-- hesaplanabilmesi içindir. NULL UtmContent '' olarak saklanır.
+--
+-- content uzun olabilir ve birincil anahtarda 900 bayt sınırını aşar;
+-- anahtarda onun yerine kalıcı SHA2_256 özeti (content_hash) kullanılır.
+--
+-- Betik tekrar çalıştırılabilir; mevcut tablolar atlanır.
+--
+-- Çalıştırma:
+--     sqlcmd -S <sunucu> -d MemberPrime -i database/migrations/002_daily_facts.sql
+--     python etl.py --rebuild     # ilk yükleme
+-- =====================================================================
+
+IF OBJECT_ID('dbo.lead_daily') IS NULL
+BEGIN
+    CREATE TABLE dbo.lead_daily (
+        day DATE NOT NULL,
+        source NVARCHAR(100) NOT NULL,
+        content NVARCHAR(4000) NOT NULL,
+        content_hash AS CAST(HASHBYTES('SHA2_256', content) AS BINARY(32)) PERSISTED NOT NULL,
+        member_id INT NOT NULL,
+        CONSTRAINT PK_lead_daily PRIMARY KEY CLUSTERED (day, source, content_hash, member_id)
+    );
+    PRINT 'dbo.lead_daily oluşturuldu';
+END
+GO
+
+IF OBJECT_ID('dbo.revenue_daily') IS NULL
+BEGIN
+    CREATE TABLE dbo.revenue_daily (
+        day DATE NOT NULL,
+        source NVARCHAR(100) NOT NULL,
+        content NVARCHAR(4000) NOT NULL,
+        content_hash AS CAST(HASHBYTES('SHA2_256', content) AS BINARY(32)) PERSISTED NOT NULL,
+        order_id INT NOT NULL,
+        revenue DECIMAL(18, 2) NOT NULL,
+        net_revenue DECIMAL(18, 2) NOT NULL,
+        lines INT NOT NULL,
+        CONSTRAINT PK_revenue_daily PRIMARY KEY CLUSTERED (day, source, content_hash, order_id)
+    );
+    PRINT 'dbo.revenue_daily oluşturuldu';
+END
+GO
+
+IF OBJECT_ID('dbo.etl_watermark') IS NULL
+BEGIN
+    CREATE TABLE dbo.etl_watermark (
+        name NVARCHAR(50) NOT NULL CONSTRAINT PK_etl_watermark PRIMARY KEY,
+        watermark DATETIME2 NOT NULL,
+        updated_at DATETIME2 NOT NULL
+    );
+    PRINT 'dbo.etl_watermark oluşturuldu';
+END
+GO
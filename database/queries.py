@@ -2,8 +2,19 @@
 SQL Queries
 ===========
 Lead ve Ciro sorguları
+
+Sorgular şablondur: {sources} yerine sabit sayıda (SOURCE_PARAM_SLOTS)
+parametre yer tutucusu konur. Source değerleri metne eklenmez, tarih
+parametrelerinden önce parametre olarak bağlanır (bkz. bind_sources).
+
+Tarih parametreleri gün olarak kapsayıcıdır. Canlı tablolarda yarı açık
+aralık kullanılır (CreateDate >= başlangıç AND CreateDate < bitiş + 1 gün);
+bitiş gününün tamamı, fact tablolarındaki day BETWEEN gibi dahildir.
 """
 
+from functools import lru_cache
+from config.database import SOURCE_PARAM_SLOTS
+
 
 # Lead sorgusu - MemberForm tablosundan
 LEAD_QUERY = """
@@ -17,44 +28,43 @@ SELECT
 FROM MemberPrime..MemberForm
 WHERE UtmSource IN ({sources})
   AND BrandId = 1
-  AND CreateDate BETWEEN ? AND ?
+  AND CreateDate >= ? AND CreateDate < DATEADD(day, 1, ?)
 ORDER BY CreateDate DESC
 """
 
 
-# Lead sayısı - kaynak ve content bazlı gruplandırma
-LEAD_COUNT_BY_SOURCE_CONTENT = """
+# Lead özetleri - tek geçişte tüm seviyeler (bkz. ROLLUP_* sabitleri)
+# Her seviyede COUNT(DISTINCT) ayrı hesaplanır; alt seviyeler toplanmaz.
+# Boş UtmContent '' olarak döner (fact tabloları, yerel depo ve reklam verisiyle aynı)
+LEAD_ROLLUP = """
 SELECT 
+    GROUPING_ID(UtmSource, UtmContent, LeadDate) as GroupingId,
     UtmSource,
     UtmContent,
+    LeadDate as Date,
     COUNT(DISTINCT MemberId) as LeadCount,
     CAST(MIN(CreateDate) as DATE) as FirstLeadDate,
     CAST(MAX(CreateDate) as DATE) as LastLeadDate
-FROM MemberPrime..MemberForm
-WHERE UtmSource IN ({sources})
-  AND BrandId = 1
-  AND CreateDate BETWEEN ? AND ?
-GROUP BY UtmSource, UtmContent
-ORDER BY LeadCount DESC
-"""
-
-
-# Lead sayısı - günlük trend
-LEAD_DAILY_TREND = """
-SELECT 
-    CAST(CreateDate as DATE) as Date,
-    UtmSource,
-    COUNT(DISTINCT MemberId) as LeadCount
-FROM MemberPrime..MemberForm
-WHERE UtmSource IN ({sources})
-  AND BrandId = 1
-  AND CreateDate BETWEEN ? AND ?
-GROUP BY CAST(CreateDate as DATE), UtmSource
-ORDER BY Date ASC
+FROM (
+    SELECT MemberId, UtmSource, ISNULL(UtmContent, '') as UtmContent, CreateDate, CAST(CreateDate as DATE) as LeadDate
+    FROM MemberPrime..MemberForm
+    WHERE UtmSource IN ({sources})
+      AND BrandId = 1
+      AND CreateDate >= ? AND CreateDate < DATEADD(day, 1, ?)
+) leads
+GROUP BY GROUPING SETS (
+    (UtmSource, UtmContent),
+    (LeadDate, UtmSource),
+    (UtmSource),
+    ()
+)
 """
 
 
-# Ciro sorgusu - MemberForm ile Join yaparak UTM verileri ile eşleştirilmiş
+# Ciro sorgusu - siparişler üyenin en son MemberForm kaydının UTM verisine atanır
+# Sorgu aralıktaki siparişlerden başlar; en son form, üye başına
+# IX_MemberForm_MemberId_CreateDate üzerinde tek seek ile bulunur
+# (bkz. database/migrations/001_revenue_attribution_indexes.sql)
 REVENUE_QUERY = """
 SELECT 
     mf.MemberId,
@@ -67,26 +77,27 @@ SELECT
     P.Title AS Product,
     T.Status,
     T.LessonDuration,
+    O.Id AS OrderId,
     O.Price,
     O.TotalPrice,
     CONVERT(DECIMAL(10, 2), (O.TotalPrice / 1.1)) as NetPrice,
     O.CreateDate AS OrderDate,
     T.CreateDate AS TermDate
-FROM MemberPrime..MemberForm mf
-INNER JOIN (
-    SELECT MemberId, MAX(CreateDate) as MaxCreateDate
-    FROM MemberPrime..MemberForm
-    GROUP BY MemberId
-) mf_latest ON mf.MemberId = mf_latest.MemberId AND mf.CreateDate = mf_latest.MaxCreateDate
-INNER JOIN TERM T ON T.MemberId = mf.MemberId
+FROM [ORDER] O
+INNER JOIN [OrderTermDetail] OTD ON OTD.OrderId = O.Id
+INNER JOIN TERM T ON T.ID = OTD.TermId
 INNER JOIN MEMBER M ON M.ID = T.MemberId
 INNER JOIN EmployeeMember EM ON T.MemberId = EM.MemberId AND EM.Status = 1 AND EM.EmployeeTypeId = 4
-INNER JOIN [OrderTermDetail] OTD ON OTD.TermId = T.ID
-INNER JOIN [ORDER] O ON O.Id = OTD.OrderId
 INNER JOIN Product P ON P.ID = T.ProductId
 INNER JOIN Payment PM ON PM.OrderId = OTD.OrderId
+CROSS APPLY (
+    SELECT TOP 1 MemberId, UtmSource, UtmMedium, UtmContent
+    FROM MemberPrime..MemberForm
+    WHERE MemberId = T.MemberId
+    ORDER BY CreateDate DESC, Id DESC
+) mf
 WHERE mf.UtmSource IN ({sources})
-  AND O.CreateDate BETWEEN ? AND ?
+  AND O.CreateDate >= ? AND O.CreateDate < DATEADD(day, 1, ?)
   AND T.SalesType = 1
   AND O.TotalPrice > 0
   AND PM.Status = 1
@@ -94,62 +105,385 @@ ORDER BY O.CreateDate DESC
 """
 
 
-# Ciro özeti - kaynak ve content bazlı
-REVENUE_SUMMARY_BY_SOURCE_CONTENT = """
+# Ciro özetleri - tek geçişte tüm seviyeler (bkz. ROLLUP_* sabitleri)
+# Atama REVENUE_QUERY ile aynıdır (üyenin en son MemberForm kaydı)
+REVENUE_ROLLUP = """
 SELECT 
-    mf.UtmSource,
-    mf.UtmContent,
-    COUNT(DISTINCT O.Id) as OrderCount,
-    SUM(O.TotalPrice) as TotalRevenue,
-    SUM(CONVERT(DECIMAL(10, 2), (O.TotalPrice / 1.1))) as NetRevenue,
-    AVG(O.TotalPrice) as AvgOrderValue
+    GROUPING_ID(UtmSource, UtmContent, OrderDate) as GroupingId,
+    UtmSource,
+    UtmContent,
+    OrderDate as Date,
+    COUNT(DISTINCT OrderId) as OrderCount,
+    SUM(TotalPrice) as TotalRevenue,
+    SUM(NetPrice) as NetRevenue,
+    AVG(TotalPrice) as AvgOrderValue
+FROM (
+    SELECT 
+        mf.UtmSource,
+        ISNULL(mf.UtmContent, '') as UtmContent,
+        O.Id as OrderId,
+        O.TotalPrice,
+        CONVERT(DECIMAL(10, 2), (O.TotalPrice / 1.1)) as NetPrice,
+        CAST(O.CreateDate as DATE) as OrderDate
+    FROM [ORDER] O
+    INNER JOIN [OrderTermDetail] OTD ON OTD.OrderId = O.Id
+    INNER JOIN TERM T ON T.ID = OTD.TermId
+    INNER JOIN Payment PM ON PM.OrderId = OTD.OrderId
+    CROSS APPLY (
+        SELECT TOP 1 UtmSource, UtmContent
+        FROM MemberPrime..MemberForm
+        WHERE MemberId = T.MemberId
+        ORDER BY CreateDate DESC, Id DESC
+    ) mf
+    WHERE mf.UtmSource IN ({sources})
+      AND O.CreateDate >= ? AND O.CreateDate < DATEADD(day, 1, ?)
+      AND T.SalesType = 1
+      AND O.TotalPrice > 0
+      AND PM.Status = 1
+) orders
+GROUP BY GROUPING SETS (
+    (UtmSource, UtmContent),
+    (OrderDate, UtmSource),
+    (UtmSource),
+    ()
+)
+"""
+
+
+# ---------------------------------------------------------------------
+# Günlük fact tabloları (bkz. etl.py, database/migrations/002_daily_facts.sql)
+# ---------------------------------------------------------------------
+# lead_daily (source, content, day, üye) ve revenue_daily (source, content,
+# day, sipariş) satırları tutar; NULL UtmContent '' olarak saklanır. Üye ve
+# sipariş anahtarları sayesinde her seviyede COUNT(DISTINCT) yeniden
+# hesaplanır, sayımlar *_ROLLUP ile aynıdır.
+
+FACT_WATERMARK_QUERY = """
+SELECT watermark FROM dbo.etl_watermark WHERE name = ?
+"""
+
+
+# Watermark'tan sonra oluşan formların günleri ve son N gün yeniden hesaplanır
+LEAD_DAILY_ETL = """
+SET NOCOUNT ON;
+SET XACT_ABORT ON;
+
+DECLARE @from datetime2 = ISNULL((SELECT watermark FROM dbo.etl_watermark WHERE name = 'lead_daily'), '19000101');
+DECLARE @to datetime2 = SYSDATETIME();
+DECLARE @reprocess_days int = ?;
+DECLARE @reprocess_from date = DATEADD(day, -@reprocess_days, CAST(@to as DATE));
+DECLARE @days TABLE (day date PRIMARY KEY);
+DECLARE @rows int;
+
+INSERT INTO @days (day)
+SELECT CAST(CreateDate as DATE) FROM MemberPrime..MemberForm
+WHERE BrandId = 1 AND CreateDate > @from AND CreateDate <= @to
+UNION
+SELECT CAST(CreateDate as DATE) FROM MemberPrime..MemberForm
+WHERE BrandId = 1 AND CreateDate >= @reprocess_from AND CreateDate <= @to
+UNION
+SELECT day FROM dbo.lead_daily WHERE day >= @reprocess_from;
+
+DELETE f FROM dbo.lead_daily f INNER JOIN @days d ON d.day = f.day;
+
+INSERT INTO dbo.lead_daily (source, content, day, member_id)
+SELECT 
+    UtmSource,
+    ISNULL(UtmContent, ''),
+    CAST(CreateDate as DATE),
+    MemberId
+FROM MemberPrime..MemberForm
+WHERE BrandId = 1
+  AND UtmSource IS NOT NULL
+  AND CreateDate <= @to
+  AND CAST(CreateDate as DATE) IN (SELECT day FROM @days)
+GROUP BY UtmSource, ISNULL(UtmContent, ''), CAST(CreateDate as DATE), MemberId;
+SET @rows = @@ROWCOUNT;
+
+UPDATE dbo.etl_watermark SET watermark = @to, updated_at = SYSDATETIME() WHERE name = 'lead_daily';
+IF @@ROWCOUNT = 0
+    INSERT INTO dbo.etl_watermark (name, watermark, updated_at) VALUES ('lead_daily', @to, SYSDATETIME());
+
+SELECT (SELECT COUNT(*) FROM @days) as Days, @rows as Rows, @to as Watermark;
+"""
+
+
+# Yeni siparişlerin günlerine ek olarak, watermark'tan sonra form dolduran
+# üyelerin siparişleri de yeniden atanır (atama üyenin en son formuna göre)
+REVENUE_DAILY_ETL = """
+SET NOCOUNT ON;
+SET XACT_ABORT ON;
+
+DECLARE @from datetime2 = ISNULL((SELECT watermark FROM dbo.etl_watermark WHERE name = 'revenue_daily'), '19000101');
+DECLARE @to datetime2 = SYSDATETIME();
+DECLARE @reprocess_days int = ?;
+DECLARE @reprocess_from date = DATEADD(day, -@reprocess_days, CAST(@to as DATE));
+DECLARE @days TABLE (day date PRIMARY KEY);
+DECLARE @rows int;
+
+INSERT INTO @days (day)
+SELECT CAST(O.CreateDate as DATE) FROM [ORDER] O
+WHERE O.CreateDate > @from AND O.CreateDate <= @to
+UNION
+SELECT CAST(O.CreateDate as DATE)
 FROM MemberPrime..MemberForm mf
-INNER JOIN (
-    SELECT MemberId, MAX(CreateDate) as MaxCreateDate
-    FROM MemberPrime..MemberForm
-    GROUP BY MemberId
-) mf_latest ON mf.MemberId = mf_latest.MemberId AND mf.CreateDate = mf_latest.MaxCreateDate
 INNER JOIN TERM T ON T.MemberId = mf.MemberId
 INNER JOIN [OrderTermDetail] OTD ON OTD.TermId = T.ID
 INNER JOIN [ORDER] O ON O.Id = OTD.OrderId
+WHERE mf.CreateDate > @from AND mf.CreateDate <= @to AND O.CreateDate <= @to
+UNION
+SELECT CAST(O.CreateDate as DATE) FROM [ORDER] O
+WHERE O.CreateDate >= @reprocess_from AND O.CreateDate <= @to
+UNION
+SELECT day FROM dbo.revenue_daily WHERE day >= @reprocess_from;
+
+DELETE f FROM dbo.revenue_daily f INNER JOIN @days d ON d.day = f.day;
+
+INSERT INTO dbo.revenue_daily (source, content, day, order_id, revenue, net_revenue, lines)
+SELECT 
+    mf.UtmSource,
+    ISNULL(mf.UtmContent, ''),
+    CAST(O.CreateDate as DATE),
+    O.Id,
+    SUM(O.TotalPrice),
+    SUM(CONVERT(DECIMAL(10, 2), (O.TotalPrice / 1.1))),
+    COUNT(*)
+FROM [ORDER] O
+INNER JOIN [OrderTermDetail] OTD ON OTD.OrderId = O.Id
+INNER JOIN TERM T ON T.ID = OTD.TermId
 INNER JOIN Payment PM ON PM.OrderId = OTD.OrderId
-WHERE mf.UtmSource IN ({sources})
-  AND O.CreateDate BETWEEN ? AND ?
+CROSS APPLY (
+    SELECT TOP 1 UtmSource, UtmContent
+    FROM MemberPrime..MemberForm
+    WHERE MemberId = T.MemberId
+    ORDER BY CreateDate DESC, Id DESC
+) mf
+WHERE mf.UtmSource IS NOT NULL
+  AND O.CreateDate <= @to
+  AND CAST(O.CreateDate as DATE) IN (SELECT day FROM @days)
   AND T.SalesType = 1
   AND O.TotalPrice > 0
   AND PM.Status = 1
-GROUP BY mf.UtmSource, mf.UtmContent
-ORDER BY TotalRevenue DESC
+GROUP BY mf.UtmSource, ISNULL(mf.UtmContent, ''), CAST(O.CreateDate as DATE), O.Id;
+SET @rows = @@ROWCOUNT;
+
+UPDATE dbo.etl_watermark SET watermark = @to, updated_at = SYSDATETIME() WHERE name = 'revenue_daily';
+IF @@ROWCOUNT = 0
+    INSERT INTO dbo.etl_watermark (name, watermark, updated_at) VALUES ('revenue_daily', @to, SYSDATETIME());
+
+SELECT (SELECT COUNT(*) FROM @days) as Days, @rows as Rows, @to as Watermark;
 """
 
 
-# Günlük ciro trendi
-REVENUE_DAILY_TREND = """
+# Fact tablosundan (source, content, gün, üye) satırları (kesinleşmiş günler)
+LEAD_DAILY_FACTS = """
+SELECT 
+    source as UtmSource,
+    content as UtmContent,
+    day as Date,
+    member_id as MemberId
+FROM dbo.lead_daily
+WHERE source IN ({sources})
+  AND day BETWEEN ? AND ?
+"""
+
+
+# Watermark gününden sonrası için aynı satırlar canlı tablodan
+LEAD_DAILY_LIVE = """
+SELECT DISTINCT
+    UtmSource,
+    ISNULL(UtmContent, '') as UtmContent,
+    CAST(CreateDate as DATE) as Date,
+    MemberId
+FROM MemberPrime..MemberForm
+WHERE UtmSource IN ({sources})
+  AND BrandId = 1
+  AND CreateDate >= ? AND CreateDate < DATEADD(day, 1, ?)
+"""
+
+
+# (source, content, gün, sipariş) satırları; LineCount AvgOrderValue için join satır sayısı
+REVENUE_DAILY_FACTS = """
+SELECT 
+    source as UtmSource,
+    content as UtmContent,
+    day as Date,
+    order_id as OrderId,
+    revenue as TotalRevenue,
+    net_revenue as NetRevenue,
+    lines as LineCount
+FROM dbo.revenue_daily
+WHERE source IN ({sources})
+  AND day BETWEEN ? AND ?
+"""
+
+
+REVENUE_DAILY_LIVE = """
 SELECT 
-    CAST(O.CreateDate as DATE) as Date,
     mf.UtmSource,
+    ISNULL(mf.UtmContent, '') as UtmContent,
+    CAST(O.CreateDate as DATE) as Date,
+    O.Id as OrderId,
     SUM(O.TotalPrice) as TotalRevenue,
-    COUNT(DISTINCT O.Id) as OrderCount
-FROM MemberPrime..MemberForm mf
-INNER JOIN (
-    SELECT MemberId, MAX(CreateDate) as MaxCreateDate
-    FROM MemberPrime..MemberForm
-    GROUP BY MemberId
-) mf_latest ON mf.MemberId = mf_latest.MemberId AND mf.CreateDate = mf_latest.MaxCreateDate
-INNER JOIN TERM T ON T.MemberId = mf.MemberId
-INNER JOIN [OrderTermDetail] OTD ON OTD.TermId = T.ID
-INNER JOIN [ORDER] O ON O.Id = OTD.OrderId
+    SUM(CONVERT(DECIMAL(10, 2), (O.TotalPrice / 1.1))) as NetRevenue,
+    COUNT(*) as LineCount
+FROM [ORDER] O
+INNER JOIN [OrderTermDetail] OTD ON OTD.OrderId = O.Id
+INNER JOIN TERM T ON T.ID = OTD.TermId
 INNER JOIN Payment PM ON PM.OrderId = OTD.OrderId
+CROSS APPLY (
+    SELECT TOP 1 UtmSource, UtmContent
+    FROM MemberPrime..MemberForm
+    WHERE MemberId = T.MemberId
+    ORDER BY CreateDate DESC, Id DESC
+) mf
 WHERE mf.UtmSource IN ({sources})
-  AND O.CreateDate BETWEEN ? AND ?
+  AND O.CreateDate >= ? AND O.CreateDate < DATEADD(day, 1, ?)
   AND T.SalesType = 1
   AND O.TotalPrice > 0
   AND PM.Status = 1
-GROUP BY CAST(O.CreateDate as DATE), mf.UtmSource
-ORDER BY Date ASC
+GROUP BY mf.UtmSource, ISNULL(mf.UtmContent, ''), CAST(O.CreateDate as DATE), O.Id
+"""
+
+
+# LEAD_ROLLUP biçiminde özet: kesinleşmiş günler fact tablosundan, watermark
+# günü ve sonrası canlı tablodan; tekil sayım birleşik satırlar üzerinde yapılır.
+# Parametreler: source'lar, fact aralığı, source'lar, canlı aralık
+LEAD_DAILY_ROLLUP = """
+SELECT 
+    GROUPING_ID(UtmSource, UtmContent, LeadDate) as GroupingId,
+    UtmSource,
+    UtmContent,
+    LeadDate as Date,
+    COUNT(DISTINCT MemberId) as LeadCount,
+    MIN(LeadDate) as FirstLeadDate,
+    MAX(LeadDate) as LastLeadDate
+FROM (
+    SELECT member_id as MemberId, source as UtmSource, content as UtmContent, day as LeadDate
+    FROM dbo.lead_daily
+    WHERE source IN ({sources})
+      AND day BETWEEN ? AND ?
+    UNION ALL
+    SELECT MemberId, UtmSource, ISNULL(UtmContent, ''), CAST(CreateDate as DATE)
+    FROM MemberPrime..MemberForm
+    WHERE UtmSource IN ({sources})
+      AND BrandId = 1
+      AND CreateDate >= ? AND CreateDate < DATEADD(day, 1, ?)
+) leads
+GROUP BY GROUPING SETS (
+    (UtmSource, UtmContent),
+    (LeadDate, UtmSource),
+    (UtmSource),
+    ()
+)
 """
 
 
-def format_sources(sources: list) -> str:
-    """Source listesini SQL IN clause formatına çevirir"""
-    return ", ".join([f"'{s}'" for s in sources])
+# REVENUE_ROLLUP biçiminde özet (parametreler LEAD_DAILY_ROLLUP ile aynı sırada)
+# AvgOrderValue, REVENUE_ROLLUP'taki AVG(TotalPrice) gibi join satırı başına ortalamadır
+REVENUE_DAILY_ROLLUP = """
+SELECT 
+    GROUPING_ID(UtmSource, UtmContent, OrderDate) as GroupingId,
+    UtmSource,
+    UtmContent,
+    OrderDate as Date,
+    COUNT(DISTINCT OrderId) as OrderCount,
+    SUM(TotalPrice) as TotalRevenue,
+    SUM(NetPrice) as NetRevenue,
+    SUM(TotalPrice) / NULLIF(SUM(LineCount), 0) as AvgOrderValue
+FROM (
+    SELECT 
+        source as UtmSource,
+        content as UtmContent,
+        order_id as OrderId,
+        revenue as TotalPrice,
+        net_revenue as NetPrice,
+        lines as LineCount,
+        day as OrderDate
+    FROM dbo.revenue_daily
+    WHERE source IN ({sources})
+      AND day BETWEEN ? AND ?
+    UNION ALL
+    SELECT 
+        mf.UtmSource,
+        ISNULL(mf.UtmContent, ''),
+        O.Id,
+        O.TotalPrice,
+        CONVERT(DECIMAL(10, 2), (O.TotalPrice / 1.1)),
+        1,
+        CAST(O.CreateDate as DATE)
+    FROM [ORDER] O
+    INNER JOIN [OrderTermDetail] OTD ON OTD.OrderId = O.Id
+    INNER JOIN TERM T ON T.ID = OTD.TermId
+    INNER JOIN Payment PM ON PM.OrderId = OTD.OrderId
+    CROSS APPLY (
+        SELECT TOP 1 UtmSource, UtmContent
+        FROM MemberPrime..MemberForm
+        WHERE MemberId = T.MemberId
+        ORDER BY CreateDate DESC, Id DESC
+    ) mf
+    WHERE mf.UtmSource IN ({sources})
+      AND O.CreateDate >= ? AND O.CreateDate < DATEADD(day, 1, ?)
+      AND T.SalesType = 1
+      AND O.TotalPrice > 0
+      AND PM.Status = 1
+) orders
+GROUP BY GROUPING SETS (
+    (UtmSource, UtmContent),
+    (OrderDate, UtmSource),
+    (UtmSource),
+    ()
+)
+"""
+
+
+# *_ROLLUP sonuçlarındaki GroupingId değerleri
+# GROUPING_ID(UtmSource, UtmContent, Date): gruplanmayan sütunun biti 1 olur
+ROLLUP_SOURCE_CONTENT = 1
+ROLLUP_SOURCE_DAY = 2
+ROLLUP_SOURCE = 3
+ROLLUP_TOTAL = 7
+
+
+def rollup_level(df, grouping_id: int, columns: list):
+    """*_ROLLUP sonucundan tek bir gruplama seviyesinin satırlarını seçer"""
+    return df.loc[df["GroupingId"] == grouping_id, columns].reset_index(drop=True)
+
+
+@lru_cache(maxsize=None)
+def render_template(template: str) -> str:
+    """{sources} yer tutucusunu SOURCE_PARAM_SLOTS adet ? ile doldurur (şablon başına bir kez)"""
+    return template.format(sources=", ".join(["?"] * SOURCE_PARAM_SLOTS))
+
+
+def source_params(sources: list) -> tuple:
+    """
+    Source listesini sabit uzunlukta parametre demetine çevirir
+
+    Eksik yuvalar son source ile doldurulur (IN sonucunu değiştirmez);
+    boş listede yuvalar NULL olur ve hiçbir satır eşleşmez.
+
+    Raises:
+        ValueError: SOURCE_PARAM_SLOTS'tan fazla source verilirse
+    """
+    unique = list(dict.fromkeys(sources))
+    if len(unique) > SOURCE_PARAM_SLOTS:
+        raise ValueError(f"En fazla {SOURCE_PARAM_SLOTS} source seçilebilir ({len(unique)} verildi)")
+    
+    filler = unique[-1] if unique else None
+    return tuple(unique) + (filler,) * (SOURCE_PARAM_SLOTS - len(unique))
+
+
+def bind_sources(template: str, sources: list, *params) -> tuple:
+    """
+    Sorgu şablonunu ve parametrelerini hazırlar
+
+    Args:
+        template: {sources} içeren sorgu şablonu
+        sources: UTM source listesi
+        params: Source'lardan sonra gelen parametreler (tarih aralığı)
+
+    Returns:
+        tuple: (sorgu, parametreler)
+    """
+    return render_template(template), source_params(sources) + params
@@ -0,0 +1,211 @@
+"""
+Query Cache
+===========
+execute_query / execute_query_df sonuçları için process genelinde paylaşılan,
+bellek sınırlı LRU önbellek
+
+Anahtar (sorgu şablonunun hash'i, bağlı parametreler) ikilisidir. Süre
+parametrelerdeki tarihlere göre belirlenir: bugünden önce biten aralıklar
+uzun (QUERY_CACHE_HISTORIC_TTL_SECONDS), bugüne dokunan veya tarih
+içermeyen sorgular kısa (QUERY_CACHE_RECENT_TTL_SECONDS) süre saklanır.
+Toplam boyut QUERY_CACHE_MAX_MB'ı aşınca en uzun süredir kullanılmayan
+sonuçlar atılır.
+"""
+
+import hashlib
+import sys
+import threading
+import time
+import pandas as pd
+from collections import OrderedDict
+from datetime import date, datetime
+from config.cache import (
+    QUERY_CACHE_MAX_MB,
+    QUERY_CACHE_HISTORIC_TTL_SECONDS,
+    QUERY_CACHE_RECENT_TTL_SECONDS
+)
+
+
+def make_key(query: str, params=None) -> tuple:
+    """Önbellek anahtarı: (sorgu hash'i, parametreler)"""
+    return hashlib.sha1(query.encode("utf-8")).hexdigest(), tuple(params or ())
+
+
+def _param_days(params) -> list:
+    """Parametrelerdeki tarihler (gün olarak)"""
+    return [
+        value.date() if isinstance(value, datetime) else value
+        for value in params
+        if isinstance(value, date)
+    ]
+
+
+def ttl_for(params, today: date = None) -> float:
+    """
+    Parametrelere göre saklama süresi (saniye)
+
+    Tüm tarihler bugünden önceyse sonuç değişmez kabul edilir ve uzun süre
+    saklanır; bugüne dokunan veya tarih içermeyen sorgular kısa süre.
+    """
+    today = today or date.today()
+    days = _param_days(params)
+    if days and max(days) < today:
+        return QUERY_CACHE_HISTORIC_TTL_SECONDS
+    return QUERY_CACHE_RECENT_TTL_SECONDS
+
+
+def estimate_bytes(value) -> int:
+    """Sonucun yaklaşık bellek boyutu"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, list):
+        return sys.getsizeof(value) + sum(
+            sys.getsizeof(row) + sum(sys.getsizeof(item) for item in row.values())
+            if isinstance(row, dict) else sys.getsizeof(row)
+            for row in value
+        )
+    return sys.getsizeof(value)
+
+
+def _copy(value):
+    """
+    Önbellekteki sonucun bağımsız kopyası (saklarken ve okurken)
+
+    DataFrame verisi de kopyalanır; çağıranın yerinde yaptığı değişiklikler
+    (.loc atama, fillna(inplace=True) vb.) önbelleğe yansımaz.
+    """
+    if isinstance(value, pd.DataFrame):
+        return value.copy(deep=True)
+    if isinstance(value, list):
+        return [dict(row) if isinstance(row, dict) else row for row in value]
+    return value
+
+
+class QueryCache:
+    """
+    Thread-safe, bellek sınırlı, süreli LRU önbellek
+
+    Her giriş (değer, boyut, bitiş zamanı, parametre günleri) tutar;
+    parametre günleri gün bazlı geçersiz kılma için kullanılır.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0, "invalidations": 0}
+
+    def get(self, key: tuple):
+        """
+        Geçerli sonucu döner
+
+        Returns:
+            (True, değer) veya (False, None)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return False, None
+
+            value, size, expires_at, _ = entry
+            if time.monotonic() >= expires_at:
+                self._remove(key)
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return False, None
+
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return True, _copy(value)
+
+    def put(self, key: tuple, value, ttl: float):
+        """Sonucu saklar; tek başına sınırı aşan sonuç saklanmaz"""
+        size = estimate_bytes(value)
+        if size > self.max_bytes or ttl <= 0:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (_copy(value), size, time.monotonic() + ttl, _param_days(key[1]))
+            self._bytes += size
+
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._stats["evictions"] += 1
+
+    def _remove(self, key: tuple):
+        _, size, _, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def invalidate(self, predicate=None) -> int:
+        """
+        Girişleri siler
+
+        Args:
+            predicate: (anahtar, parametre günleri) -> bool; None ise tümü
+
+        Returns:
+            int: Silinen giriş sayısı
+        """
+        with self._lock:
+            keys = [
+                key for key, entry in self._entries.items()
+                if predicate is None or predicate(key, entry[3])
+            ]
+            for key in keys:
+                self._remove(key)
+            self._stats["invalidations"] += len(keys)
+            return len(keys)
+
+    def invalidate_from(self, day: date) -> int:
+        """Parametrelerinde day veya sonrası bulunan (ya da tarih içermeyen) sonuçları siler"""
+        return self.invalidate(lambda key, days: not days or max(days) >= day)
+
+    def stats(self) -> dict:
+        """
+        Önbellek metrikleri
+
+        Returns:
+            dict: {entries, bytes, max_bytes, hits, misses, expired, evictions, invalidations}
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                **self._stats
+            }
+
+
+# Process genelinde (tüm Streamlit oturumlarınca) paylaşılan önbellek
+_cache = QueryCache(QUERY_CACHE_MAX_MB * 1024 * 1024)
+
+
+def get_cache() -> QueryCache:
+    """Paylaşılan sorgu önbelleğini döner"""
+    return _cache
+
+
+def cached_query(query: str, params, loader):
+    """
+    Sonucu önbellekten döner; yoksa loader() ile çalıştırıp saklar
+
+    Args:
+        query: SQL sorgusu (anahtarın parçası)
+        params: Bağlı parametreler (anahtarın ve süre hesabının parçası)
+        loader: Argümansız fonksiyon, sorguyu çalıştırır
+
+    Hata durumunda önbelleğe yazılmaz.
+    """
+    key = make_key(query, params)
+    found, value = _cache.get(key)
+    if found:
+        return value
+
+    value = loader()
+    _cache.put(key, value, ttl_for(params or ()))
+    return value
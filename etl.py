@@ -0,0 +1,99 @@
+"""
+Marketing Dashboard - ETL
+=========================
+Günlük lead / ciro fact tablolarını (lead_daily, revenue_daily) artımlı günceller
+
+Her turda yalnızca watermark'tan sonra değişen günler ve son
+ETL_REPROCESS_DAYS gün yeniden hesaplanır; tüm iş veritabanında tek
+batch olarak çalışır. Tablolar için bkz. database/migrations/002_daily_facts.sql.
+
+Çalıştırma:
+    python etl.py                  # tek tur (cron için)
+    python etl.py --loop           # sürekli, ETL_INTERVAL_SECONDS aralıkla
+    python etl.py --rebuild        # fact tablolarını sıfırdan oluştur
+"""
+
+import argparse
+import time
+from config.database import ETL_REPROCESS_DAYS, ETL_INTERVAL_SECONDS
+from database.connection import execute_query, get_db_cursor
+from database.queries import LEAD_DAILY_ETL, REVENUE_DAILY_ETL
+
+
+# Fact tablosu -> artımlı güncelleme batch'i
+FACT_JOBS = {
+    "lead_daily": LEAD_DAILY_ETL,
+    "revenue_daily": REVENUE_DAILY_ETL,
+}
+
+
+def run_job(name: str, reprocess_days: int = ETL_REPROCESS_DAYS) -> dict:
+    """
+    Fact tablosunu watermark'tan itibaren günceller
+
+    Returns:
+        dict: {Days, Rows, Watermark} - yeniden hesaplanan gün, yazılan satır, yeni watermark
+    """
+    return execute_query(FACT_JOBS[name], (reprocess_days,), cache=False)[0]
+
+
+def reset_job(name: str):
+    """Fact tablosunu ve watermark'ını siler; sonraki tur tüm geçmişi yeniden hesaplar"""
+    if name not in FACT_JOBS:
+        raise ValueError(f"Bilinmeyen fact tablosu: {name}")
+    with get_db_cursor() as cursor:
+        cursor.execute(f"DELETE FROM dbo.{name}; DELETE FROM dbo.etl_watermark WHERE name = '{name}'")
+
+
+def run_once(names: list = None, reprocess_days: int = ETL_REPROCESS_DAYS) -> dict:
+    """
+    Fact tablolarını bir kez günceller
+
+    Returns:
+        dict: Fact tablosu -> run_job() sonucu veya hata mesajı
+    """
+    results = {}
+    for name in names or FACT_JOBS:
+        started = time.monotonic()
+        try:
+            result = run_job(name, reprocess_days)
+            results[name] = result
+            print(
+                f"✅ ETL {name}: {result['Days']} gün, {result['Rows']} satır "
+                f"({time.monotonic() - started:.1f} sn, watermark {result['Watermark']})"
+            )
+        except Exception as e:
+            results[name] = str(e)
+            print(f"❌ ETL {name} hatası: {e}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Günlük fact tablosu ETL")
+    parser.add_argument("--only", choices=list(FACT_JOBS), action="append", help="Yalnızca bu fact tablosu")
+    parser.add_argument("--reprocess-days", type=int, default=ETL_REPROCESS_DAYS, help="Her turda yeniden hesaplanan son gün sayısı")
+    parser.add_argument("--loop", action="store_true", help="Tek tur yerine --interval aralıkla sürekli çalış")
+    parser.add_argument("--interval", type=int, default=ETL_INTERVAL_SECONDS, help="Tur aralığı (saniye)")
+    parser.add_argument("--rebuild", action="store_true", help="Fact tablolarını sıfırlayıp tüm geçmişi yeniden hesapla")
+    args = parser.parse_args()
+
+    names = args.only or list(FACT_JOBS)
+
+    if args.rebuild:
+        for name in names:
+            reset_job(name)
+            print(f"🔄 {name} sıfırlandı")
+
+    try:
+        while True:
+            started = time.monotonic()
+            run_once(names, args.reprocess_days)
+            if not args.loop:
+                break
+            time.sleep(max(0, args.interval - (time.monotonic() - started)))
+    except KeyboardInterrupt:
+        print("\n👋 ETL durduruldu")
+
+
+if __name__ == "__main__":
+    main()
@@ -23,6 +23,12 @@ def main():
     print(f"📊 Uygulama: {app_path}")
     print("-" * 50)
     
+    # Hızlı seçim aralıklarını önbellekte sıcak tutan worker (--no-prefetch ile kapatılır)
+    prefetch = None
+    if "--no-prefetch" not in sys.argv:
+        prefetch = subprocess.Popen([sys.executable, "-m", "services.prefetch"])
+        print("🔄 Prefetch worker başlatıldı")
+    
     try:
         subprocess.run([
             sys.executable, "-m", "streamlit", "run",
@@ -35,6 +41,10 @@ def main():
     except Exception as e:
         print(f"❌ Hata: {e}")
         sys.exit(1)
+    finally:
+        if prefetch is not None:
+            prefetch.terminate()
+            prefetch.wait()
 
 
 if __name__ == "__main__":
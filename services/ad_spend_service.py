@@ -4,57 +4,258 @@ Ad Spend Service
 Tüm reklam platformlarından harcama verilerini birleştirir
 """
 
+import time
 import pandas as pd
-from datetime import date
-from connectors import google_ads, facebook_ads, apple_ads
-from config.database import SUPPORTED_PLATFORMS
+from contextlib import contextmanager
+from contextvars import ContextVar
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from datetime import date, timedelta
+from connectors import registry, rate_limit
+from config.database import (
+    SUPPORTED_PLATFORMS,
+    UTM_SOURCE_MAPPING,
+    PLATFORM_FETCH_TIMEOUTS,
+    PLATFORM_FETCH_MAX_WORKERS,
+    PLATFORM_FETCH_RETRIES
+)
+from services.fetch_context import cached_fetch
+from services import spend_cache
+
+
+# Varsayılan süre sınırı (PLATFORM_FETCH_TIMEOUTS'ta olmayan platformlar için)
+DEFAULT_FETCH_TIMEOUT = 30
+
+# Aktif süre sınırı değişikliği (saniye); None ise PLATFORM_FETCH_TIMEOUTS geçerli
+_timeout_override = ContextVar("platform_fetch_timeout", default=None)
+
+# Tüm oturumların paylaştığı platform çekim havuzu
+_executor = ThreadPoolExecutor(
+    max_workers=PLATFORM_FETCH_MAX_WORKERS,
+    thread_name_prefix="ad-fetch"
+)
+
+
+def _empty_platform_frame() -> pd.DataFrame:
+    return pd.DataFrame(columns=[
+        "date", "source", "campaign_id", "campaign_name",
+        "utm_content", "spend", "impressions", "clicks", "conversions"
+    ])
+
+
+def _split_range(start_date: date, end_date: date, max_days: int) -> list:
+    """Aralığı connector'ın kabul ettiği en uzun (başlangıç, bitiş) pencerelerine böler"""
+    if not max_days:
+        return [(start_date, end_date)]
+    
+    windows = []
+    window_start = start_date
+    while window_start <= end_date:
+        window_end = min(window_start + timedelta(days=max_days - 1), end_date)
+        windows.append((window_start, window_end))
+        window_start = window_end + timedelta(days=1)
+    return windows
+
+
+def _fetch_from_connector(connector, start_date: date, end_date: date, job: dict) -> pd.DataFrame:
+    """
+    Connector'dan reklam verisini çeker
+
+    Tüm platformlar için ortak: aralık max_range_days pencerelerine bölünür,
+    başarısız pencere PLATFORM_FETCH_RETRIES kez yeniden denenir ve deneme
+    sayısı ile satır sayısı iş kaydına yazılır.
+
+    Kısıtlama hataları connector içinde rate_limit.call_with_backoff ile
+    beklenir; buradaki yeniden deneme yalnızca işin süre sınırı içinde
+    yapılır. Süresi dolup bırakılan iş yeni deneme veya pencere başlatmaz.
+    İşin süre sınırı rate_limit.deadline ile connector'a da geçirilir; kova
+    beklemesi ve kota yeniden denemeleri sınırı aşmadan hata ile biter.
+    """
+    max_days = registry.get_capabilities(connector)["max_range_days"]
+    frames = []
+    
+    for window_start, window_end in _split_range(start_date, end_date, max_days):
+        attempt = 0
+        while True:
+            if job["abandoned"]:
+                raise RuntimeError(f"{connector.PLATFORM} çekimi süre sınırı aşıldığı için bırakıldı")
+            
+            job["attempts"] += 1
+            try:
+                with rate_limit.deadline(job["deadline"]):
+                    df = connector.fetch(window_start, window_end)
+                error = None
+            except Exception as e:
+                df = None
+                error = e
+            
+            if df is not None and not registry.is_failed_result(df):
+                break
+            
+            delay = 2 ** attempt
+            if attempt >= PLATFORM_FETCH_RETRIES or time.monotonic() + delay >= job["deadline"]:
+                raise error or RuntimeError(f"{connector.PLATFORM} verisi {job['attempts']} denemede alınamadı")
+            time.sleep(delay)
+            attempt += 1
+        
+        job["rows"] += len(df)
+        if not df.empty:
+            frames.append(df)
+    
+    if not frames:
+        return _empty_platform_frame()
+    return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+
+@contextmanager
+def fetch_timeout(seconds: float):
+    """
+    Bu context'te gönderilen platform işlerinin süre sınırını değiştirir
+
+    Render'lar PLATFORM_FETCH_TIMEOUTS ile sınırlıdır; uzun aralıkların
+    asenkron raporları (ör. Facebook AdReportRun) prefetch worker'da bu
+    context ile daha uzun süre sınırıyla çekilip önbelleğe yazılır.
+    """
+    token = _timeout_override.set(seconds)
+    try:
+        yield
+    finally:
+        _timeout_override.reset(token)
+
+
+def _submit_platform_job(platform: str, start_date: date, end_date: date) -> dict:
+    """
+    Platform çekimini havuza gönderir ve iş kaydını döner
+
+    Aktif bir fetch_context varsa iş (platform, start_date, end_date) anahtarıyla
+    saklanır; aynı render içindeki tüm çağrılar aynı işi ve sonucu paylaşır.
+    """
+    def submit():
+        connector = registry.get_connector(platform)
+        timeout = _timeout_override.get() or PLATFORM_FETCH_TIMEOUTS.get(platform, DEFAULT_FETCH_TIMEOUT)
+        started = time.monotonic()
+        job = {
+            "started": started,
+            "deadline": started + timeout,
+            "timeout": timeout,
+            "status": None,
+            "data": None,
+            "error": None,
+            "seconds": None,
+            "attempts": 0,
+            "rows": 0,
+            "abandoned": False,
+        }
+        
+        def fetcher(fetch_start: date, fetch_end: date) -> pd.DataFrame:
+            return _fetch_from_connector(connector, fetch_start, fetch_end, job)
+        
+        job["future"] = _executor.submit(
+            spend_cache.get_platform_data, platform, start_date, end_date, fetcher
+        )
+        return job
+
+    return cached_fetch(("ad_spend", platform, start_date, end_date), submit)
+
+
+def _resolve_platform_job(platform: str, job: dict) -> dict:
+    """
+    İşin sonucunu süre sınırına kadar bekler ve durumunu işler
+
+    Durum bir kez belirlenir: süresi dolan platform, çekim sonradan bitse bile
+    o render boyunca dışarıda kalır ve tüm toplamlar tutarlı olur.
+    """
+    if job["status"] is not None:
+        return job
+    
+    display_name = UTM_SOURCE_MAPPING.get(platform, platform)
+    remaining = max(0.0, job["deadline"] - time.monotonic())
+    
+    try:
+        df = job["future"].result(timeout=remaining)
+        job["data"] = df
+        job["status"] = "ok" if not df.empty else "empty"
+    except FutureTimeoutError:
+        job["status"] = "timeout"
+        # Sonuç artık beklenmiyor: kuyruktaki iş iptal edilir, çalışan iş yeniden denemez
+        job["abandoned"] = True
+        job["future"].cancel()
+        print(f"⏱️ {display_name} {job['timeout']} sn içinde yanıt vermedi, veri olmadan devam ediliyor")
+    except Exception as e:
+        job["status"] = "error"
+        job["error"] = str(e)
+        print(f"⚠️ {display_name} verisi alınamadı: {e}")
+    
+    job["seconds"] = round(time.monotonic() - job["started"], 2)
+    return job
+
+
+def fetch_platform_data(platform: str, start_date: date, end_date: date) -> pd.DataFrame:
+    """
+    Tek bir platformun verisini çeker
+
+    Önce disk önbelleğine bakılır, yalnızca eksik ve kesinleşmemiş günler
+    API'den çekilir. Aktif bir fetch_context varsa (platform, start_date, end_date)
+    anahtarıyla ayrıca bellekte tutulur; aynı render içinde platform bir kez çekilir.
+    Süre sınırı aşılırsa veya hata olursa boş DataFrame döner.
+    """
+    job = _resolve_platform_job(platform, _submit_platform_job(platform, start_date, end_date))
+    return job["data"] if job["data"] is not None else _empty_platform_frame()
 
 
 def get_all_platform_data(start_date: date, end_date: date) -> pd.DataFrame:
     """
-    Tüm platformlardan reklam verilerini çeker ve birleştirir
+    Tüm platformlardan reklam verilerini paralel çeker ve birleştirir
+
+    Sayfa gecikmesi platformların toplamı değil, süre sınırı içindeki en
+    yavaş platform kadardır.
     
     Returns:
         DataFrame: Birleştirilmiş platform verileri
     """
-    all_data = []
+    # Önce tüm işleri gönder, sonra bekle: platformlar eşzamanlı çalışır
+    jobs = {
+        connector.PLATFORM: _submit_platform_job(connector.PLATFORM, start_date, end_date)
+        for connector in registry.get_connectors(SUPPORTED_PLATFORMS)
+    }
     
-    # Google Ads
-    if "google" in SUPPORTED_PLATFORMS:
-        try:
-            google_df = google_ads.fetch_campaign_data(start_date, end_date)
-            if not google_df.empty:
-                all_data.append(google_df)
-        except Exception as e:
-            print(f"⚠️ Google Ads verisi alınamadı: {e}")
-    
-    # Facebook Ads
-    if "facebook" in SUPPORTED_PLATFORMS:
-        try:
-            facebook_df = facebook_ads.fetch_campaign_data(start_date, end_date)
-            if not facebook_df.empty:
-                all_data.append(facebook_df)
-        except Exception as e:
-            print(f"⚠️ Facebook Ads verisi alınamadı: {e}")
-    
-    # Apple Ads (placeholder)
-    if "apple" in SUPPORTED_PLATFORMS:
-        try:
-            apple_df = apple_ads.fetch_campaign_data(start_date, end_date)
-            if not apple_df.empty:
-                all_data.append(apple_df)
-        except Exception as e:
-            print(f"⚠️ Apple Ads verisi alınamadı: {e}")
+    all_data = []
+    for platform, job in jobs.items():
+        _resolve_platform_job(platform, job)
+        if job["status"] == "ok":
+            all_data.append(job["data"])
     
     if not all_data:
-        return pd.DataFrame(columns=[
-            "date", "source", "campaign_id", "campaign_name",
-            "utm_content", "spend", "impressions", "clicks", "conversions"
-        ])
+        return _empty_platform_frame()
     
     return pd.concat(all_data, ignore_index=True)
 
 
+def get_platform_status(start_date: date, end_date: date) -> dict:
+    """
+    Platform bazlı çekim durumunu döner
+
+    Aynı fetch_context içinde çağrıldığında render'ın kullandığı işlerin
+    durumunu raporlar.
+
+    Returns:
+        dict: {"google": {"status": "ok", "seconds": 1.2, "error": None, "attempts": 1, "rows": 840}, ...}
+              status: "ok", "empty", "timeout" veya "error"
+              attempts/rows: API'ye giden deneme ve gelen satır sayısı (önbellekten gelen günler hariç)
+    """
+    status = {}
+    for connector in registry.get_connectors(SUPPORTED_PLATFORMS):
+        platform = connector.PLATFORM
+        job = _resolve_platform_job(platform, _submit_platform_job(platform, start_date, end_date))
+        status[platform] = {
+            "status": job["status"],
+            "seconds": job["seconds"],
+            "error": job["error"],
+            "attempts": job["attempts"],
+            "rows": job["rows"],
+        }
+    return status
+
+
 def get_total_spend(start_date: date, end_date: date) -> float:
     """Tüm platformların toplam harcaması"""
     df = get_all_platform_data(start_date, end_date)
@@ -0,0 +1,69 @@
+"""
+Cache Control
+=============
+Process içi önbelleklerin tek noktadan geçersiz kılınması
+
+Sorgu önbelleği (database/query_cache.py) doğrudan temizlenir; diğer
+modüller kendi önbelleklerini register_invalidation_hook ile bağlar.
+"Verileri Yenile" butonu invalidate_all() çağırır.
+"""
+
+from datetime import date
+from database.query_cache import get_cache
+
+
+# Kayıtlı geçersiz kılma fonksiyonları: hook(since) - since None ise tümü
+_hooks = []
+
+
+def register_invalidation_hook(hook):
+    """
+    Geçersiz kılmada çağrılacak fonksiyonu kaydeder
+
+    Args:
+        hook: hook(since: date | None) - since verilirse yalnızca o gün ve sonrasına dokunan girişler
+    """
+    if hook not in _hooks:
+        _hooks.append(hook)
+    return hook
+
+
+def _run_hooks(since):
+    for hook in list(_hooks):
+        try:
+            hook(since)
+        except Exception as e:
+            print(f"⚠️ Önbellek temizleme hatası ({getattr(hook, '__name__', hook)}): {e}")
+
+
+def invalidate_all() -> int:
+    """
+    Tüm process içi önbellekleri temizler
+
+    Returns:
+        int: Silinen sorgu sonucu sayısı
+    """
+    removed = get_cache().invalidate()
+    _run_hooks(None)
+    print(f"🔄 Önbellek temizlendi ({removed} sorgu sonucu)")
+    return removed
+
+
+def invalidate_since(day: date = None) -> int:
+    """
+    day (varsayılan: bugün) ve sonrasına dokunan sonuçları temizler
+
+    Geçmişte biten aralıkların sonuçları korunur.
+
+    Returns:
+        int: Silinen sorgu sonucu sayısı
+    """
+    day = day or date.today()
+    removed = get_cache().invalidate_from(day)
+    _run_hooks(day)
+    return removed
+
+
+def get_cache_stats() -> dict:
+    """Sorgu önbelleği metrikleri (bkz. QueryCache.stats)"""
+    return get_cache().stats()
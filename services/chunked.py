@@ -0,0 +1,104 @@
+"""
+Chunked
+=======
+iter_query() parçaları üzerinde sabit bellekle çalışan yardımcılar
+
+Parçalar sırayla tüketilir; bellekte aynı anda yalnızca bir parça ve
+birikmiş ara sonuç (gruplu toplamlar) tutulur.
+"""
+
+import csv
+import pandas as pd
+
+
+def aggregate_chunks(chunks, keys: list, sums: dict = None, counts: str = None,
+                     distinct: dict = None) -> pd.DataFrame:
+    """
+    Parçaları gruplayıp toplar
+
+    Her parça kendi içinde gruplanır, kısmi toplamlar birikir ve sonunda
+    tekrar gruplanarak birleştirilir. Yalnızca toplanabilir ölçüler
+    (sum, count) desteklenir; ortalama gibi türetilmiş değerler sonuç
+    üzerinden hesaplanmalıdır. Tekil sayımlar parçalar arasında
+    toplanamaz; bunlar için tekil (keys, değer) çiftleri biriktirilir.
+
+    Args:
+        chunks: DataFrame parçaları (ör. iter_query çıktısı)
+        keys: Gruplama sütunları
+        sums: Kaynak sütun -> sonuç sütunu (toplam)
+        counts: Satır sayısının yazılacağı sonuç sütunu
+        distinct: Sonuç sütunu -> kaynak sütun (tekil değer sayısı, ör. {"OrderCount": "OrderId"})
+
+    Returns:
+        DataFrame: keys + sums değerleri + counts sütunu + distinct sütunları
+    """
+    sums = sums or {}
+    distinct = distinct or {}
+    columns = list(keys) + list(sums.values()) + ([counts] if counts else []) + list(distinct)
+    levels = list(range(len(keys)))
+    partials = []
+    seen = {column: [] for column in distinct}
+
+    for chunk in chunks:
+        grouped = chunk.groupby(keys, dropna=False)
+        parts = []
+        if sums:
+            parts.append(grouped[list(sums)].sum().rename(columns=sums))
+        if counts:
+            parts.append(grouped.size().rename(counts))
+        if parts:
+            partials.append(pd.concat(parts, axis=1))
+
+        for column, source in distinct.items():
+            seen[column].append(chunk[list(keys) + [source]].drop_duplicates())
+            if len(seen[column]) >= 16:
+                seen[column] = [pd.concat(seen[column]).drop_duplicates()]
+
+        # Kısmi sonuçlar büyümesin diye ara ara sıkıştırılır
+        if len(partials) >= 16:
+            partials = [pd.concat(partials).groupby(level=levels, dropna=False).sum()]
+
+    if not partials and not any(seen.values()):
+        return pd.DataFrame(columns=columns)
+
+    parts = []
+    if partials:
+        parts.append(pd.concat(partials).groupby(level=levels, dropna=False).sum())
+    for column, frames in seen.items():
+        pairs = pd.concat(frames).drop_duplicates()
+        parts.append(pairs.groupby(keys, dropna=False)[distinct[column]].nunique().rename(column))
+
+    result = pd.concat(parts, axis=1) if len(parts) > 1 else parts[0]
+    return result.reset_index()[columns]
+
+
+def write_csv_chunks(chunks, target, columns: list = None) -> int:
+    """
+    Parçaları sırayla CSV'ye yazar (başlık bir kez)
+
+    Args:
+        chunks: DataFrame parçaları
+        target: Dosya yolu veya yazılabilir metin dosyası nesnesi
+        columns: Yazılacak sütunlar (varsayılan: ilk parçanın sütunları)
+
+    Returns:
+        int: Yazılan satır sayısı
+    """
+    if isinstance(target, str):
+        with open(target, "w", newline="", encoding="utf-8") as f:
+            return write_csv_chunks(chunks, f, columns)
+
+    rows = 0
+    header = True
+    for chunk in chunks:
+        if columns is not None:
+            chunk = chunk[columns]
+        chunk.to_csv(target, header=header, index=False, quoting=csv.QUOTE_MINIMAL)
+        header = False
+        rows += len(chunk)
+
+    if header and columns:
+        # Boş sonuçta da başlık yazılır
+        pd.DataFrame(columns=columns).to_csv(target, index=False)
+
+    return rows
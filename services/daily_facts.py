@@ -0,0 +1,148 @@
+"""
+Daily Facts
+===========
+etl.py'nin güncel tuttuğu lead_daily / revenue_daily tablolarından
+*_ROLLUP sonucuyla aynı biçimde özet üretir
+
+Watermark gününden önceki günler fact tablosundan, watermark günü ve
+sonrası canlı tablodan okunur ve tek sorguda birleştirilir. Fact satırları
+üye / sipariş anahtarını taşıdığı için her seviyede (source x content,
+source x gün, source, toplam) COUNT(DISTINCT) yeniden hesaplanır; sayımlar
+canlı *_ROLLUP ile aynıdır. 365 günlük aralık da yalnızca birkaç günlük
+canlı veri tarar.
+"""
+
+import pandas as pd
+from datetime import date, datetime, timedelta
+from config.database import USE_DAILY_FACTS
+from database.connection import execute_query, execute_query_df
+from database.queries import (
+    FACT_WATERMARK_QUERY,
+    LEAD_DAILY_FACTS,
+    LEAD_DAILY_LIVE,
+    LEAD_DAILY_ROLLUP,
+    REVENUE_DAILY_FACTS,
+    REVENUE_DAILY_LIVE,
+    REVENUE_DAILY_ROLLUP,
+    bind_sources,
+    source_params
+)
+from services.fetch_context import cached_fetch
+
+# Fact tablosu okunamadığında uyarı process başına bir kez yazılır
+_warned = False
+
+
+def get_watermark(name: str):
+    """
+    Fact tablosunun işlendiği son an (etl_watermark), yoksa None
+
+    Tablo henüz oluşturulmamışsa veya okunamıyorsa None döner; servisler
+    bu durumda canlı sorguya döner.
+    """
+    global _warned
+
+    def load():
+        rows = execute_query(FACT_WATERMARK_QUERY, (name,))
+        return rows[0]["watermark"] if rows else None
+
+    try:
+        return cached_fetch(("fact_watermark", name), load)
+    except Exception as e:
+        if not _warned:
+            print(f"⚠️ Günlük fact tabloları okunamadı, canlı sorgu kullanılacak: {e}")
+            _warned = True
+        return None
+
+
+def split_range(watermark: datetime, start_date: date, end_date: date) -> tuple:
+    """
+    Aralığı fact tablosundan ve canlı tablodan okunacak parçalara ayırır
+
+    Watermark gününden önceki günler tamamlanmıştır; watermark günü henüz
+    sürdüğü için canlı okunur.
+
+    Returns:
+        tuple: ((fact_start, fact_end) veya None, (live_start, live_end) veya None)
+    """
+    settled_until = watermark.date() - timedelta(days=1)
+
+    fact_range = (start_date, min(end_date, settled_until)) if start_date <= settled_until else None
+    live_start = max(start_date, settled_until + timedelta(days=1))
+    live_range = (live_start, end_date) if live_start <= end_date else None
+    return fact_range, live_range
+
+
+def _load_rows(facts_query: str, live_query: str, name: str,
+               start_date: date, end_date: date, sources: list) -> pd.DataFrame:
+    """Fact + canlı satırlar; fact tablosu kullanılamıyorsa tüm aralık canlı tablodan"""
+    watermark = get_watermark(name) if USE_DAILY_FACTS else None
+    if watermark is not None:
+        fact_range, live_range = split_range(watermark, start_date, end_date)
+    else:
+        fact_range, live_range = None, (start_date, end_date)
+
+    frames = []
+    if fact_range is not None:
+        frames.append(execute_query_df(*bind_sources(facts_query, sources, *fact_range)))
+    if live_range is not None:
+        frames.append(execute_query_df(*bind_sources(live_query, sources, *live_range)))
+
+    return pd.concat([frame for frame in frames if not frame.empty] or frames[:1], ignore_index=True)
+
+
+def lead_rows(start_date: date, end_date: date, sources: list) -> pd.DataFrame:
+    """
+    (source, content, gün, üye) lead satırları: fact tablosundan, yoksa canlı tablodan
+
+    Returns:
+        DataFrame: UtmSource, UtmContent, Date, MemberId
+    """
+    return _load_rows(LEAD_DAILY_FACTS, LEAD_DAILY_LIVE, "lead_daily", start_date, end_date, sources)
+
+
+def revenue_rows(start_date: date, end_date: date, sources: list) -> pd.DataFrame:
+    """
+    (source, content, gün, sipariş) ciro satırları: fact tablosundan, yoksa canlı tablodan
+
+    Returns:
+        DataFrame: UtmSource, UtmContent, Date, OrderId, TotalRevenue, NetRevenue, LineCount
+    """
+    return _load_rows(REVENUE_DAILY_FACTS, REVENUE_DAILY_LIVE, "revenue_daily", start_date, end_date, sources)
+
+
+def _load_rollup(rollup_query: str, name: str, start_date: date, end_date: date, sources: list):
+    """
+    *_DAILY_ROLLUP sorgusunu fact ve canlı aralıklarıyla çalıştırır
+
+    Fact tablosu kullanılamıyorsa veya aralığın tamamı canlıysa None döner;
+    bu durumda tek geçişli *_ROLLUP sorgusu aynı maliyettedir.
+    """
+    watermark = get_watermark(name) if USE_DAILY_FACTS else None
+    if watermark is None:
+        return None
+
+    fact_range, live_range = split_range(watermark, start_date, end_date)
+    if fact_range is None:
+        return None
+    if live_range is None:
+        # Canlı parça boş aralıkla (başlangıç > bitiş) hiçbir satır döndürmez
+        live_range = (end_date + timedelta(days=1), end_date)
+
+    # {sources} iki kez geçer: her parça kendi source ve tarih parametrelerini alır
+    query, params = bind_sources(rollup_query, sources, *fact_range)
+    return execute_query_df(query, params + source_params(sources) + tuple(live_range))
+
+
+def lead_rollup(start_date: date, end_date: date, sources: list):
+    """
+    LEAD_ROLLUP biçiminde lead özeti (fact tablosu + canlı); kullanılamıyorsa None
+
+    FirstLeadDate / LastLeadDate gün çözünürlüğündedir.
+    """
+    return _load_rollup(LEAD_DAILY_ROLLUP, "lead_daily", start_date, end_date, sources)
+
+
+def revenue_rollup(start_date: date, end_date: date, sources: list):
+    """REVENUE_ROLLUP biçiminde ciro özeti (fact tablosu + canlı); kullanılamıyorsa None"""
+    return _load_rollup(REVENUE_DAILY_ROLLUP, "revenue_daily", start_date, end_date, sources)
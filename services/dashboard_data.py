@@ -0,0 +1,187 @@
+"""
+Dashboard Data
+==============
+Dashboard sayfasının ihtiyaç duyduğu tüm verinin tek noktadan yüklenmesi
+
+Sonuç (aralık, platformlar) anahtarıyla snapshot olarak saklanır; prefetch
+worker standart aralıkları önceden hesaplar, sayfa bu aralıklarda yalnızca
+snapshot okur.
+
+Stale-while-revalidate: eski snapshot hemen döndürülür, yenilemesi arka
+planda çalışır; aynı anahtar için process genelinde tek yenileme yapılır.
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date, datetime
+from config.cache import (
+    SNAPSHOT_MAX_AGE_SECONDS,
+    SNAPSHOT_STALE_MAX_AGE_SECONDS,
+    SNAPSHOT_REFRESH_WORKERS
+)
+from services.metrics_service import (
+    calculate_overall_metrics,
+    calculate_metrics_by_source,
+    calculate_metrics_by_content
+)
+from services.ad_spend_service import get_daily_spend, get_platform_status
+from services.lead_service import get_lead_daily_trend
+from services.revenue_service import get_revenue_daily_trend
+from services.fetch_context import fetch_context
+from services import snapshot_store
+
+
+# Tüm oturumların paylaştığı arka plan yenileme havuzu ve süren yenilemeler
+_refresh_executor = ThreadPoolExecutor(
+    max_workers=SNAPSHOT_REFRESH_WORKERS,
+    thread_name_prefix="snapshot-refresh"
+)
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def load_dashboard_data(start_date: date, end_date: date, platforms: list) -> dict:
+    """
+    Dashboard verisini kaynaklardan (API + veritabanı) hesaplar
+
+    Returns:
+        dict: {
+            overall_metrics, metrics_by_source, content_metrics, platform_status,
+            daily_spend, daily_leads, daily_revenue, fetched_at
+        }
+    """
+    with fetch_context():
+        return {
+            "overall_metrics": calculate_overall_metrics(start_date, end_date),
+            "metrics_by_source": calculate_metrics_by_source(start_date, end_date),
+            "content_metrics": calculate_metrics_by_content(start_date, end_date),
+            "platform_status": get_platform_status(start_date, end_date),
+            "daily_spend": get_daily_spend(start_date, end_date),
+            "daily_leads": get_lead_daily_trend(start_date, end_date, platforms),
+            "daily_revenue": get_revenue_daily_trend(start_date, end_date, platforms),
+            "fetched_at": datetime.now()
+        }
+
+
+def is_complete(data: dict) -> bool:
+    """Tüm platformlar başarıyla yanıt verdi mi (eksik veri snapshot'a yazılmaz)"""
+    return all(
+        status["status"] in ("ok", "empty")
+        for status in data["platform_status"].values()
+    )
+
+
+def refresh_dashboard_data(start_date: date, end_date: date, platforms: list) -> dict:
+    """Veriyi kaynaklardan yeniden hesaplar ve eksiksizse snapshot'a yazar"""
+    data = load_dashboard_data(start_date, end_date, platforms)
+    if is_complete(data):
+        snapshot_store.write_snapshot(snapshot_store.snapshot_key(start_date, end_date, platforms), data)
+    return data
+
+
+def get_dashboard_data(start_date: date, end_date: date, platforms: list,
+                       max_age_seconds: float = SNAPSHOT_MAX_AGE_SECONDS) -> dict:
+    """
+    Dashboard verisini döner
+
+    max_age_seconds'tan yeni snapshot varsa kaynaklara gidilmez; yoksa
+    veri yeniden hesaplanıp snapshot güncellenir.
+    """
+    key = snapshot_store.snapshot_key(start_date, end_date, platforms)
+    snapshot = snapshot_store.read_snapshot(key)
+    if snapshot is not None and snapshot_age_seconds(snapshot) <= max_age_seconds:
+        return snapshot
+
+    return refresh_dashboard_data(start_date, end_date, platforms)
+
+
+def snapshot_age_seconds(data: dict) -> float:
+    """Verinin hesaplanmasından bu yana geçen süre (saniye)"""
+    return (datetime.now() - data["fetched_at"]).total_seconds()
+
+
+def refresh_in_background(start_date: date, end_date: date, platforms: list):
+    """
+    Yenilemeyi arka planda başlatır
+
+    Aynı (aralık, platformlar) için süren bir yenileme varsa yenisi
+    başlatılmaz, mevcut Future döner.
+
+    Returns:
+        Future: Sonucu refresh_dashboard_data() dict'i
+    """
+    key = snapshot_store.snapshot_key(start_date, end_date, platforms)
+    with _inflight_lock:
+        future = _inflight.get(key)
+        if future is None:
+            future = _refresh_executor.submit(refresh_dashboard_data, start_date, end_date, platforms)
+            _inflight[key] = future
+
+    def _done(finished):
+        with _inflight_lock:
+            if _inflight.get(key) is finished:
+                del _inflight[key]
+
+    future.add_done_callback(_done)
+    return future
+
+
+def _refresh_inline(start_date: date, end_date: date, platforms: list) -> dict:
+    """
+    Yenilemeyi çağıran thread'de yapar
+
+    Snapshot'ı olmayan aralıkta kullanıcı zaten bekler; bu bekleme SWR
+    havuzunun worker'larını tutmaz. Aynı anahtar için çalışmakta olan bir
+    yenileme varsa ona katılınır, havuzda sırada bekleyen yenileme beklenmez.
+    Süren yenileme olarak kaydedilir; arka plan istekleri bu sonuca katılır.
+    """
+    key = snapshot_store.snapshot_key(start_date, end_date, platforms)
+    with _inflight_lock:
+        running = _inflight.get(key)
+        if running is None:
+            future = Future()
+            future.set_running_or_notify_cancel()
+            _inflight[key] = future
+        else:
+            future = None
+
+    if running is not None and running.running():
+        return running.result()
+
+    try:
+        data = refresh_dashboard_data(start_date, end_date, platforms)
+        if future is not None:
+            future.set_result(data)
+        return data
+    except Exception as e:
+        if future is not None:
+            future.set_exception(e)
+        raise
+    finally:
+        if future is not None:
+            with _inflight_lock:
+                if _inflight.get(key) is future:
+                    del _inflight[key]
+
+
+def get_dashboard_data_swr(start_date: date, end_date: date, platforms: list) -> tuple:
+    """
+    Dashboard verisini stale-while-revalidate ile döner
+
+    - Snapshot SNAPSHOT_MAX_AGE_SECONDS'tan yeniyse: snapshot, yenileme yok
+    - SNAPSHOT_STALE_MAX_AGE_SECONDS'tan yeniyse: snapshot hemen, yenileme arka planda
+    - Snapshot yoksa veya çok eskiyse: yeni veri bu thread'de hesaplanır (çalışan yenileme varsa ona katılır)
+
+    Returns:
+        tuple: (data, Future veya None) - Future tamamlandığında güncel veri hazırdır
+    """
+    key = snapshot_store.snapshot_key(start_date, end_date, platforms)
+    snapshot = snapshot_store.read_snapshot(key)
+
+    if snapshot is None or snapshot_age_seconds(snapshot) > SNAPSHOT_STALE_MAX_AGE_SECONDS:
+        return _refresh_inline(start_date, end_date, platforms), None
+
+    if snapshot_age_seconds(snapshot) <= SNAPSHOT_MAX_AGE_SECONDS:
+        return snapshot, None
+
+    return snapshot, refresh_in_background(start_date, end_date, platforms)
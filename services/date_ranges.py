@@ -0,0 +1,38 @@
+"""
+Date Ranges
+===========
+Dashboard'un hızlı seçim tarih aralıkları
+
+Filtre bileşeni ve prefetch worker aynı tanımı kullanır; böylece
+worker'ın ısıttığı aralıklar sayfadaki seçeneklerle birebir aynıdır.
+"""
+
+from datetime import date, timedelta
+
+
+# Hızlı seçim etiketi -> gün sayısı (None: ayın başından bugüne)
+QUICK_RANGES = {
+    "Son 7 gün": 7,
+    "Son 30 gün": 30,
+    "Son 90 gün": 90,
+    "Bu Ay": None,
+}
+
+
+def quick_range(label: str, today: date = None) -> tuple:
+    """
+    Hızlı seçim etiketinin tarih aralığını döner
+
+    Returns:
+        tuple: (start_date, end_date)
+    """
+    today = today or date.today()
+    days = QUICK_RANGES[label]
+    if days is None:
+        return today.replace(day=1), today
+    return today - timedelta(days=days), today
+
+
+def quick_ranges(today: date = None) -> dict:
+    """Tüm hızlı seçim aralıkları: etiket -> (start_date, end_date)"""
+    return {label: quick_range(label, today) for label in QUICK_RANGES}
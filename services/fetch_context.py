@@ -0,0 +1,57 @@
+"""
+Fetch Context
+=============
+Tek bir sayfa render'ı boyunca paylaşılan veri çekme önbelleği
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+# Aktif render'ın önbelleği (Streamlit her oturumu kendi thread'inde çalıştırır)
+_current_store = ContextVar("fetch_context_store", default=None)
+
+
+@contextmanager
+def fetch_context():
+    """
+    Render süresince aynı anahtarla yapılan veri çekmelerini tekilleştirir
+
+    İç içe kullanıldığında dıştaki context paylaşılır, böylece
+    get_dashboard_summary gibi toplu çağrılar da aynı önbelleği kullanır.
+
+    Yields:
+        dict: Anahtar -> sonuç önbelleği
+    """
+    store = _current_store.get()
+    if store is not None:
+        yield store
+        return
+
+    store = {}
+    token = _current_store.set(store)
+    try:
+        yield store
+    finally:
+        _current_store.reset(token)
+
+
+def cached_fetch(key: tuple, loader):
+    """
+    Aktif context varsa loader sonucunu key ile saklar ve tekrar kullanır
+
+    Args:
+        key: Önbellek anahtarı, örn. ("ad_spend", "google", start_date, end_date)
+        loader: Argümansız veri çekme fonksiyonu
+
+    Returns:
+        loader() sonucu (context yoksa her çağrıda yeniden çalıştırılır)
+    """
+    store = _current_store.get()
+    if store is None:
+        return loader()
+
+    # Hata durumunda önbelleğe yazılmaz, bir sonraki çağrı yeniden dener
+    if key not in store:
+        store[key] = loader()
+    return store[key]
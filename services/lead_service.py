@@ -6,14 +6,21 @@ MemberForm tablosundan lead verilerini çeker
 
 import pandas as pd
 from datetime import date
-from database.connection import execute_query
+from database.connection import execute_query_df, iter_query
 from database.queries import (
     LEAD_QUERY,
-    LEAD_COUNT_BY_SOURCE_CONTENT,
-    LEAD_DAILY_TREND,
-    format_sources
+    LEAD_ROLLUP,
+    ROLLUP_SOURCE_CONTENT,
+    ROLLUP_SOURCE_DAY,
+    ROLLUP_SOURCE,
+    ROLLUP_TOTAL,
+    bind_sources,
+    rollup_level
 )
-from config.database import SUPPORTED_PLATFORMS
+from config.database import SUPPORTED_PLATFORMS, QUERY_CHUNK_ROWS
+from services.chunked import write_csv_chunks
+from services.fetch_context import cached_fetch
+from services import daily_facts, local_store
 
 
 def get_leads(start_date: date, end_date: date, sources: list = None) -> pd.DataFrame:
@@ -31,11 +38,10 @@ def get_leads(start_date: date, end_date: date, sources: list = None) -> pd.Data
     if sources is None:
         sources = SUPPORTED_PLATFORMS
     
-    query = LEAD_QUERY.format(sources=format_sources(sources))
+    query, params = bind_sources(LEAD_QUERY, sources, start_date, end_date)
     
     try:
-        results = execute_query(query, (start_date, end_date))
-        df = pd.DataFrame(results)
+        df = execute_query_df(query, params)
         
         if df.empty:
             return pd.DataFrame(columns=[
@@ -54,38 +60,89 @@ def get_leads(start_date: date, end_date: date, sources: list = None) -> pd.Data
         ])
 
 
-def get_lead_count_by_source_content(start_date: date, end_date: date, sources: list = None) -> pd.DataFrame:
+def iter_leads(start_date: date, end_date: date, sources: list = None, chunk_size: int = QUERY_CHUNK_ROWS):
     """
-    UTM Source ve Content bazlı lead sayılarını döner
+    Lead'leri en fazla chunk_size satırlık DataFrame parçaları halinde döndürür
+
+    get_leads() ile aynı sorgu ve sütunlar; sonuç bellekte biriktirilmez.
+
+    Yields:
+        DataFrame: Lead verisi parçası
+    """
+    if sources is None:
+        sources = SUPPORTED_PLATFORMS
+    
+    query, params = bind_sources(LEAD_QUERY, sources, start_date, end_date)
+    yield from iter_query(query, params, chunk_size=chunk_size)
+
+
+def export_leads_csv(start_date: date, end_date: date, target, sources: list = None) -> int:
+    """
+    Lead'leri sabit bellekle CSV'ye yazar
+    
+    Args:
+        target: Dosya yolu veya yazılabilir metin dosyası nesnesi
     
     Returns:
-        DataFrame: UtmSource, UtmContent, LeadCount, FirstLeadDate, LastLeadDate
+        int: Yazılan satır sayısı
+    """
+    rows = write_csv_chunks(iter_leads(start_date, end_date, sources), target)
+    print(f"✅ Lead Service: {rows} lead dışa aktarıldı")
+    return rows
+
+
+def get_lead_rollup(start_date: date, end_date: date, sources: list = None) -> pd.DataFrame:
+    """
+    Tüm lead özetlerinin kaynağı olan tek geçişli GROUPING SETS sonucunu döner
+    
+    Aktif fetch_context içinde aynı aralık ve source seçimi için sorgu bir
+    kez çalışır; aşağıdaki özet fonksiyonları bu sonucun seviyelerini okur.
+    Yerel depo veya günlük fact tabloları kullanılabiliyorsa sonuç onlardan
+    üretilir (bkz. services/local_store.py, services/daily_facts.py).
+    
+    Returns:
+        DataFrame: GroupingId, UtmSource, UtmContent, Date, LeadCount, FirstLeadDate, LastLeadDate
     """
     if sources is None:
         sources = SUPPORTED_PLATFORMS
     
-    query = LEAD_COUNT_BY_SOURCE_CONTENT.format(sources=format_sources(sources))
+    query, params = bind_sources(LEAD_ROLLUP, sources, start_date, end_date)
+    key = ("lead_rollup", tuple(sorted(set(sources))), start_date, end_date)
+    
+    def load():
+        # Sırayla: yerel depo, günlük fact tabloları, tek geçişli canlı sorgu
+        for load_rollup in (local_store.lead_rollup, daily_facts.lead_rollup):
+            df = load_rollup(start_date, end_date, sources)
+            if df is not None:
+                return df
+        return execute_query_df(query, params)
     
     try:
-        results = execute_query(query, (start_date, end_date))
-        df = pd.DataFrame(results)
-        
-        if df.empty:
-            return pd.DataFrame(columns=[
-                "UtmSource", "UtmContent", "LeadCount", 
-                "FirstLeadDate", "LastLeadDate"
-            ])
-        
-        return df
+        return cached_fetch(key, load)
         
     except Exception as e:
-        print(f"❌ Lead sayısı çekme hatası: {e}")
+        print(f"❌ Lead özeti çekme hatası: {e}")
         return pd.DataFrame(columns=[
-            "UtmSource", "UtmContent", "LeadCount", 
-            "FirstLeadDate", "LastLeadDate"
+            "GroupingId", "UtmSource", "UtmContent", "Date",
+            "LeadCount", "FirstLeadDate", "LastLeadDate"
         ])
 
 
+def get_lead_count_by_source_content(start_date: date, end_date: date, sources: list = None) -> pd.DataFrame:
+    """
+    UTM Source ve Content bazlı lead sayılarını döner
+    
+    Returns:
+        DataFrame: UtmSource, UtmContent, LeadCount, FirstLeadDate, LastLeadDate
+    """
+    df = rollup_level(
+        get_lead_rollup(start_date, end_date, sources),
+        ROLLUP_SOURCE_CONTENT,
+        ["UtmSource", "UtmContent", "LeadCount", "FirstLeadDate", "LastLeadDate"]
+    )
+    return df.sort_values("LeadCount", ascending=False, kind="stable", ignore_index=True)
+
+
 def get_lead_daily_trend(start_date: date, end_date: date, sources: list = None) -> pd.DataFrame:
     """
     Günlük lead trendi döner
@@ -93,51 +150,29 @@ def get_lead_daily_trend(start_date: date, end_date: date, sources: list = None)
     Returns:
         DataFrame: Date, UtmSource, LeadCount
     """
-    if sources is None:
-        sources = SUPPORTED_PLATFORMS
-    
-    query = LEAD_DAILY_TREND.format(sources=format_sources(sources))
-    
-    try:
-        results = execute_query(query, (start_date, end_date))
-        df = pd.DataFrame(results)
-        
-        if df.empty:
-            return pd.DataFrame(columns=["Date", "UtmSource", "LeadCount"])
-        
-        return df
-        
-    except Exception as e:
-        print(f"❌ Lead trend verisi çekme hatası: {e}")
-        return pd.DataFrame(columns=["Date", "UtmSource", "LeadCount"])
+    df = rollup_level(
+        get_lead_rollup(start_date, end_date, sources),
+        ROLLUP_SOURCE_DAY,
+        ["Date", "UtmSource", "LeadCount"]
+    )
+    return df.sort_values("Date", kind="stable", ignore_index=True)
 
 
 def get_total_leads(start_date: date, end_date: date, sources: list = None) -> int:
-    """Toplam lead sayısı döner"""
-    df = get_lead_count_by_source_content(start_date, end_date, sources)
+    """Toplam tekil lead sayısı döner (birden fazla content'ten gelen üye bir kez sayılır)"""
+    df = rollup_level(get_lead_rollup(start_date, end_date, sources), ROLLUP_TOTAL, ["LeadCount"])
     return int(df["LeadCount"].sum()) if not df.empty else 0
 
 
 def get_leads_by_source(start_date: date, end_date: date) -> dict:
     """
-    Platform bazlı lead sayıları döner
+    Platform bazlı tekil lead sayıları döner
     
     Returns:
         dict: {"google": 123, "facebook": 456}
     """
-    df = get_lead_count_by_source_content(start_date, end_date)
-    
-    if df.empty:
-        return {source: 0 for source in SUPPORTED_PLATFORMS}
-    
-    summary = df.groupby("UtmSource")["LeadCount"].sum().to_dict()
+    df = rollup_level(get_lead_rollup(start_date, end_date), ROLLUP_SOURCE, ["UtmSource", "LeadCount"])
+    summary = dict(zip(df["UtmSource"], df["LeadCount"]))
     
     # int'e çevir ve eksik platformları 0 ile doldur
-    result = {}
-    for source in SUPPORTED_PLATFORMS:
-        if source in summary:
-            result[source] = int(summary[source])
-        else:
-            result[source] = 0
-    
-    return result
+    return {source: int(summary.get(source, 0)) for source in SUPPORTED_PLATFORMS}
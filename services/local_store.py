@@ -0,0 +1,431 @@
+"""
+Local Store
+===========
+Dashboard özetleri için yerel analitik depo (DuckDB)
+
+Prefetch worker lead, ciro ve reklam harcaması gün satırlarını düzenli
+olarak tek bir DuckDB dosyasına senkronlar (LOCAL_STORE_PATH). Servisler
+aralık depoya sığıyorsa özetleri burada SQL ile hesaplar; üretim
+veritabanına yalnızca senkron gider, izleyici sayısı DB yükünü etkilemez.
+
+Dosya her senkronda geçici dosyaya yazılıp atomik olarak değiştirilir;
+okuyucular read-only bağlantı açar ve hiçbir zaman yarım depo görmez.
+
+Depo fact tablolarıyla aynı tanede (üye / sipariş anahtarlı) satırlar
+tutar; tekil lead ve sipariş sayıları her seviyede COUNT(DISTINCT) ile
+yeniden hesaplanır, canlı *_ROLLUP ile aynıdır. Boş UtmContent tüm
+yollarda '' olarak temsil edilir.
+
+Çalıştırma:
+    python -m services.local_store            # tek senkron
+    python -m services.local_store --verify   # depo özetlerini canlı sorgularla karşılaştır
+"""
+
+import argparse
+import os
+import sys
+import threading
+import numpy as np
+import pandas as pd
+from datetime import date, datetime, timedelta
+
+# Proje kök dizinini path'e ekle (modül olarak çalıştırıldığında)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.cache import (
+    LOCAL_STORE_PATH,
+    USE_LOCAL_STORE,
+    LOCAL_STORE_SYNC_DAYS,
+    LOCAL_STORE_MAX_AGE_SECONDS
+)
+from config.database import SUPPORTED_PLATFORMS
+from database.connection import execute_query_df
+from database.queries import LEAD_ROLLUP, REVENUE_ROLLUP, bind_sources
+from services import daily_facts
+from services.ad_spend_service import get_all_platform_data, get_platform_status
+from services.fetch_context import fetch_context
+from services.cache_control import register_invalidation_hook
+
+try:
+    import duckdb
+    DUCKDB_AVAILABLE = True
+except ImportError:
+    DUCKDB_AVAILABLE = False
+
+
+# Depo tabloları: pandas satırlarından tipli tablolara (bkz. daily_facts.lead_rows / revenue_rows)
+LEAD_TABLE_SQL = """
+CREATE TABLE lead_daily AS
+SELECT
+    CAST("Date" AS DATE) AS day,
+    CAST(UtmSource AS VARCHAR) AS source,
+    COALESCE(CAST(UtmContent AS VARCHAR), '') AS content,
+    CAST(MemberId AS BIGINT) AS member_id
+FROM frame
+"""
+
+REVENUE_TABLE_SQL = """
+CREATE TABLE revenue_daily AS
+SELECT
+    CAST("Date" AS DATE) AS day,
+    CAST(UtmSource AS VARCHAR) AS source,
+    COALESCE(CAST(UtmContent AS VARCHAR), '') AS content,
+    CAST(OrderId AS BIGINT) AS order_id,
+    CAST(TotalRevenue AS DOUBLE) AS revenue,
+    CAST(NetRevenue AS DOUBLE) AS net_revenue,
+    CAST(LineCount AS BIGINT) AS lines
+FROM frame
+"""
+
+AD_TABLE_SQL = """
+CREATE TABLE ad_daily AS
+SELECT
+    CAST("date" AS DATE) AS day,
+    CAST(source AS VARCHAR) AS source,
+    CAST(campaign_id AS VARCHAR) AS campaign_id,
+    CAST(campaign_name AS VARCHAR) AS campaign_name,
+    COALESCE(CAST(utm_content AS VARCHAR), '') AS content,
+    CAST(spend AS DOUBLE) AS spend,
+    CAST(impressions AS BIGINT) AS impressions,
+    CAST(clicks AS BIGINT) AS clicks,
+    CAST(conversions AS DOUBLE) AS conversions
+FROM frame
+"""
+
+# *_ROLLUP biçiminde özetler (GroupingId: bkz. database/queries.py ROLLUP_*)
+LEAD_ROLLUP_SQL = """
+SELECT
+    grouping(source, content, day) AS GroupingId,
+    source AS UtmSource,
+    content AS UtmContent,
+    day AS "Date",
+    COUNT(DISTINCT member_id) AS LeadCount,
+    MIN(day) AS FirstLeadDate,
+    MAX(day) AS LastLeadDate
+FROM lead_daily
+WHERE list_contains(?, source)
+  AND day BETWEEN ? AND ?
+GROUP BY GROUPING SETS ((source, content), (day, source), (source), ())
+"""
+
+REVENUE_ROLLUP_SQL = """
+SELECT
+    grouping(source, content, day) AS GroupingId,
+    source AS UtmSource,
+    content AS UtmContent,
+    day AS "Date",
+    COUNT(DISTINCT order_id) AS OrderCount,
+    SUM(revenue) AS TotalRevenue,
+    SUM(net_revenue) AS NetRevenue,
+    SUM(revenue) / NULLIF(SUM(lines), 0) AS AvgOrderValue
+FROM revenue_daily
+WHERE list_contains(?, source)
+  AND day BETWEEN ? AND ?
+GROUP BY GROUPING SETS ((source, content), (day, source), (source), ())
+"""
+
+# Content bazlı harcama + lead + ciro (harcaması olan content'ler)
+CONTENT_METRICS_SQL = """
+WITH spend AS (
+    SELECT source, content, SUM(spend) AS spend
+    FROM ad_daily WHERE day BETWEEN $start AND $end
+    GROUP BY source, content
+),
+leads AS (
+    SELECT source, content, COUNT(DISTINCT member_id) AS leads
+    FROM lead_daily WHERE day BETWEEN $start AND $end
+    GROUP BY source, content
+),
+revenue AS (
+    SELECT source, content, SUM(revenue) AS revenue
+    FROM revenue_daily WHERE day BETWEEN $start AND $end
+    GROUP BY source, content
+)
+SELECT
+    s.source,
+    s.content,
+    s.spend,
+    COALESCE(l.leads, 0)::BIGINT AS leads,
+    COALESCE(r.revenue, 0) AS revenue
+FROM spend s
+LEFT JOIN leads l ON l.source = s.source AND l.content = s.content
+LEFT JOIN revenue r ON r.source = s.source AND r.content = s.content
+"""
+
+# Depo meta bilgisi dosya değişince yeniden okunur: (mtime, meta)
+_meta_cache = (None, None)
+_meta_lock = threading.Lock()
+
+# Önbellek temizlendiğinde mevcut depo dosyası (mtime) bir sonraki senkrona kadar kullanılmaz
+_bypass_mtime = None
+
+
+def sync(days: int = LOCAL_STORE_SYNC_DAYS, today: date = None) -> dict:
+    """
+    Son `days` günün lead, ciro ve harcama satırlarını depoya yazar
+
+    Lead (üye) / ciro (sipariş) satırları fact tablolarından (yoksa canlı tablodan),
+    harcama spend önbelleği üzerinden platformlardan gelir. Herhangi bir
+    platform eksik yanıt verirse depo değiştirilmez.
+
+    Returns:
+        dict: Meta bilgisi (start_date, end_date, synced_at) veya {} (yazılmadıysa)
+    """
+    if not DUCKDB_AVAILABLE:
+        print("⚠️ duckdb kurulu değil, yerel depo senkronlanmadı")
+        return {}
+
+    today = today or date.today()
+    start_date = today - timedelta(days=days)
+    synced_at = datetime.now()
+
+    with fetch_context():
+        leads = daily_facts.lead_rows(start_date, today, SUPPORTED_PLATFORMS)
+        revenue = daily_facts.revenue_rows(start_date, today, SUPPORTED_PLATFORMS)
+        ads = get_all_platform_data(start_date, today)
+        status = get_platform_status(start_date, today)
+
+    failed = [platform for platform, job in status.items() if job["status"] not in ("ok", "empty")]
+    if failed:
+        print(f"⚠️ Yerel depo senkronlanmadı, eksik platform verisi: {', '.join(failed)}")
+        return {}
+
+    meta = {"start_date": start_date, "end_date": today, "synced_at": synced_at}
+    _write_store({LEAD_TABLE_SQL: leads, REVENUE_TABLE_SQL: revenue, AD_TABLE_SQL: ads}, meta)
+    print(f"✅ Yerel depo senkronlandı: {len(leads)} lead, {len(revenue)} ciro, {len(ads)} reklam satırı")
+    return meta
+
+
+def _write_store(tables: dict, meta: dict):
+    """Depoyu geçici dosyaya oluşturur ve atomik olarak yerine koyar"""
+    os.makedirs(os.path.dirname(LOCAL_STORE_PATH), exist_ok=True)
+    temp_path = f"{LOCAL_STORE_PATH}.{os.getpid()}.tmp"
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+
+    try:
+        connection = duckdb.connect(temp_path)
+        try:
+            for create_sql, frame in tables.items():
+                connection.register("frame", frame)
+                connection.execute(create_sql)
+                connection.unregister("frame")
+            connection.execute(
+                "CREATE TABLE sync_meta AS SELECT ?::DATE AS start_date, ?::DATE AS end_date, ?::TIMESTAMP AS synced_at",
+                [meta["start_date"], meta["end_date"], meta["synced_at"]]
+            )
+        finally:
+            connection.close()
+        os.replace(temp_path, LOCAL_STORE_PATH)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def _query(sql: str, params=None) -> pd.DataFrame:
+    """Depoda read-only sorgu çalıştırır"""
+    connection = duckdb.connect(LOCAL_STORE_PATH, read_only=True)
+    try:
+        return connection.execute(sql, params).df()
+    finally:
+        connection.close()
+
+
+def _store_mtime():
+    try:
+        return os.path.getmtime(LOCAL_STORE_PATH)
+    except OSError:
+        return None
+
+
+@register_invalidation_hook
+def _bypass_current_store(since=None):
+    """Yenile: eldeki depo yerine kaynaklar kullanılır, bir sonraki senkron depoyu yeniden devreye alır"""
+    global _bypass_mtime
+    _bypass_mtime = _store_mtime()
+
+
+def get_store_meta():
+    """
+    Depo meta bilgisi: {start_date, end_date, synced_at} veya None (depo yoksa)
+    """
+    global _meta_cache
+    if not DUCKDB_AVAILABLE:
+        return None
+
+    mtime = _store_mtime()
+    if mtime is None:
+        return None
+
+    with _meta_lock:
+        if _meta_cache[0] == mtime:
+            return _meta_cache[1]
+
+    try:
+        row = _query("SELECT start_date, end_date, synced_at FROM sync_meta").iloc[0]
+        meta = {
+            "start_date": row["start_date"].date(),
+            "end_date": row["end_date"].date(),
+            "synced_at": row["synced_at"].to_pydatetime(),
+        }
+    except Exception as e:
+        print(f"⚠️ Yerel depo okunamadı: {e}")
+        meta = None
+
+    with _meta_lock:
+        _meta_cache = (mtime, meta)
+    return meta
+
+
+def covers(start_date: date, end_date: date) -> bool:
+    """Depo aralığı kapsıyor ve LOCAL_STORE_MAX_AGE_SECONDS'tan yeni mi"""
+    if not USE_LOCAL_STORE:
+        return False
+    if _bypass_mtime is not None and _store_mtime() == _bypass_mtime:
+        return False
+
+    meta = get_store_meta()
+    if meta is None:
+        return False
+
+    age = (datetime.now() - meta["synced_at"]).total_seconds()
+    return meta["start_date"] <= start_date and end_date <= meta["end_date"] and age <= LOCAL_STORE_MAX_AGE_SECONDS
+
+
+def _rollup(sql: str, start_date: date, end_date: date, sources: list):
+    if not covers(start_date, end_date):
+        return None
+    try:
+        return _query(sql, [list(sources), start_date, end_date])
+    except Exception as e:
+        print(f"⚠️ Yerel depo sorgusu başarısız, kaynağa dönülüyor: {e}")
+        return None
+
+
+def lead_rollup(start_date: date, end_date: date, sources: list):
+    """LEAD_ROLLUP biçiminde lead özeti (depodan); depo aralığı kapsamıyorsa None"""
+    return _rollup(LEAD_ROLLUP_SQL, start_date, end_date, sources)
+
+
+def revenue_rollup(start_date: date, end_date: date, sources: list):
+    """REVENUE_ROLLUP biçiminde ciro özeti (depodan); depo aralığı kapsamıyorsa None"""
+    return _rollup(REVENUE_ROLLUP_SQL, start_date, end_date, sources)
+
+
+def content_metrics(start_date: date, end_date: date):
+    """
+    Content bazlı harcama, lead ve ciro (depodan); depo aralığı kapsamıyorsa None
+
+    Returns:
+        DataFrame: source, content, spend, leads, revenue
+    """
+    if not covers(start_date, end_date):
+        return None
+    try:
+        return _query(CONTENT_METRICS_SQL, {"start": start_date, "end": end_date})
+    except Exception as e:
+        print(f"⚠️ Yerel depo sorgusu başarısız, kaynağa dönülüyor: {e}")
+        return None
+
+
+# verify(): satır anahtarı ve karşılaştırılan ölçüler
+ROLLUP_KEYS = ["GroupingId", "UtmSource", "UtmContent", "Date"]
+VERIFY_MEASURES = {
+    "lead": ["LeadCount", "FirstLeadDate", "LastLeadDate"],
+    "revenue": ["OrderCount", "TotalRevenue", "NetRevenue", "AvgOrderValue"],
+}
+DATE_MEASURES = {"FirstLeadDate", "LastLeadDate"}
+
+
+def _normalize_rollup(df: pd.DataFrame, measures: list) -> pd.DataFrame:
+    """Depo ve canlı özetini karşılaştırılabilir tiplere getirir (tarihler metin, ölçüler float)"""
+    df = df[ROLLUP_KEYS + measures].copy()
+    df["GroupingId"] = df["GroupingId"].astype(int)
+    for column in ("UtmSource", "UtmContent"):
+        df[column] = df[column].fillna("").astype(str)
+    for column in ["Date"] + [m for m in measures if m in DATE_MEASURES]:
+        df[column] = pd.to_datetime(df[column]).dt.strftime("%Y-%m-%d").fillna("")
+    for column in measures:
+        if column not in DATE_MEASURES:
+            df[column] = pd.to_numeric(df[column], errors="coerce").astype(float)
+    return df
+
+
+def _rollup_differences(store: pd.DataFrame, live: pd.DataFrame, measures: list) -> pd.DataFrame:
+    """İki özet arasında eksik veya farklı ölçülü satırlar (store_* / live_* sütunlarıyla)"""
+    merged = pd.merge(
+        _normalize_rollup(store, measures).add_prefix("store_").rename(columns={f"store_{k}": k for k in ROLLUP_KEYS}),
+        _normalize_rollup(live, measures).add_prefix("live_").rename(columns={f"live_{k}": k for k in ROLLUP_KEYS}),
+        on=ROLLUP_KEYS, how="outer", indicator=True
+    )
+    differs = merged["_merge"] != "both"
+    for column in measures:
+        left, right = merged[f"store_{column}"], merged[f"live_{column}"]
+        if column in DATE_MEASURES:
+            differs |= left != right
+        else:
+            differs |= ~np.isclose(left, right, equal_nan=True)
+    return merged[differs].drop(columns="_merge").sort_values(ROLLUP_KEYS).reset_index(drop=True)
+
+
+def verify(start_date: date = None, end_date: date = None, sources: list = None) -> dict:
+    """
+    Depodaki lead / ciro özetlerini canlı LEAD_ROLLUP / REVENUE_ROLLUP ile karşılaştırır
+
+    covers() aralığında servisler özeti depodan okur; bu kontrol iki yolun
+    aynı sonucu verdiğini doğrular. Varsayılan aralık depo başlangıcından
+    senkron gününün bir öncesine kadardır: senkron günü, senkrondan sonra
+    gelen kayıtlarla canlı tabloda büyümeye devam eder.
+
+    Returns:
+        dict: {"lead": DataFrame, "revenue": DataFrame} - farklı satırlar (boşsa iki yol aynıdır)
+
+    Raises:
+        ValueError: Depo aralığı kapsamıyorsa
+    """
+    meta = get_store_meta()
+    if meta is None:
+        raise ValueError("Yerel depo bulunamadı")
+
+    start_date = start_date or meta["start_date"]
+    end_date = end_date or meta["end_date"] - timedelta(days=1)
+    sources = sources or SUPPORTED_PLATFORMS
+    if not covers(start_date, end_date):
+        raise ValueError(
+            f"Depo {start_date} - {end_date} aralığını kapsamıyor "
+            f"(depo: {meta['start_date']} - {meta['end_date']}, senkron: {meta['synced_at']:%Y-%m-%d %H:%M})"
+        )
+
+    differences = {}
+    for name, store_query, live_query in (
+        ("lead", LEAD_ROLLUP_SQL, LEAD_ROLLUP),
+        ("revenue", REVENUE_ROLLUP_SQL, REVENUE_ROLLUP),
+    ):
+        store = _query(store_query, [list(sources), start_date, end_date])
+        live = execute_query_df(*bind_sources(live_query, sources, start_date, end_date), cache=False)
+        differences[name] = _rollup_differences(store, live, VERIFY_MEASURES[name])
+
+        if differences[name].empty:
+            print(f"✅ {name}: depo ve canlı özet aynı ({len(store)} satır, {start_date} - {end_date})")
+        else:
+            print(f"❌ {name}: {len(differences[name])} satır farklı ({start_date} - {end_date})")
+            print(differences[name].head(20).to_string(index=False))
+
+    return differences
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Yerel analitik depo")
+    parser.add_argument("--verify", action="store_true", help="Senkronlamadan depo özetlerini canlı sorgularla karşılaştır")
+    parser.add_argument("--start", type=date.fromisoformat, help="Doğrulama başlangıcı (YYYY-MM-DD)")
+    parser.add_argument("--end", type=date.fromisoformat, help="Doğrulama bitişi (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    if args.verify:
+        differences = verify(args.start, args.end)
+        sys.exit(1 if any(not df.empty for df in differences.values()) else 0)
+    sync()
+
+
+if __name__ == "__main__":
+    main()
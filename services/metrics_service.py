@@ -8,6 +8,8 @@ from datetime import date
 from services.lead_service import get_total_leads, get_leads_by_source, get_lead_count_by_source_content
 from services.revenue_service import get_total_revenue, get_revenue_by_source, get_revenue_summary_by_source_content
 from services.ad_spend_service import get_total_spend, get_spend_by_source, get_spend_by_content
+from services.fetch_context import fetch_context
+from services import local_store
 from config.database import SUPPORTED_PLATFORMS
 
 
@@ -80,13 +82,39 @@ def calculate_metrics_by_source(start_date: date, end_date: date) -> dict:
     return metrics
 
 
+def _content_metric(source: str, content: str, spend: float, leads: int, revenue: float) -> dict:
+    """Tek bir (source, content) satırının metrikleri"""
+    cpa = spend / leads if leads > 0 else 0
+    roas = revenue / spend if spend > 0 else 0
+    
+    return {
+        "source": source,
+        "content": content,
+        "spend": round(float(spend), 2),
+        "leads": leads,
+        "revenue": round(float(revenue), 2),
+        "cpa": round(float(cpa), 2),
+        "roas": round(float(roas), 2)
+    }
+
+
 def calculate_metrics_by_content(start_date: date, end_date: date) -> list:
     """
     UTM Content bazlı metrikleri hesaplar
     
+    Yerel depo aralığı kapsıyorsa birleştirme depoda tek SQL ile yapılır.
+    
     Returns:
         list: [{source, content, spend, leads, revenue, cpa, roas}, ...]
     """
+    local = local_store.content_metrics(start_date, end_date)
+    if local is not None:
+        results = [
+            _content_metric(row.source, row.content, float(row.spend or 0), int(row.leads or 0), float(row.revenue or 0))
+            for row in local.itertuples(index=False)
+        ]
+        return sorted(results, key=lambda x: x["roas"], reverse=True)
+    
     spend_df = get_spend_by_content(start_date, end_date)
     leads_df = get_lead_count_by_source_content(start_date, end_date)
     revenue_df = get_revenue_summary_by_source_content(start_date, end_date)
@@ -116,18 +144,7 @@ def calculate_metrics_by_content(start_date: date, end_date: date) -> list:
         ]
         revenue = float(revenue_match["TotalRevenue"].sum()) if not revenue_match.empty else 0
         
-        cpa = spend / leads if leads > 0 else 0
-        roas = revenue / spend if spend > 0 else 0
-        
-        results.append({
-            "source": source,
-            "content": content,
-            "spend": round(float(spend), 2),
-            "leads": leads,
-            "revenue": round(float(revenue), 2),
-            "cpa": round(float(cpa), 2),
-            "roas": round(float(roas), 2)
-        })
+        results.append(_content_metric(source, content, spend, leads, revenue))
     
     # ROAS'a göre sırala
     return sorted(results, key=lambda x: x["roas"], reverse=True)
@@ -144,11 +161,13 @@ def get_dashboard_summary(start_date: date, end_date: date) -> dict:
             by_content: [...]
         }
     """
-    return {
-        "overall": calculate_overall_metrics(start_date, end_date),
-        "by_source": calculate_metrics_by_source(start_date, end_date),
-        "by_content": calculate_metrics_by_content(start_date, end_date)
-    }
+    # Üç hesaplama aynı platform verisini paylaşır
+    with fetch_context():
+        return {
+            "overall": calculate_overall_metrics(start_date, end_date),
+            "by_source": calculate_metrics_by_source(start_date, end_date),
+            "by_content": calculate_metrics_by_content(start_date, end_date)
+        }
 
 
 def format_currency(value: float) -> str:
@@ -0,0 +1,123 @@
+"""
+Prefetch Worker
+===============
+Hızlı seçim tarih aralıklarını (Son 7/30/90 gün, Bu Ay) arka planda
+düzenli olarak yeniden hesaplayıp snapshot önbelleğine yazar; her turun
+başında yerel analitik depoyu (services/local_store.py) senkronlar
+
+Böylece günün ilk ziyaretçisi de standart aralıklarda yalnızca önbellek okur.
+
+Çalıştırma:
+    python -m services.prefetch              # PREFETCH_INTERVAL_SECONDS aralıkla sürekli
+    python -m services.prefetch --once       # tek tur
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+# Proje kök dizinini path'e ekle (modül olarak çalıştırıldığında)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.cache import PREFETCH_INTERVAL_SECONDS, PREFETCH_FETCH_TIMEOUT_SECONDS, SNAPSHOT_RETENTION_DAYS
+from config.database import SUPPORTED_PLATFORMS
+from services.date_ranges import quick_ranges
+from services.dashboard_data import refresh_dashboard_data, is_complete
+from services.ad_spend_service import fetch_timeout
+from services import snapshot_store, local_store
+
+
+def prefetch_once(platforms: list = None) -> dict:
+    """
+    Tüm hızlı seçim aralıklarını bir kez yeniler
+
+    Args:
+        platforms: Platform listesi (varsayılan: SUPPORTED_PLATFORMS, yani filtrenin "Tümünü Seç" hali)
+
+    Returns:
+        dict: Etiket (ve "local_store") -> süre (sn) veya hata mesajı
+    """
+    platforms = platforms or SUPPORTED_PLATFORMS
+    results = {}
+
+    # Render süre sınırı uzun aralıkların asenkron raporlarına yetmez; burada daha uzun beklenir
+    with fetch_timeout(PREFETCH_FETCH_TIMEOUT_SECONDS):
+        # Özetler yerel depodan hesaplanır; önce depo tazelenir
+        if local_store.DUCKDB_AVAILABLE:
+            started = time.monotonic()
+            try:
+                local_store.sync()
+                results["local_store"] = round(time.monotonic() - started, 2)
+            except Exception as e:
+                results["local_store"] = str(e)
+                print(f"❌ Yerel depo senkron hatası: {e}")
+
+        # Aynı bitiş tarihli aralıklar günlük spend önbelleğini paylaşır;
+        # en uzun aralık önce çekilince kısa aralıklar kesinleşmiş günleri diskten okur
+        ranges = sorted(quick_ranges().items(), key=lambda item: item[1][0])
+
+        for label, (start_date, end_date) in ranges:
+            started = time.monotonic()
+            try:
+                data = refresh_dashboard_data(start_date, end_date, platforms)
+                elapsed = round(time.monotonic() - started, 2)
+                results[label] = elapsed
+                if is_complete(data):
+                    print(f"✅ Prefetch {label}: {elapsed} sn")
+                else:
+                    print(f"⚠️ Prefetch {label}: eksik platform verisi, snapshot yazılmadı ({elapsed} sn)")
+            except Exception as e:
+                results[label] = str(e)
+                print(f"❌ Prefetch {label} hatası: {e}")
+
+    snapshot_store.purge_snapshots(SNAPSHOT_RETENTION_DAYS * 86400)
+    return results
+
+
+def run_forever(interval_seconds: int = PREFETCH_INTERVAL_SECONDS, stop_event: threading.Event = None):
+    """Hızlı seçim aralıklarını interval_seconds aralıkla yeniler (stop_event ile durdurulur)"""
+    stop_event = stop_event or threading.Event()
+    while not stop_event.is_set():
+        started = time.monotonic()
+        prefetch_once()
+        # Tur süresi aralıktan düşülür; yenileme periyodu sabit kalır
+        stop_event.wait(max(0, interval_seconds - (time.monotonic() - started)))
+
+
+def start_prefetch_thread(interval_seconds: int = PREFETCH_INTERVAL_SECONDS) -> threading.Event:
+    """
+    Worker'ı aynı process içinde daemon thread olarak başlatır
+
+    Returns:
+        threading.Event: set() edildiğinde worker durur
+    """
+    stop_event = threading.Event()
+    threading.Thread(
+        target=run_forever,
+        args=(interval_seconds, stop_event),
+        name="dashboard-prefetch",
+        daemon=True
+    ).start()
+    return stop_event
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dashboard prefetch worker")
+    parser.add_argument("--once", action="store_true", help="Tek tur çalış ve çık")
+    parser.add_argument("--interval", type=int, default=PREFETCH_INTERVAL_SECONDS, help="Yenileme aralığı (saniye)")
+    args = parser.parse_args()
+
+    print(f"🔄 Prefetch worker başlatıldı (aralık: {args.interval} sn)")
+    try:
+        if args.once:
+            prefetch_once()
+        else:
+            run_forever(args.interval)
+    except KeyboardInterrupt:
+        print("\n👋 Prefetch worker durduruldu")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,14 +6,21 @@ Ciro (satış) verilerini çeker
 
 import pandas as pd
 from datetime import date
-from database.connection import execute_query
+from database.connection import execute_query_df, iter_query
 from database.queries import (
     REVENUE_QUERY,
-    REVENUE_SUMMARY_BY_SOURCE_CONTENT,
-    REVENUE_DAILY_TREND,
-    format_sources
+    REVENUE_ROLLUP,
+    ROLLUP_SOURCE_CONTENT,
+    ROLLUP_SOURCE_DAY,
+    ROLLUP_SOURCE,
+    ROLLUP_TOTAL,
+    bind_sources,
+    rollup_level
 )
-from config.database import SUPPORTED_PLATFORMS
+from config.database import SUPPORTED_PLATFORMS, QUERY_CHUNK_ROWS
+from services.chunked import aggregate_chunks, write_csv_chunks
+from services.fetch_context import cached_fetch
+from services import daily_facts, local_store
 
 
 def get_revenue(start_date: date, end_date: date, sources: list = None) -> pd.DataFrame:
@@ -31,11 +38,10 @@ def get_revenue(start_date: date, end_date: date, sources: list = None) -> pd.Da
     if sources is None:
         sources = SUPPORTED_PLATFORMS
     
-    query = REVENUE_QUERY.format(sources=format_sources(sources))
+    query, params = bind_sources(REVENUE_QUERY, sources, start_date, end_date)
     
     try:
-        results = execute_query(query, (start_date, end_date))
-        df = pd.DataFrame(results)
+        df = execute_query_df(query, params)
         
         if df.empty:
             return pd.DataFrame(columns=[
@@ -54,67 +60,134 @@ def get_revenue(start_date: date, end_date: date, sources: list = None) -> pd.Da
         ])
 
 
-def get_revenue_summary_by_source_content(start_date: date, end_date: date, sources: list = None) -> pd.DataFrame:
+def iter_revenue(start_date: date, end_date: date, sources: list = None, chunk_size: int = QUERY_CHUNK_ROWS):
     """
-    UTM Source ve Content bazlı ciro özeti döner
-    
-    Returns:
-        DataFrame: UtmSource, UtmContent, OrderCount, TotalRevenue, NetRevenue, AvgOrderValue
+    Satış detaylarını en fazla chunk_size satırlık DataFrame parçaları halinde döndürür
+
+    get_revenue() ile aynı sorgu ve sütunlar; sonuç bellekte biriktirilmez.
+    Uzun aralıklardaki dışa aktarım ve üye bazlı toplamalar için kullanılır.
+
+    Yields:
+        DataFrame: Ciro verisi parçası
     """
     if sources is None:
         sources = SUPPORTED_PLATFORMS
     
-    query = REVENUE_SUMMARY_BY_SOURCE_CONTENT.format(sources=format_sources(sources))
+    query, params = bind_sources(REVENUE_QUERY, sources, start_date, end_date)
+    yield from iter_query(query, params, chunk_size=chunk_size)
+
+
+def get_revenue_by_member(start_date: date, end_date: date, sources: list = None) -> pd.DataFrame:
+    """
+    Üye bazlı ciro özeti döner (detay satırları parça parça toplanır)
+    
+    Detay sorgusu sipariş başına birden fazla satır (dönem/ödeme) döndürebilir;
+    OrderCount tekil OrderId sayısıdır.
     
+    Returns:
+        DataFrame: MemberId, UtmSource, UtmContent, OrderCount, TotalRevenue, NetRevenue
+    """
     try:
-        results = execute_query(query, (start_date, end_date))
-        df = pd.DataFrame(results)
-        
-        if df.empty:
-            return pd.DataFrame(columns=[
-                "UtmSource", "UtmContent", "OrderCount", 
-                "TotalRevenue", "NetRevenue", "AvgOrderValue"
-            ])
-        
-        return df
+        return aggregate_chunks(
+            iter_revenue(start_date, end_date, sources),
+            keys=["MemberId", "UtmSource", "UtmContent"],
+            sums={"TotalPrice": "TotalRevenue", "NetPrice": "NetRevenue"},
+            distinct={"OrderCount": "OrderId"}
+        )[["MemberId", "UtmSource", "UtmContent", "OrderCount", "TotalRevenue", "NetRevenue"]]
         
     except Exception as e:
-        print(f"❌ Ciro özeti çekme hatası: {e}")
+        print(f"❌ Üye bazlı ciro hatası: {e}")
         return pd.DataFrame(columns=[
-            "UtmSource", "UtmContent", "OrderCount", 
-            "TotalRevenue", "NetRevenue", "AvgOrderValue"
+            "MemberId", "UtmSource", "UtmContent", "OrderCount", "TotalRevenue", "NetRevenue"
         ])
 
 
-def get_revenue_daily_trend(start_date: date, end_date: date, sources: list = None) -> pd.DataFrame:
+def export_revenue_csv(start_date: date, end_date: date, target, sources: list = None) -> int:
     """
-    Günlük ciro trendi döner
+    Satış detaylarını sabit bellekle CSV'ye yazar
+    
+    Args:
+        target: Dosya yolu veya yazılabilir metin dosyası nesnesi
     
     Returns:
-        DataFrame: Date, UtmSource, TotalRevenue, OrderCount
+        int: Yazılan satır sayısı
+    """
+    rows = write_csv_chunks(iter_revenue(start_date, end_date, sources), target)
+    print(f"✅ Revenue Service: {rows} satış kaydı dışa aktarıldı")
+    return rows
+
+
+def get_revenue_rollup(start_date: date, end_date: date, sources: list = None) -> pd.DataFrame:
+    """
+    Tüm ciro özetlerinin kaynağı olan tek geçişli GROUPING SETS sonucunu döner
+    
+    Aktif fetch_context içinde aynı aralık ve source seçimi için sorgu bir
+    kez çalışır; aşağıdaki özet fonksiyonları bu sonucun seviyelerini okur.
+    Yerel depo veya günlük fact tabloları kullanılabiliyorsa sonuç onlardan
+    üretilir (bkz. services/local_store.py, services/daily_facts.py).
+    
+    Returns:
+        DataFrame: GroupingId, UtmSource, UtmContent, Date, OrderCount,
+                   TotalRevenue, NetRevenue, AvgOrderValue
     """
     if sources is None:
         sources = SUPPORTED_PLATFORMS
     
-    query = REVENUE_DAILY_TREND.format(sources=format_sources(sources))
+    query, params = bind_sources(REVENUE_ROLLUP, sources, start_date, end_date)
+    key = ("revenue_rollup", tuple(sorted(set(sources))), start_date, end_date)
+    
+    def load():
+        # Sırayla: yerel depo, günlük fact tabloları, tek geçişli canlı sorgu
+        for load_rollup in (local_store.revenue_rollup, daily_facts.revenue_rollup):
+            df = load_rollup(start_date, end_date, sources)
+            if df is not None:
+                return df
+        return execute_query_df(query, params)
     
     try:
-        results = execute_query(query, (start_date, end_date))
-        df = pd.DataFrame(results)
-        
-        if df.empty:
-            return pd.DataFrame(columns=["Date", "UtmSource", "TotalRevenue", "OrderCount"])
-        
-        return df
+        return cached_fetch(key, load)
         
     except Exception as e:
-        print(f"❌ Ciro trend verisi çekme hatası: {e}")
-        return pd.DataFrame(columns=["Date", "UtmSource", "TotalRevenue", "OrderCount"])
+        print(f"❌ Ciro özeti çekme hatası: {e}")
+        return pd.DataFrame(columns=[
+            "GroupingId", "UtmSource", "UtmContent", "Date", "OrderCount",
+            "TotalRevenue", "NetRevenue", "AvgOrderValue"
+        ])
+
+
+def get_revenue_summary_by_source_content(start_date: date, end_date: date, sources: list = None) -> pd.DataFrame:
+    """
+    UTM Source ve Content bazlı ciro özeti döner
+    
+    Returns:
+        DataFrame: UtmSource, UtmContent, OrderCount, TotalRevenue, NetRevenue, AvgOrderValue
+    """
+    df = rollup_level(
+        get_revenue_rollup(start_date, end_date, sources),
+        ROLLUP_SOURCE_CONTENT,
+        ["UtmSource", "UtmContent", "OrderCount", "TotalRevenue", "NetRevenue", "AvgOrderValue"]
+    )
+    return df.sort_values("TotalRevenue", ascending=False, kind="stable", ignore_index=True)
+
+
+def get_revenue_daily_trend(start_date: date, end_date: date, sources: list = None) -> pd.DataFrame:
+    """
+    Günlük ciro trendi döner
+    
+    Returns:
+        DataFrame: Date, UtmSource, TotalRevenue, OrderCount
+    """
+    df = rollup_level(
+        get_revenue_rollup(start_date, end_date, sources),
+        ROLLUP_SOURCE_DAY,
+        ["Date", "UtmSource", "TotalRevenue", "OrderCount"]
+    )
+    return df.sort_values("Date", kind="stable", ignore_index=True)
 
 
 def get_total_revenue(start_date: date, end_date: date, sources: list = None) -> float:
     """Toplam ciro döner"""
-    df = get_revenue_summary_by_source_content(start_date, end_date, sources)
+    df = rollup_level(get_revenue_rollup(start_date, end_date, sources), ROLLUP_TOTAL, ["TotalRevenue"])
     return float(df["TotalRevenue"].sum()) if not df.empty else 0.0
 
 
@@ -125,40 +198,21 @@ def get_revenue_by_source(start_date: date, end_date: date) -> dict:
     Returns:
         dict: {"google": 12500.00, "facebook": 8900.00}
     """
-    df = get_revenue_summary_by_source_content(start_date, end_date)
-    
-    if df.empty:
-        return {source: 0.0 for source in SUPPORTED_PLATFORMS}
-    
-    summary = df.groupby("UtmSource")["TotalRevenue"].sum().to_dict()
+    df = rollup_level(get_revenue_rollup(start_date, end_date), ROLLUP_SOURCE, ["UtmSource", "TotalRevenue"])
+    summary = dict(zip(df["UtmSource"], df["TotalRevenue"].fillna(0)))
     
-    # Decimal'i float'a çevir ve eksik platformları 0 ile doldur
-    result = {}
-    for source in SUPPORTED_PLATFORMS:
-        if source in summary:
-            result[source] = float(summary[source])
-        else:
-            result[source] = 0.0
-    
-    return result
+    # float'a çevir ve eksik platformları 0 ile doldur
+    return {source: float(summary.get(source, 0.0)) for source in SUPPORTED_PLATFORMS}
 
 
 def get_order_count_by_source(start_date: date, end_date: date) -> dict:
     """
-    Platform bazlı sipariş sayısı döner
+    Platform bazlı tekil sipariş sayısı döner
     
     Returns:
         dict: {"google": 45, "facebook": 32}
     """
-    df = get_revenue_summary_by_source_content(start_date, end_date)
-    
-    if df.empty:
-        return {source: 0 for source in SUPPORTED_PLATFORMS}
-    
-    summary = df.groupby("UtmSource")["OrderCount"].sum().to_dict()
-    
-    for source in SUPPORTED_PLATFORMS:
-        if source not in summary:
-            summary[source] = 0
+    df = rollup_level(get_revenue_rollup(start_date, end_date), ROLLUP_SOURCE, ["UtmSource", "OrderCount"])
+    summary = dict(zip(df["UtmSource"], df["OrderCount"]))
     
-    return summary
+    return {source: int(summary.get(source, 0)) for source in SUPPORTED_PLATFORMS}
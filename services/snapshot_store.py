@@ -0,0 +1,82 @@
+"""
+Snapshot Store
+==============
+Hesaplanmış dashboard verisinin (metrikler, trendler, platform durumu)
+process'ler arası paylaşılan disk önbelleği
+
+Her (tarih aralığı, platformlar) için tek dosya tutulur:
+    {CACHE_DIR}/snapshots/2024-01-01_2024-01-31_facebook-google.pkl
+
+Prefetch worker ve dashboard aynı dosyaları okuyup yazar; yazma atomiktir.
+"""
+
+import os
+import pickle
+import tempfile
+import time
+from datetime import date
+from config.cache import CACHE_DIR
+
+
+SNAPSHOT_DIR = os.path.join(CACHE_DIR, "snapshots")
+
+
+def snapshot_key(start_date: date, end_date: date, platforms: list) -> str:
+    """(aralık, platformlar) için snapshot anahtarı"""
+    return f"{start_date.isoformat()}_{end_date.isoformat()}_{'-'.join(sorted(platforms))}"
+
+
+def _snapshot_path(key: str) -> str:
+    return os.path.join(SNAPSHOT_DIR, f"{key}.pkl")
+
+
+def read_snapshot(key: str):
+    """
+    Snapshot'ı okur
+
+    Returns:
+        dict veya None (yoksa / okunamazsa); "fetched_at" alanı oluşturulma zamanıdır
+    """
+    path = _snapshot_path(key)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except Exception as e:
+        print(f"⚠️ Snapshot okunamadı ({path}): {e}")
+        return None
+
+
+def write_snapshot(key: str, data: dict):
+    """Snapshot'ı atomik olarak yazar (okuyucular yarım dosya görmez)"""
+    path = _snapshot_path(key)
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    # Aynı process'in thread'leri aynı anahtarı eşzamanlı yazabilir; geçici dosya her yazana özel
+    fd, temp_path = tempfile.mkstemp(dir=SNAPSHOT_DIR, prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+    except Exception as e:
+        print(f"⚠️ Snapshot yazılamadı ({path}): {e}")
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def purge_snapshots(max_age_seconds: float) -> int:
+    """max_age_seconds'tan eski snapshot dosyalarını siler; silinen sayısını döner"""
+    if not os.path.isdir(SNAPSHOT_DIR):
+        return 0
+
+    removed = 0
+    cutoff = time.time() - max_age_seconds
+    for name in os.listdir(SNAPSHOT_DIR):
+        path = os.path.join(SNAPSHOT_DIR, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+        except OSError:
+            continue
+    return removed
@@ -0,0 +1,143 @@
+"""
+Spend Cache
+===========
+Reklam platformu verileri için gün bazlı kalıcı Parquet önbelleği
+
+Her (platform, gün) ayrı bir dosyada tutulur:
+    {CACHE_DIR}/spend/platform=google/date=2024-01-31.parquet
+
+Kesinleşmiş günler diskten okunur, yalnızca eksik günler ile son
+SPEND_SETTLING_DAYS gün platform API'sinden çekilir.
+"""
+
+import os
+import tempfile
+import pandas as pd
+from datetime import date, timedelta
+from config.cache import CACHE_DIR, SPEND_SETTLING_DAYS
+from connectors.registry import is_failed_result
+
+try:
+    import pyarrow  # noqa: F401 - Parquet motoru
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+
+SPEND_CACHE_DIR = os.path.join(CACHE_DIR, "spend")
+
+
+def _partition_path(platform: str, day: date) -> str:
+    """(platform, gün) partition dosyasının yolunu döner"""
+    return os.path.join(SPEND_CACHE_DIR, f"platform={platform}", f"date={day.isoformat()}.parquet")
+
+
+def _date_range(start_date: date, end_date: date) -> list:
+    """start_date ve end_date dahil gün listesi"""
+    return [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+
+
+def _contiguous_runs(days: list) -> list:
+    """Sıralı gün listesini ardışık (başlangıç, bitiş) aralıklarına böler"""
+    runs = []
+    for day in days:
+        if runs and day - runs[-1][1] == timedelta(days=1):
+            runs[-1][1] = day
+        else:
+            runs.append([day, day])
+    return [(start, end) for start, end in runs]
+
+
+def is_settled(day: date, today: date = None) -> bool:
+    """Günün harcaması kesinleşmiş mi (önbelleğe yazılabilir mi)"""
+    today = today or date.today()
+    return day < today - timedelta(days=SPEND_SETTLING_DAYS)
+
+
+def read_day(platform: str, day: date):
+    """
+    Önbellekteki günü okur
+
+    Returns:
+        DataFrame veya None (önbellekte yoksa / okunamazsa)
+    """
+    path = _partition_path(platform, day)
+    if not os.path.exists(path):
+        return None
+    try:
+        return pd.read_parquet(path)
+    except Exception as e:
+        print(f"⚠️ Önbellek dosyası okunamadı ({path}): {e}")
+        return None
+
+
+def write_day(platform: str, day: date, df: pd.DataFrame):
+    """Günü önbelleğe atomik olarak yazar (okuyucular yarım dosya görmez)"""
+    path = _partition_path(platform, day)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Yazıcı başına benzersiz geçici dosya: aynı process'teki thread'ler birbirini ezmez
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=os.path.basename(path) + ".", suffix=".tmp")
+    os.close(fd)
+    try:
+        df.to_parquet(temp_path, index=False)
+        os.replace(temp_path, path)
+    except Exception as e:
+        print(f"⚠️ Önbelleğe yazılamadı ({path}): {e}")
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def get_platform_data(platform: str, start_date: date, end_date: date, fetcher) -> pd.DataFrame:
+    """
+    Platform verisini önbellek + eksik gün çekimi ile döner
+
+    Args:
+        platform: Platform adı ("google", "facebook", ...)
+        start_date: Başlangıç tarihi
+        end_date: Bitiş tarihi
+        fetcher: fetcher(start_date, end_date) -> DataFrame connector fonksiyonu
+
+    Returns:
+        DataFrame: Aralıktaki tüm günlerin verisi
+    """
+    if not PARQUET_AVAILABLE:
+        return fetcher(start_date, end_date)
+
+    today = date.today()
+    frames = []
+    missing = []
+
+    for day in _date_range(start_date, end_date):
+        cached = read_day(platform, day) if is_settled(day, today) else None
+        if cached is None:
+            missing.append(day)
+        elif not cached.empty:
+            frames.append(cached)
+
+    # Eksik günleri ardışık aralıklar halinde çek
+    for run_start, run_end in _contiguous_runs(missing):
+        fetched = fetcher(run_start, run_end)
+
+        # Hatalı veya yapılandırılmamış connector sonucu (sütunsuz DataFrame) önbelleğe yazılmaz;
+        # boş partition yalnızca başarılı ama verisiz yanıt içindir
+        if is_failed_result(fetched):
+            continue
+
+        if not fetched.empty:
+            frames.append(fetched)
+
+        day_keys = fetched["date"].astype(str)
+        for day in _date_range(run_start, run_end):
+            if is_settled(day, today):
+                # Verisi olmayan günler de boş partition olarak yazılır
+                write_day(platform, day, fetched[day_keys == day.isoformat()])
+
+    if not frames:
+        return pd.DataFrame(columns=[
+            "date", "source", "campaign_id", "campaign_name",
+            "utm_content", "spend", "impressions", "clicks", "conversions"
+        ])
+
+    df = pd.concat(frames, ignore_index=True)
+    df["date"] = df["date"].astype(str)
+    return df.sort_values("date", kind="stable").reset_index(drop=True)